@@ -0,0 +1,38 @@
+"""
+벤치마크 공통 도우미 (실행 시간 측정, 기존 구현과 결과 비교)
+"""
+import time
+
+import pandas as pd
+
+
+def timed(func, *args):
+    """
+    func(*args) 실행 후 (결과, 소요 시간(초)) 반환
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def speedup(legacy_seconds, current_seconds):
+    """
+    기존 구현 대비 몇 배 빠른지 (현재 구현 시간이 0이어도 나누기 오류 없음)
+    """
+    return legacy_seconds / max(current_seconds, 1e-9)
+
+
+def assert_same(name, expected, actual):
+    """
+    기존/현재 구현 결과가 값과 타입까지 같은지 확인 (DataFrame, Series, numpy 배열, 결측값은 같은 값으로 취급)
+    다르면 차이를 출력하고 종료
+    """
+    try:
+        if isinstance(expected, pd.DataFrame):
+            pd.testing.assert_frame_equal(expected, actual, check_exact=True)
+        elif isinstance(expected, pd.Series):
+            pd.testing.assert_series_equal(expected, actual, check_exact=True)
+        else:
+            pd.testing.assert_numpy_array_equal(expected, actual)
+    except AssertionError as e:
+        raise SystemExit(f"❌ {name} 결과 불일치: {e}")
@@ -0,0 +1,138 @@
+"""
+43단계(조제) 수율/loss율 업데이트 벤치마크
+기존 품번별 .loc 반복 / iterrows 구현과 43단계 apply_yields(조건 행 한 번에 갱신)를 비교하고 결과가 같은지 확인
+- 건조과일: '자재명'에 건조/열풍 태그가 있는 행, 수율 '대분류'=조제 & '비고'=건조과일 (중복 품번은 양쪽 모두 ValueError)
+- 부자재: '품목자산분류'가 부자재인 행 / '공정'이 스티커·재활용분담금인 행, 수율 '대분류'=조제 & '구분'=부자재 (중복 품번은 첫 번째 값)
+
+사용법: python benchmarks/bench_apply_yields.py --rows 20000 --yield-rows 2000
+"""
+import argparse
+import importlib
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import assert_same, speedup, timed
+import material_class
+import yield_table
+
+step43 = importlib.import_module('사전원가_43단계')
+
+
+def make_data(rows, yield_rows, seed):
+    """
+    합성 BOM과 수율 표
+    (BOM index는 0부터 시작하지 않는 순서, 수율/BOM 값에 결측값, 건조과일 수율은 품번마다 한 행, 부자재 수율은 품번 중복 포함)
+    """
+    rng = np.random.default_rng(seed)
+    parts = np.array([f"2{i:07d}" for i in range(yield_rows)], dtype=object)
+    pick = lambda values, size: np.asarray(values, dtype=object)[rng.integers(0, len(values), size)]
+    with_gaps = lambda size: np.where(rng.random(size) < 0.2, np.nan, rng.random(size))
+
+    dried = rng.permutation(parts)[: yield_rows // 4]
+    others = parts[rng.integers(0, len(parts), yield_rows)]
+    yield_df = pd.DataFrame({
+        '품번': np.concatenate([dried, others]),
+        '대분류': np.concatenate([np.full(len(dried), '조제', dtype=object), pick(['조제', '원두'], len(others))]),
+        '구분': np.concatenate([np.full(len(dried), '원자재', dtype=object), pick(['부자재', '원자재'], len(others))]),
+        '비고': np.concatenate([np.full(len(dried), '건조과일', dtype=object), pick(['스티커', np.nan], len(others))]),
+        '수율': with_gaps(len(dried) + len(others)),
+        'loss율': rng.random(len(dried) + len(others)),
+    })
+
+    bom_df = pd.DataFrame({
+        '품번': pick(np.append(parts, 'X0000000'), rows),
+        '자재명': pick(['건조 사과', '열풍 망고', '설탕', '박스'], rows),
+        '자재번호': pick(['51A00001', '40000001'], rows),
+        '품목자산분류': pick(['부자재', '원자재'], rows),
+        '공정': pick(['스티커', '재활용분담금', '배합'], rows),
+        '수율': with_gaps(rows),
+        'loss율': rng.random(rows),
+    }, index=rng.permutation(rows) * 3)
+    # 3단계와 같이 자재구분/자재공정 분류 열 추가 (중간 파일(csv)을 다시 읽은 것과 같도록 문자열 열로 변환)
+    bom_df = material_class.add_material_classes(bom_df)
+    bom_df[material_class.COLUMNS] = bom_df[material_class.COLUMNS].astype(object)
+    return bom_df, yield_df
+
+
+# 기존 구현 (yield_table 도입 전 43단계 그대로) ---------------------------------------------------------
+
+def legacy_dried_fruits(bom_df, yield_df):
+    dried_fruits_condition = material_class.has_tag(bom_df, '건조/열풍')
+    dried_fruits_parts = bom_df.loc[dried_fruits_condition, '품번']
+    filtered_yield_df = yield_df[
+        (yield_df['대분류'] == '조제') & (yield_df['비고'] == '건조과일')
+    ][['품번', '수율', 'loss율']]
+    mapping = filtered_yield_df.set_index('품번').to_dict(orient='index')
+    for part in dried_fruits_parts:
+        if part in mapping:
+            bom_df.loc[(bom_df['품번'] == part) & dried_fruits_condition, ['수율', 'loss율']] = \
+                mapping[part]['수율'], mapping[part]['loss율']
+    return bom_df
+
+
+def legacy_raw_materials(condition):
+    def run(bom_df, yield_df):
+        filtered_yield_df = yield_df[
+            (yield_df['대분류'] == '조제') & (yield_df['구분'] == '부자재')
+        ][['품번', '수율', 'loss율']].drop_duplicates(subset='품번', keep='first')
+        mapping = filtered_yield_df.set_index('품번').to_dict(orient='index')
+        raw_material_condition = condition(bom_df)
+        for index, row in bom_df[raw_material_condition].iterrows():
+            part_number = row['품번']
+            if part_number in mapping:
+                bom_df.loc[index, ['수율', 'loss율']] = mapping[part_number]['수율'], mapping[part_number]['loss율']
+        return bom_df
+    return run
+
+
+# ✅ 43단계 업데이트 순서: 이름 → (기존 구현, 현재 구현)
+UPDATES = {
+    '건조과일': (legacy_dried_fruits, step43.update_dried_fruits),
+    '부자재 (품목자산분류)': (legacy_raw_materials(lambda df: df['품목자산분류'] == '부자재'), step43.update_raw_materials),
+    '부자재 (스티커/재활용분담금)': (legacy_raw_materials(lambda df: df['공정'].isin(['스티커', '재활용분담금'])),
+                            step43.update_raw_materials2),
+}
+
+
+def raises_value_error(func, *args):
+    try:
+        func(*args)
+    except ValueError:
+        return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="43단계 수율/loss율 업데이트 벤치마크")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--yield-rows", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bom_df, yield_df = make_data(args.rows, args.yield_rows, args.seed)
+    yields = yield_table.YieldTable(yield_df)
+    print(f"BOM: {len(bom_df):,}행 / 수율: {len(yield_df):,}행")
+
+    expected, actual = bom_df.copy(), bom_df.copy()
+    for name, (legacy, current) in UPDATES.items():
+        expected, legacy_seconds = timed(legacy, expected, yield_df)
+        actual, current_seconds = timed(current, actual, yields)
+        assert_same(name, expected, actual)
+        print(f"{name}: 기존 {legacy_seconds:.3f}초 / apply_yields {current_seconds:.3f}초"
+              f" ({speedup(legacy_seconds, current_seconds):,.1f}배 빠름)")
+
+    # 건조과일 수율에 같은 품번이 두 번 나오면 기존(to_dict(orient='index'))과 같이 ValueError
+    duplicated = pd.concat([yield_df, yield_df[yield_df['비고'] == '건조과일'].head(1)], ignore_index=True)
+    if not (raises_value_error(legacy_dried_fruits, bom_df.copy(), duplicated)
+            and raises_value_error(step43.update_dried_fruits, bom_df.copy(), yield_table.YieldTable(duplicated))):
+        raise SystemExit("❌ 건조과일 중복 품번 처리 불일치")
+    print("✅ 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+메모리 보관용 압축 스키마(bom_schema.compact) 메모리 사용량 / 압축·복원 비용 측정
+열별 압축 전후 메모리와 frame_store가 저장 1회마다 치르는 압축 시간, 읽기 1회마다 치르는 복원 시간을 측정하고,
+expand로 복원한 결과가 원본과 같은지 확인
+(단계에는 항상 복원한 원래 열 타입이 전달되므로 category 비교 속도는 단계 실행 시간과 무관해 측정하지 않음)
+
+사용법: python benchmarks/bench_compact_frames.py --rows 500000
+        python benchmarks/bench_compact_frames.py --csv uploads/BOM_가공.csv
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import assert_same, timed
+import bom_schema
+
+
+def make_data(rows, products, seed):
+    """
+    합성 BOM 작업 데이터 생성 (값 종류가 적은 분류/공정 열, 코드 열, 정수/실수 열)
+    """
+    rng = np.random.default_rng(seed)
+    product_numbers = np.array([f"2{i:07d}" for i in range(products)], dtype=object)
+    material_numbers = np.array([f"51A{i:05d}" for i in range(products * 4)], dtype=object)
+    pick = lambda values: np.asarray(values, dtype=object)[rng.integers(0, len(values), rows)]
+
+    df = pd.DataFrame({
+        '품목대분류': pick(['원두', '조제', '액상', '추출액']),
+        '품목자산분류': pick(['원자재', '부자재', '반제품', '0']),
+        '구분': pick(['드립백', '커피백', '캡슐', '미세', '선물세트']),
+        '품번': product_numbers[rng.integers(0, products, rows)],
+        '품명': pick([f"제품 {i}" for i in range(products)]),
+        '공정흐름차수명': pick(['재료비', '노무비', '제조경비', '임가공비']),
+        '공정': pick(['배전', '분쇄', '배/착', '추출', '포장', '스틱', '미세', '배합']),
+        '자재번호': material_numbers[rng.integers(0, len(material_numbers), rows)],
+        '자재명': pick([f"배전-원두 {i}" for i in range(products)]),
+        '조달구분': pick(['구매', '제작', '운반비']),
+        '비고': pick(['0', '외주', '삼양']),
+        '단위': pick(['KG', 'EA', 'G']),
+        'BOM차수': rng.integers(1, 5, rows),
+        '소요량분자': rng.integers(1, 1000, rows).astype(float),
+        '단가': rng.random(rows) * 10_000,
+    })
+    df.loc[rng.random(rows) < 0.05, '비고'] = np.nan
+    return df
+
+
+def megabytes(value):
+    return f"{value / 1024 / 1024:,.1f}MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메모리 보관용 압축 스키마 벤치마크")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--products", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="합성 데이터 대신 측정할 중간 CSV 파일")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv, low_memory=False) if args.csv else make_data(args.rows, args.products, args.seed)
+    print(f"행 수: {len(df):,} / 열 수: {len(df.columns)}")
+
+    (compact_df, restore), compact_seconds = timed(bom_schema.compact, df)
+    restored, expand_seconds = timed(bom_schema.expand, compact_df, restore)
+
+    print("\n열별 메모리 (압축 전 → 압축 후)")
+    before_columns = df.memory_usage(index=False, deep=True)
+    after_columns = compact_df.memory_usage(index=False, deep=True)
+    for position, column in enumerate(df.columns):
+        if position in restore:
+            print(f"  {column}: {df.iloc[:, position].dtype} {megabytes(before_columns.iloc[position])}"
+                  f" → {compact_df.iloc[:, position].dtype} {megabytes(after_columns.iloc[position])}")
+
+    before, after = bom_schema.memory_bytes(df), bom_schema.memory_bytes(compact_df)
+    print(f"합계: {megabytes(before)} → {megabytes(after)} ({before / max(after, 1):.1f}배 감소)")
+    print(f"비용: 저장 1회당 압축 {compact_seconds:.3f}초 / 읽기 1회당 복원 {expand_seconds:.3f}초")
+
+    assert_same("복원", df, restored)
+    print("✅ 복원 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
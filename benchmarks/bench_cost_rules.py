@@ -0,0 +1,201 @@
+"""
+배합원가 / loss율_포장 / 사전원가 규칙(cost_rules) 벤치마크
+기존 18/39/57단계의 .loc 조건1…조건9 구현과 cost_rules.compile_rules(제품군).apply를 비교하고 결과가 같은지 확인
+- 액상,추출액 (18단계): 구매 / 추출 제작(천안·외주) / 재활용분담금·동판 / 흐름 / loss율_포장 / 21213226 동판 / 추출액 비닐·분쇄
+- 원두 (39단계), 조제 (57단계): 공통 규칙 후 완제품 BOM 합계(사전원가_X / X / X_loss)로 덮어쓰기
+
+사용법: python benchmarks/bench_cost_rules.py --rows 200000
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import assert_same, speedup, timed
+import cost_rules
+import material_class
+
+
+def make_data(rows, seed):
+    """
+    합성 BOM (모든 규칙 조건이 나오도록 값을 섞음, 단가/loss율/비고/자재명에 결측값, BOM환산수량·단가_추출_천안·추출량에 0 포함)
+    """
+    rng = np.random.default_rng(seed)
+    pick = lambda values: np.array(values, dtype=object)[rng.integers(0, len(values), rows)]
+    amounts = lambda: np.where(rng.random(rows) < 0.05, np.nan, rng.random(rows) * 1000)
+    with_zeros = lambda: np.where(rng.random(rows) < 0.3, 0.0, rng.random(rows) * 100)
+    df = pd.DataFrame({
+        '품목대분류': pick(['액상', '추출액', '반제품', '원두', '조제']),
+        '품번': pick(['21213226', '21213227', '31000001', '41000002']),
+        '공정흐름차수명': pick(['노무비', '제조경비', '임가공비', '재료비', '포장재']),
+        '공정': pick(['재활용분담금', '동판', '포장', '비닐', '배합', '추출']),
+        '자재명': pick(['추출-콜드브루', '분쇄-블렌드', '원두 배전-A', '박스', np.nan]),
+        '자재번호': pick(['0', '51A00001', '52B12345', '40101001']),
+        '비고': pick(['삼양', '동원시스템즈', '외주', np.nan]),
+        '조달구분': pick(['구매', '제작', '스트로우', '동판', '부재료비']),
+        'BOM환산수량': with_zeros(),
+        '소요량분자': rng.random(rows),
+        '단가': amounts(),
+        '환산비용': amounts(),
+        'loss율': np.where(rng.random(rows) < 0.1, np.nan, rng.random(rows) * 0.1),
+        '단가_추출_천안': with_zeros(),
+        '단가_추출_외주': with_zeros(),
+        '단가_배전': amounts(),
+        '단가_분쇄': amounts(),
+        '추출량비율': rng.random(rows),
+        '원두투입': rng.random(rows) * 10,
+        '추출량': with_zeros(),
+    })
+    for family in ('원두', '조제'):
+        df[f'사전원가_{family}'] = amounts()
+        df[family] = amounts()
+        df[f'{family}_loss'] = amounts()
+    # 3단계와 같이 자재구분/자재공정 분류 열 추가 (중간 파일(csv)을 다시 읽은 것과 같도록 문자열 열로 변환)
+    df = material_class.add_material_classes(df)
+    df[material_class.COLUMNS] = df[material_class.COLUMNS].astype(object)
+    return df
+
+
+# 기존 구현 (18/39/57단계 규칙 부분 그대로) ------------------------------------------------------------
+
+def legacy_purchase(bom_df):
+    bom_df['자재번호'] = bom_df['자재번호'].astype(str).str.strip()
+    bom_df['품번'] = bom_df['품번'].astype(str).str.strip()
+
+    if '배합원가' not in bom_df.columns:
+        bom_df['배합원가'] = np.nan
+    구매_조건 = (bom_df['조달구분'] == '구매') & ~bom_df['자재번호'].str.match(r'5\d[A|B]\d{5}')
+    bom_df.loc[구매_조건, '배합원가'] = bom_df.loc[구매_조건, '환산비용']
+    return bom_df
+
+
+def legacy_extraction(bom_df):
+    제작_조건 = (bom_df['조달구분'] == '제작') & bom_df['자재명'].str.contains('추출-', na=False)
+    천안_조건 = bom_df['단가_추출_천안'] != 0
+    bom_df.loc[제작_조건 & 천안_조건, '배합원가'] = (
+        np.where(
+            bom_df.loc[제작_조건 & 천안_조건, 'BOM환산수량'] != 0,
+            bom_df.loc[제작_조건 & 천안_조건, '단가_추출_천안'] * bom_df.loc[제작_조건 & 천안_조건, 'BOM환산수량'],
+            bom_df.loc[제작_조건 & 천안_조건, '단가_추출_천안'] * bom_df.loc[제작_조건 & 천안_조건, '소요량분자']
+        )
+    )
+    bom_df.loc[제작_조건 & ~천안_조건, '배합원가'] = (
+        np.where(
+            bom_df.loc[제작_조건 & ~천안_조건, 'BOM환산수량'] != 0,
+            bom_df.loc[제작_조건 & ~천안_조건, '단가_추출_외주'] * bom_df.loc[제작_조건 & ~천안_조건, 'BOM환산수량'],
+            bom_df.loc[제작_조건 & ~천안_조건, '단가_추출_외주'] * bom_df.loc[제작_조건 & ~천안_조건, '소요량분자']
+        )
+    )
+    return bom_df
+
+
+def legacy_common(bom_df):
+    재활용_조건 = (bom_df['공정'].isin(['재활용분담금', '동판']))
+    bom_df.loc[재활용_조건, '배합원가'] = bom_df.loc[재활용_조건, '단가']
+    흐름_조건 = bom_df['공정흐름차수명'].isin(['노무비', '제조경비', '임가공비', '재료비'])
+    bom_df.loc[흐름_조건, '배합원가'] = bom_df.loc[흐름_조건, '단가']
+
+    if 'loss율_포장' not in bom_df.columns:
+        bom_df['loss율_포장'] = np.nan
+    조건1 = (
+        (bom_df['공정'] != '재활용분담금') &
+        (~bom_df['공정흐름차수명'].isin(['노무비', '제조경비', '임가공비']))
+    )
+    bom_df.loc[조건1, 'loss율_포장'] = bom_df.loc[조건1, '배합원가'] * bom_df.loc[조건1, 'loss율']
+    조건2 = (
+        (bom_df['공정'] == '재활용분담금') &
+        (bom_df['자재번호'] == '0'))
+    bom_df.loc[조건2, 'loss율_포장'] = bom_df.loc[조건2, '배합원가'] * bom_df.loc[조건2, 'loss율']
+    조건3 = (
+        (bom_df['공정'] == '포장') &
+        (bom_df['공정흐름차수명'].isin(['노무비', '제조경비', '임가공비']))
+    )
+    bom_df.loc[조건3, 'loss율_포장'] = 0
+    조건4 = bom_df['조달구분'] == '스트로우'
+    bom_df.loc[조건4, 'loss율_포장'] = bom_df.loc[조건4, '배합원가'] * bom_df.loc[조건4, 'loss율']
+    조건5 = ((bom_df['공정흐름차수명'] == '재료비') & (bom_df['비고'].isin(['삼양', '동원시스템즈'])))
+    bom_df.loc[조건5, 'loss율_포장'] = 0
+    조건6 = bom_df['조달구분'] == '동판'
+    bom_df.loc[조건6, 'loss율_포장'] = bom_df.loc[조건6, '배합원가'] * bom_df.loc[조건6, 'loss율']
+
+    if '사전원가' not in bom_df.columns:
+        bom_df['사전원가'] = np.nan
+    bom_df['사전원가'] = bom_df['배합원가'] + bom_df['loss율_포장']
+    return bom_df
+
+
+def legacy_liquid(bom_df):
+    """18단계 (액상,추출액)"""
+    legacy_common(legacy_extraction(legacy_purchase(bom_df)))
+    조건7 = ((bom_df['품번'] == '21213226') & (bom_df['조달구분'] == '동판'))
+    bom_df.loc[조건7, '사전원가'] = bom_df.loc[조건7, '배합원가']
+    조건8 = ((bom_df['품목대분류'] == '추출액') & (bom_df['공정'] == '비닐'))
+    bom_df.loc[조건8, '사전원가'] = bom_df.loc[조건8, '단가_배전']
+    조건9 = ((bom_df['품목대분류'] == '추출액') & bom_df['자재명'].str.contains('분쇄-', na=False))
+    bom_df.loc[조건9, '배합원가'] = (
+        np.where(
+            bom_df.loc[조건9, 'BOM환산수량'] != 0,
+            bom_df.loc[조건9, '단가_분쇄'] * bom_df.loc[조건9, 'BOM환산수량'],
+            bom_df.loc[조건9, '단가_분쇄'] * bom_df.loc[조건9, '소요량분자']
+        )
+    )
+    bom_df.loc[조건9, '배합원가'] = bom_df.loc[조건9, '단가_분쇄'] * bom_df.loc[조건9, '추출량비율'] * bom_df.loc[조건9, '원두투입'] / bom_df.loc[조건9, '추출량']
+    bom_df.loc[조건9, 'loss율_포장'] = bom_df.loc[조건9, '배합원가'] * bom_df.loc[조건9, 'loss율']
+    bom_df.loc[조건9, '사전원가'] = bom_df.loc[조건9, '배합원가'] + bom_df.loc[조건9, 'loss율_포장']
+    return bom_df
+
+
+def legacy_family(family):
+    """39단계 (원두), 57단계 (조제): 조건10만 제품군 이름이 다름"""
+    def run(bom_df):
+        legacy_common(legacy_purchase(bom_df))
+        조건10 = (bom_df['품목대분류'] == family)
+        bom_df.loc[조건10, '사전원가'] = bom_df.loc[조건10, f'사전원가_{family}']
+        bom_df.loc[조건10, '배합원가'] = bom_df.loc[조건10, family]
+        bom_df.loc[조건10, 'loss율_포장'] = bom_df.loc[조건10, f'{family}_loss']
+        return bom_df
+    return run
+
+
+# ✅ 제품군 → (단계, 기존 구현)
+FAMILIES = {
+    '액상,추출액': ('18단계', legacy_liquid),
+    '원두': ('39단계', legacy_family('원두')),
+    '조제': ('57단계', legacy_family('조제')),
+}
+
+
+def current(plan):
+    def run(bom_df):
+        plan.apply(bom_df)
+        return bom_df
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배합원가/loss율_포장/사전원가 규칙 벤치마크")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = make_data(args.rows, args.seed)
+    print(f"행 수: {len(df):,}")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for family, (step, legacy) in FAMILIES.items():
+            name = f"{family} ({step})"
+            plan = cost_rules.compile_rules(family)
+            expected, legacy_seconds = timed(legacy, df.copy())
+            actual, current_seconds = timed(current(plan), df.copy())
+            assert_same(name, expected, actual)
+            print(f"{name}: .loc 조건 {legacy_seconds:.3f}초 / cost_rules {current_seconds:.3f}초"
+                  f" ({speedup(legacy_seconds, current_seconds):,.1f}배 빠름)")
+    print("✅ 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
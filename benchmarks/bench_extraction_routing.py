@@ -0,0 +1,95 @@
+"""
+15단계 추출 routing 집계 벤치마크
+기존 품번별 반복(.loc 마스크 할당)과 extraction_costing.add_routing_costs(집계 1회 + 매핑 1회)를 합성 데이터로 비교
+
+사용법: python benchmarks/bench_extraction_routing.py --products 2000 --rows-per-product 8
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import speedup, timed
+import extraction_costing
+
+
+def make_data(products, rows_per_product, seed):
+    """
+    합성 'BOM_추출_액상,추출액' 데이터 생성
+    (추출 routing 행 중 일부는 외주/운반비, 외주 routing이 여러 개인 품번 포함)
+    """
+    rng = np.random.default_rng(seed)
+    rows = products * rows_per_product
+    product_numbers = np.array([f"234{i:05d}" for i in range(products)], dtype=object)
+
+    routing = rng.random(rows) < 0.5
+    remarks = np.where(rng.random(rows) < 0.2, '외주 추출', '0').astype(object)
+    remarks[rng.random(rows) < 0.1] = np.nan
+    return pd.DataFrame({
+        '품번': np.repeat(product_numbers, rows_per_product),
+        '공정': np.where(rng.random(rows) < 0.7, '추출', '배전'),
+        '자재명': np.where(routing, '0', '원두'),
+        '비고': remarks,
+        '조달구분': np.where(rng.random(rows) < 0.1, '운반비', '노무비'),
+        '단가': rng.random(rows) * 1000,
+    })
+
+
+def legacy_routing(bom_df):
+    """
+    기존 15단계 구현 (품번마다 전체 행 마스크 생성)
+    """
+    bom_df['추출_routing'] = 0.0
+    mask_추출_routing = (bom_df['공정'] == '추출') & (bom_df['자재명'] == '0') & (~bom_df['비고'].str.contains('외주', na=False))
+    mask_전체 = mask_추출_routing & (bom_df['조달구분'] != '운반비')
+    추출_routing_합산 = bom_df[mask_전체].groupby('품번')['단가'].agg('sum')
+
+    for 품번, value in 추출_routing_합산.items():
+        bom_df.loc[bom_df['품번'] == 품번, '추출_routing'] = value
+
+    bom_df['추출_routing_외주'] = 0.0
+    mask_추출_routing_외주 = (bom_df['공정'] == '추출') & (bom_df['자재명'] == '0') & (bom_df['비고'].str.contains('외주', na=False))
+
+    for 품번 in bom_df['품번'].unique():
+        품번_mask = bom_df['품번'] == 품번
+        외주_rows = bom_df[mask_추출_routing_외주 & 품번_mask]
+        if len(외주_rows) == 1:
+            추출_routing = bom_df.loc[품번_mask, '추출_routing'].iloc[0]
+            외주_단가 = 외주_rows['단가'].iloc[0]
+            bom_df.loc[품번_mask, '추출_routing_외주'] = 추출_routing + 외주_단가
+        elif len(외주_rows) > 1:
+            total_외주_단가 = 외주_rows['단가'].sum()
+            bom_df.loc[품번_mask, '추출_routing_외주'] = total_외주_단가
+    return bom_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추출 routing 집계 벤치마크")
+    parser.add_argument("--products", type=int, default=2_000)
+    parser.add_argument("--rows-per-product", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-legacy", action="store_true", help="기존 구현 측정 생략 (대용량 데이터용)")
+    args = parser.parse_args()
+
+    bom_df = make_data(args.products, args.rows_per_product, args.seed)
+    print(f"행 수: {len(bom_df):,} / 추출 품번 수: {args.products:,}")
+
+    new_df, new_seconds = timed(extraction_costing.add_routing_costs, bom_df.copy())
+    print(f"집계 + 매핑: {new_seconds:.3f}초")
+
+    if not args.skip_legacy:
+        old_df, old_seconds = timed(legacy_routing, bom_df.copy())
+        print(f"기존 구현: {old_seconds:.3f}초")
+        # 외주 routing이 여러 개인 품번의 합계는 groupby 합계(보정 합산)를 사용하므로 마지막 자리 반올림 차이만 허용
+        for column in ['추출_routing', '추출_routing_외주']:
+            if not np.allclose(old_df[column], new_df[column], rtol=1e-12, atol=0, equal_nan=True):
+                raise SystemExit(f"❌ 결과 불일치: '{column}' 값이 다릅니다.")
+        print(f"✅ 결과 일치, {speedup(old_seconds, new_seconds):,.0f}배 빠름")
+
+
+if __name__ == "__main__":
+    main()
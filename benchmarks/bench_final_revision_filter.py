@@ -0,0 +1,78 @@
+"""
+0단계 3번 구간의 최종차수 필터 벤치마크
+기존 행 단위 any(...) 검사와 bom_revision.final_revision_mask(해시 조회)를 합성 데이터로 비교
+
+사용법: python benchmarks/bench_final_revision_filter.py --rows 10000 --products 300
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import speedup, timed
+import bom_revision
+
+
+def make_data(rows, products, revisions, seed):
+    """
+    합성 '제품별공정별소요자재조회' / 최종차수 데이터 생성
+    (품번은 문자열, BOM차수는 정수, 일부 결측값 포함)
+    """
+    rng = np.random.default_rng(seed)
+    product_numbers = np.array([f"51A{i:05d}" for i in range(products)], dtype=object)
+
+    df_process = pd.DataFrame({
+        '품번': product_numbers[rng.integers(0, products, rows)],
+        'BOM차수': rng.integers(1, revisions + 1, rows),
+        '자재번호': rng.integers(40101000, 40102000, rows),
+    })
+    df_process.loc[rng.random(rows) < 0.001, '품번'] = np.nan
+
+    df_final_bom = pd.DataFrame({
+        '품번': product_numbers,
+        'BOM차수': rng.integers(1, revisions + 1, products),
+    })
+    return df_process, df_final_bom
+
+
+def legacy_mask(df_process, df_final_bom):
+    """
+    기존 0단계 구현 (행마다 모든 최종차수 키를 순회)
+    """
+    final_bom_keys = df_final_bom[['품번', 'BOM차수']].values
+
+    def is_final_bom(row):
+        return any((row['품번'] == key[0] and row['BOM차수'] == key[1]) for key in final_bom_keys)
+
+    return df_process.apply(is_final_bom, axis=1).to_numpy(dtype=bool)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="최종차수 필터 벤치마크")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=300)
+    parser.add_argument("--revisions", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-legacy", action="store_true", help="기존 구현 측정 생략 (대용량 데이터용)")
+    args = parser.parse_args()
+
+    df_process, df_final_bom = make_data(args.rows, args.products, args.revisions, args.seed)
+    print(f"행 수: {len(df_process):,} / 최종차수 키 수: {len(df_final_bom):,}")
+
+    new_mask, new_seconds = timed(bom_revision.final_revision_mask, df_process, df_final_bom)
+    print(f"해시 조회: {new_seconds:.3f}초 (일치 행 {int(new_mask.sum()):,})")
+
+    if not args.skip_legacy:
+        old_mask, old_seconds = timed(legacy_mask, df_process, df_final_bom)
+        print(f"기존 구현: {old_seconds:.3f}초 (일치 행 {int(old_mask.sum()):,})")
+        if not np.array_equal(old_mask, new_mask):
+            raise SystemExit("❌ 결과 불일치: 두 구현의 필터 결과가 다릅니다.")
+        print(f"✅ 결과 일치, {speedup(old_seconds, new_seconds):,.0f}배 빠름")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+loss율 규칙(loss_rules) 벤치마크
+기존 5단계(액상,추출액) / 22단계(원두)의 규칙별 to_dict + map 갱신 함수와 loss_rules.compile_rules(제품군).apply를 비교하고 결과가 같은지 확인
+시나리오
+- 기본: 규칙 조건이 섞인 BOM, 수율 loss율 일부 결측값
+- 결측 키: BOM과 수율의 품번/자재번호에 결측값
+- 빈 조회: 어떤 규칙의 수율 조회 조건에도 맞는 수율 행이 없음
+- 겹치는 조건: 한 행이 여러 규칙 조건(자재명/공정흐름/동판/재활용분담금/이산화탄소/비닐·박스)에 동시에 해당
+
+사용법: python benchmarks/bench_loss_rules.py --rows 100000 --parts 2000
+"""
+import argparse
+import importlib
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import assert_same, speedup, timed
+import loss_rules
+import yield_table
+
+step5 = importlib.import_module('사전원가_5단계')
+step22 = importlib.import_module('사전원가_22단계')
+
+
+def make_data(rows, parts, seed, missing_keys=False, empty_lookups=False, overlapping=False):
+    """
+    합성 BOM과 수율 표 (수율에는 같은 품번이 여러 구분/비고로 나오는 행 포함)
+    """
+    rng = np.random.default_rng(seed)
+    part_numbers = [f"2{i:07d}" for i in range(parts)]
+    materials = [f"4{i:07d}" for i in range(parts)]
+    pick = lambda values, size: np.asarray(values, dtype=object)[rng.integers(0, len(values), size)]
+
+    def with_missing(keys):
+        # 결측 키: 품번/자재번호의 약 5%를 결측값으로 (csv를 읽은 것과 같이 np.nan 하나를 공유)
+        if missing_keys:
+            keys[rng.random(len(keys)) < 0.05] = np.nan
+        return keys
+
+    yield_rows = parts * 2
+    yield_df = pd.DataFrame({
+        '품번': with_missing(pick(part_numbers, yield_rows)),
+        '대분류': pick(['원두', '액상', '추출액', '조제'], yield_rows),
+        '구분': pick(['부자재', '원자재'], yield_rows),
+        '비고': pick(['재활용분담금', '스티커', '트레이더스', '이산화탄소', np.nan], yield_rows),
+        '수율': rng.random(yield_rows),
+        'loss율': np.where(rng.random(yield_rows) < 0.2, np.nan, rng.random(yield_rows) / 10),
+    })
+    if empty_lookups:
+        # 모든 규칙의 조회 조건(구분/대분류/비고)에 맞지 않는 수율 행만 남김
+        yield_df['대분류'], yield_df['구분'], yield_df['비고'] = '기타', '기타', '기타'
+
+    if overlapping:
+        names, flows, processes, procurements = ['박스A', '케이스'], ['재료비'], ['동판', '재활용분담금', '비닐', '박스(30kg)'], ['이산화탄소']
+    else:
+        names = ['박스A', '케이스', '봉투', '스트로우', '이산화탄소', '설탕', np.nan]
+        flows = ['재료비', '노무비', np.nan]
+        processes = ['동판', '재활용분담금', '스티커', '트레이더스', '비닐', '박스(30kg)', '배전']
+        procurements = ['이산화탄소', '구매']
+    bom_df = pd.DataFrame({
+        '품번': with_missing(pick(part_numbers, rows)),
+        '자재번호': with_missing(pick(materials, rows)),
+        '자재명': pick(names, rows),
+        '공정흐름차수명': pick(flows, rows),
+        '공정': pick(processes, rows),
+        '조달구분': pick(procurements, rows),
+        '품목대분류': pick(['원두', '액상'], rows),
+        '품목자산분류': pick(['부자재', '원자재'], rows),
+        '단가': rng.random(rows) * 1000,
+        'loss율': np.where(rng.random(rows) < 0.3, np.nan, rng.random(rows) / 10),
+        'loss율_배전': rng.random(rows),
+    })
+    return bom_df, yield_df
+
+
+# 기존 구현 (yield_table 도입 전 5/22단계 그대로) -------------------------------------------------------
+
+def step5_key(series):
+    """5단계 load_dataframes의 품번 변환 (문자열 변환, 공백 제거, 소수점 이하 제거)"""
+    return series.astype(str).str.strip().str.split('.').str[0]
+
+
+def step22_key(series):
+    """22단계 load_dataframes의 품번 변환 (문자열 변환)"""
+    return series.astype(str)
+
+
+def with_loaded_keys(legacy, to_key):
+    """
+    기존 load_dataframes처럼 BOM과 수율의 품번을 모두 문자열로 바꾼 뒤 규칙 적용
+    (결측 품번은 양쪽 모두 'nan'이 되어 서로 일치), 비교를 위해 결과의 품번은 원래 값으로 되돌림
+    """
+    def run(bom_df, yield_df):
+        part_numbers = bom_df['품번']
+        bom_df['품번'] = to_key(part_numbers)
+        bom_df = legacy(bom_df, yield_df.assign(품번=to_key(yield_df['품번'])))
+        bom_df['품번'] = part_numbers
+        return bom_df
+    return run
+
+
+def update_loss_rate(bom_df, condition, loss_rate_mapping):
+    추출된_품번 = bom_df.loc[condition, '품번']
+    추출된_자재번호 = bom_df.loc[condition, '자재번호']
+    updated_loss율 = bom_df.loc[bom_df['품번'].isin(추출된_품번), '품번'].map(loss_rate_mapping)
+    bom_df.loc[bom_df['자재번호'].isin(추출된_자재번호), 'loss율'] = updated_loss율.fillna(bom_df['loss율'])
+    return bom_df
+
+
+def first_mapping(filtered_df):
+    return filtered_df.drop_duplicates(subset='품번', keep='first').set_index('품번')['loss율'].to_dict()
+
+
+def legacy_liquid(bom_df, yield_df):
+    """5단계 (액상,추출액)"""
+    loss_rate_mapping = first_mapping(yield_df[yield_df['구분'] == '부자재'][['품번', 'loss율']])
+    conditions = [
+        lambda df: df['자재명'].str.contains('박스|케이스|봉투|스트로우|이산화탄소', na=False),
+        lambda df: df['공정흐름차수명'].str.contains('재료비', na=False),
+        lambda df: df['공정'].str.contains('동판', na=False),
+    ]
+    for condition_func in conditions:
+        bom_df = update_loss_rate(bom_df, condition_func(bom_df), loss_rate_mapping)
+
+    recycling_loss_rate_mapping = first_mapping(yield_df[yield_df['비고'] == '재활용분담금'][['품번', 'loss율']])
+    recycling_condition = bom_df['공정'] == '재활용분담금'
+    bom_df.loc[recycling_condition, 'loss율'] = bom_df.loc[recycling_condition, '품번'].map(recycling_loss_rate_mapping)
+
+    co2_parts = bom_df[bom_df['조달구분'] == '이산화탄소']['품번'].astype(str)
+    yield_condition = (yield_df['품번'].isin(co2_parts)) & (yield_df['구분'] == '원자재')
+    co2_loss_rate_mapping = first_mapping(yield_df[yield_condition][['품번', 'loss율']])
+    co2_condition = bom_df['조달구분'] == '이산화탄소'
+    bom_df.loc[co2_condition, 'loss율'] = bom_df.loc[co2_condition, '품번'].map(co2_loss_rate_mapping)
+
+    filtered_yield_df = yield_df[(yield_df['대분류'].isin(['액상', '추출액'])) & (yield_df['구분'] == '부자재')]
+    yield_mapping = filtered_yield_df.set_index('품번')['loss율'].to_dict()
+    조건 = bom_df['공정'].isin(['비닐', '박스(30kg)'])
+    bom_df.loc[조건, 'loss율'] = bom_df.loc[조건, '품번'].map(yield_mapping)
+    bom_df.loc[조건, 'loss율_배전'] = bom_df.loc[조건, '단가'] * bom_df.loc[조건, 'loss율']
+    return bom_df
+
+
+def legacy_bean(bom_df, yield_df):
+    """22단계 (원두)"""
+    loss_rate_mapping = first_mapping(yield_df[yield_df['비고'] == '재활용분담금'][['품번', 'loss율']])
+    conditions = [
+        lambda df: df['자재명'].str.contains('박스|케이스|봉투|스트로우', na=False),
+        lambda df: df['공정흐름차수명'].str.contains('재료비', na=False),
+        lambda df: df['공정'].str.contains('동판', na=False),
+    ]
+    for condition_func in conditions:
+        bom_df = update_loss_rate(bom_df, condition_func(bom_df), loss_rate_mapping)
+
+    recycling_loss_rate_mapping = first_mapping(
+        yield_df[yield_df['비고'].isin(['재활용분담금', '스티커', '트레이더스'])][['품번', 'loss율']])
+    recycling_condition = bom_df['공정'].isin(['재활용분담금', '스티커', '트레이더스'])
+    bom_df.loc[recycling_condition, 'loss율'] = bom_df.loc[recycling_condition, '품번'].map(recycling_loss_rate_mapping)
+
+    raw_loss_rate_mapping = first_mapping(
+        yield_df[(yield_df['대분류'] == '원두') & (yield_df['구분'] == '부자재')][['품번', 'loss율']])
+    bom_condition = (bom_df['품목대분류'] == '원두') & (bom_df['품목자산분류'] == '부자재')
+    bom_df.loc[bom_condition, 'loss율'] = bom_df.loc[bom_condition, '품번'].map(raw_loss_rate_mapping)
+
+    co2_loss_rate_mapping = first_mapping(yield_df[yield_df['비고'] == '이산화탄소'][['품번', 'loss율']])
+    co2_condition = bom_df['조달구분'] == '이산화탄소'
+    bom_df.loc[co2_condition, 'loss율'] = bom_df.loc[co2_condition, '품번'].map(co2_loss_rate_mapping)
+
+    조건 = bom_df['공정'].isin(['비닐', '박스(30kg)'])
+    yield_mapping = yield_df.set_index('품번')['loss율'].to_dict()
+    bom_df.loc[조건, 'loss율'] = bom_df.loc[조건, '품번'].map(yield_mapping)
+    bom_df.loc[조건, 'loss율_배전'] = bom_df.loc[조건, '단가'] * bom_df.loc[조건, 'loss율']
+    return bom_df
+
+
+# 현재 구현 (단계 코드와 같은 호출) ------------------------------------------------------------------
+
+def current(family, step):
+    plan = loss_rules.compile_rules(family)
+
+    def run(bom_df, yield_df):
+        plan.apply(bom_df, yield_table.YieldTable(yield_df))
+        return step.update_packaging_loss(bom_df)
+    return run
+
+
+# ✅ 제품군 → (단계, 기존 구현, 현재 구현)
+FAMILIES = {
+    '액상,추출액': ('5단계', with_loaded_keys(legacy_liquid, step5_key), current('액상,추출액', step5)),
+    '원두': ('22단계', with_loaded_keys(legacy_bean, step22_key), current('원두', step22)),
+}
+
+# ✅ 시나리오 → make_data 옵션
+SCENARIOS = {
+    '기본': {},
+    '결측 키': {'missing_keys': True},
+    '빈 조회': {'empty_lookups': True},
+    '겹치는 조건': {'overlapping': True},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="loss율 규칙 벤치마크")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--parts", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for scenario, options in SCENARIOS.items():
+        bom_df, yield_df = make_data(args.rows, args.parts, args.seed, **options)
+        print(f"{scenario} (BOM {len(bom_df):,}행 / 수율 {len(yield_df):,}행)")
+        for family, (step, legacy, resolver) in FAMILIES.items():
+            name = f"{scenario} {family} ({step})"
+            expected, legacy_seconds = timed(legacy, bom_df.copy(), yield_df)
+            actual, current_seconds = timed(resolver, bom_df.copy(), yield_df)
+            assert_same(name, expected, actual)
+            print(f"  {family} ({step}): 기존 {legacy_seconds:.3f}초 / loss_rules {current_seconds:.3f}초"
+                  f" ({speedup(legacy_seconds, current_seconds):,.1f}배 빠름)")
+    print("✅ 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+품번/자재번호 키 표준화 벤치마크
+기존 행 단위 문자열 정리(astype(str).str.strip().str.upper())와 bom_schema.normalize_key(고유값마다 한 번) 비교
+(정수/문자열로 읽힌 키는 기존과 같은 값이어야 하고, 실수로 읽힌 키의 '.0'과 결측값만 다르게 처리됨)
+
+사용법: python benchmarks/bench_normalize_key.py --rows 1000000 --keys 20000
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import assert_same, speedup, timed
+import bom_schema
+
+
+def make_data(rows, keys, seed):
+    """
+    합성 자재번호 열 (CSV에서 읽은 것처럼 정수/실수/문자열이 섞인 값, 일부 결측값과 공백 포함)
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.array([40_000_000 + i for i in range(keys)], dtype=object)
+    codes = np.array([f"51A{i:05d}" for i in range(keys)], dtype=object)
+    picked = rng.integers(0, keys, rows)
+    values = np.where(rng.random(rows) < 0.5, numbers[picked], codes[picked]).astype(object)
+    as_float = rng.random(rows) < 0.1
+    values[as_float] = [float(v) if isinstance(v, int) else f" {v} " for v in values[as_float]]
+    values[rng.random(rows) < 0.01] = np.nan
+    return pd.Series(values, dtype=object)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키 표준화 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keys", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    raw = make_data(args.rows, args.keys, args.seed)
+    print(f"행 수: {len(raw):,} / 고유 키 수: {raw.nunique():,}")
+
+    legacy, legacy_seconds = timed(lambda series: series.astype(str).str.strip().str.upper(), raw)
+    keys, normalize_seconds = timed(bom_schema.normalize_key, raw)
+    print(f"키 정리: 기존 {legacy_seconds:.3f}초 (고유 키 {legacy.nunique():,}개) / normalize_key {normalize_seconds:.3f}초"
+          f" (고유 키 {keys.nunique():,}개, {speedup(legacy_seconds, normalize_seconds):,.1f}배 빠름)")
+
+    plain = raw.map(lambda value: isinstance(value, (int, str))).to_numpy(dtype=bool)
+    assert_same("정수/문자열 키", legacy[plain], keys[plain].astype(object))
+    if keys[raw.isna().to_numpy()].notna().any():
+        raise SystemExit("❌ 결측 키가 문자열로 바뀌었습니다.")
+    print("✅ 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
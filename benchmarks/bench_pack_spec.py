@@ -0,0 +1,57 @@
+"""
+입수(규격 문자열 파싱) 벤치마크
+- 기존 방식: 규격 열에 Series.apply로 행마다 정규식 파싱
+- pack_spec.pack_counts: 고유 규격마다 한 번만 파싱해 행으로 펼침
+
+사용법: python benchmarks/bench_pack_spec.py --rows 500000 --specs 300
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import assert_same, speedup, timed
+import pack_spec
+
+
+def make_data(rows, specs, seed):
+    """
+    합성 규격 열 (원두 '1kg*10' / 조제 '12g*30P' 형식과 숫자가 없는 규격, 일부 결측값)
+    """
+    rng = np.random.default_rng(seed)
+    values = np.array([f"{rng.integers(1, 1000)}g*{rng.integers(1, 60)}P" if i % 3 else f"{rng.integers(1, 5)}kg*{rng.integers(1, 20)}"
+                       for i in range(specs)] + ['EA'], dtype=object)
+    column = values[rng.integers(0, len(values), rows)]
+    column[rng.random(rows) < 0.02] = np.nan
+    return pd.Series(column, dtype=object)
+
+
+def row_by_row(specs, parser):
+    return specs.apply(lambda value: None if pd.isna(value) else parser(value))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="입수 파싱 벤치마크")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--specs", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    specs = make_data(args.rows, args.specs, args.seed)
+    print(f"행 수: {len(specs):,} / 고유 규격 수: {specs.nunique():,}")
+
+    for name, spec_parser in (('원두 (star_count)', pack_spec.star_count), ('조제 (pack_count)', pack_spec.pack_count)):
+        expected, apply_seconds = timed(row_by_row, specs, spec_parser)
+        actual, distinct_seconds = timed(pack_spec.pack_counts, specs, spec_parser)
+        assert_same(name, expected, actual)
+        print(f"{name}: apply {apply_seconds:.3f}초 / 고유값 파싱 {distinct_seconds:.3f}초"
+              f" ({speedup(apply_seconds, distinct_seconds):,.1f}배 빠름)")
+    print("✅ 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+38단계(원두) / 55단계(조제) 제품군 원가 계산 벤치마크
+기존 행 단위 calculate_ondoo (df.apply(axis=1))와 product_costing(분기 조건 + np.select)을 비교
+
+사용법: python benchmarks/bench_product_costing.py --family 원두 --rows 100000
+        python benchmarks/bench_product_costing.py --family 조제 --csv uploads/사전원가_조제.csv
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import speedup, timed
+import product_costing
+
+
+def make_data(family, rows, seed):
+    """
+    합성 '사전원가_원두' / '사전원가_조제' 데이터 생성 (모든 분기가 나오도록 값을 섞음, 입수/수율에 0과 결측값 포함)
+    """
+    rng = np.random.default_rng(seed)
+    pick = lambda values: np.array(values, dtype=object)[rng.integers(0, len(values), rows)]
+    with_gaps = lambda values: np.where(rng.random(rows) < 0.1, np.nan, np.where(rng.random(rows) < 0.1, 0, values))
+    df = pd.DataFrame({
+        '품목대분류': pick([family, family, family, '반제품']),
+        '구분': pick(product_costing.PACK_TYPES[family] + ['0', '0', '선물세트']),
+        '품목자산분류': pick(['원자재', '부자재', '0', '원자재']),
+        '품목소분류': pick(['반제품', '아워티(조제_NB)', '0']),
+        '공정흐름차수명': pick(['노무비', '제조경비', '재료비', '0']),
+        '공정': pick(['스티커', '재활용분담금', '트레이더스', '포장', '배전']),
+        '조달구분': pick(['제작', '구매', '제작']),
+        '자재명': pick(['배전-A', '배/착-B', '분쇄-C', '분/착-D', '스틱-E', '미세-F', '0']),
+        '자재번호': pick(['51A00001', '52B12345', '40101001', '0']),
+        'BOM환산수량': np.where(rng.random(rows) < 0.5, 0, rng.random(rows)),
+        '입수': with_gaps(rng.integers(1, 30, rows).astype(float)),
+        '수율': with_gaps(rng.random(rows)),
+        '환산비용': rng.random(rows) * 1000,
+        '단가': rng.random(rows) * 1000,
+        '소요량분자': rng.random(rows),
+        'loss율': rng.random(rows) * 0.1,
+        **{f'단가_{stage}': rng.random(rows) * 100 for stage in ['배전', '배/착', '분쇄', '분/착', '스틱', '미세']},
+    })
+    # 기존 원두 구현은 캡슐 행의 입수가 0이면 ZeroDivisionError로 단계 전체가 실패하므로 비교 데이터에서 제외
+    if family == '원두':
+        df.loc[(df['구분'] == '캡슐') & (df['입수'] == 0), '입수'] = np.nan
+    return df
+
+
+# 기존 구현 (38단계 / 55단계 calculate_ondoo 그대로) ---------------------------------------------------
+
+def legacy_bean_cost(row):
+    try:
+        # 조건 1: '품목대분류'가 '원두'이고 '품목자산분류'가 '부자재'
+        if row['품목대분류'] == '원두' and row['품목자산분류'] == '부자재' and row['구분'] in ['드립백', '커피백', '캡슐']:
+            if row['입수']:
+                return row['환산비용'] / row['입수']
+            else:
+                return None
+
+        # 조건 2: '공정흐름차수명'이 '노무비' 또는 '제조경비'
+        if row['품목대분류'] == '원두' and row['공정흐름차수명'] in ['노무비', '제조경비'] and row['구분'] in ['드립백', '커피백', '캡슐']:
+            return row['단가']
+
+        # 조건 3: '공정'이 '스티커' 또는 '재활용분담금'
+        if row['품목대분류'] == '원두' and row['공정'] in ['스티커', '재활용분담금'] and row['구분'] in ['드립백', '커피백', '캡슐']:
+            return row['단가']
+
+        # 조건 4~8: '조달구분'이 '제작'인 경우 자재명과 세부 조건 처리
+        if row['품목대분류'] == '원두' and row['조달구분'] == '제작' and row['구분'] in ['드립백', '커피백', '캡슐']:
+            if '배전' in row['자재명'] and row['BOM환산수량'] == 0:
+                return row['단가_배전'] * row['소요량분자'] / row['입수'] if row['입수'] else None
+            elif '배/착' in row['자재명'] and row['BOM환산수량'] == 0:
+                return row['단가_배/착'] * row['소요량분자'] / row['입수'] if row['입수'] else None
+            elif '분쇄' in row['자재명'] and row['BOM환산수량'] == 0:
+                return row['단가_분쇄'] * row['소요량분자'] / row['입수'] if row['입수'] else None
+            elif '분/착' in row['자재명'] and row['BOM환산수량'] == 0:
+                return row['단가_분/착'] * row['소요량분자'] / row['입수'] if row['입수'] else None
+            elif '스틱' in row['자재명'] and row['BOM환산수량'] == 0:
+                return row['단가_스틱'] * row['소요량분자'] / row['입수'] if row['입수'] else None
+
+        # 조건 10: '구분' 값이 '드립백', '커피백', '캡슐'이 아닌 경우 및 '품목자산분류'가 '원자재'이고 '자재번호'가 특정 패턴
+        if (
+            row['품목대분류'] == '원두'
+            and row['구분'] not in ['드립백', '커피백', '캡슐']
+            and row['품목자산분류'] == '원자재'
+            and pd.notna(row['자재번호'])
+            and bool(re.match(r'5\d[A|B]\d{5}', str(row['자재번호'])))
+        ):
+            if row['수율']:
+                return row['환산비용'] / row['수율']
+
+        # 조건 11: '구분' 값이 '드립백', '커피백', '캡슐'이 아닌 경우 및 '품목자산분류'가 '원자재'이고 '자재번호'가 특정 패턴이 아닌 경우
+        if (
+            row['품목대분류'] == '원두'
+            and row['구분'] not in ['드립백', '커피백', '캡슐']
+            and row['품목자산분류'] == '원자재'
+            and not bool(re.match(r'5\d[A|B]\d{5}', str(row['자재번호'])))
+        ):
+            return row['환산비용']
+
+        # 조건 12: '품목대분류'가 '원두'이고 '구분'값이 '캡슐'이며, '품목자산분류'가 '원자재' 이고, '자재번호'가 특정패턴이 아닌 경우
+        if (
+            row['품목대분류'] == '원두'
+            and row['구분'] in ['캡슐']
+            and row['품목자산분류'] == '원자재'
+            and not bool(re.match(r'5\d[A|B]\d{5}', str(row['자재번호'])))
+        ):
+            return row['환산비용'] /row['입수']
+
+        # 조건 13: '구분' 값이 '드립백', '커피백', '캡슐'이 아닌 경우 및 '품목자산분류'가 '부자재'
+        if row['품목대분류'] == '원두' and row['구분'] not in ['드립백', '커피백', '캡슐'] and row['품목자산분류'] == '부자재':
+            return row['환산비용']
+
+        # 조건 14: '구분' 값이 '드립백', '커피백', '캡슐'이 아닌 경우 및 '공정'이 특정 값
+        if row['품목대분류'] == '원두' and row['구분'] not in ['드립백', '커피백', '캡슐'] and row['공정'] in ['스티커', '재활용분담금','트레이더스']:
+            return row['단가']
+
+        # 조건 15: '품목대분류'가 '원두'인 경우
+        if row['품목대분류'] == '원두' and row['공정흐름차수명'] in ['노무비', '제조경비'] and row['구분'] not in ['드립백', '커피백', '캡슐']:
+            return row['단가']
+
+        return None
+    except KeyError as e:
+        logging.warning(f"필드 누락: {e}")
+        return None
+
+
+def legacy_blend_cost(row):
+    try:
+        # '입수' 값이 없으면 기본값으로 1 설정 (빈칸, NaN, 0 모두 처리)
+        입수 = row['입수'] if pd.notna(row['입수']) and row['입수'] != 0 else 1
+
+        # 조건 1: '품목대분류'가 '조제'이고 '품목자산분류'가 '부자재'
+        if row['품목대분류'] == '조제' and row['품목자산분류'] == '부자재':
+            return row['환산비용'] / 입수
+
+        # 조건 2: '공정흐름차수명'이 '노무비' 또는 '제조경비'
+        if row['품목대분류'] == '조제' and row['공정흐름차수명'] in ['노무비', '제조경비'] and row['구분'] in ['미세']:
+            return row['단가']
+
+        # 조건 3: '공정'이 '스티커' 또는 '재활용분담금'
+        if row['품목대분류'] == '조제' and row['공정'] in ['스티커', '재활용분담금'] and row['구분'] in ['미세']:
+            return row['단가']
+
+        # 조건 4~8: '조달구분'이 '제작'인 경우 자재명과 세부 조건 처리
+        if row['품목대분류'] == '조제' and row['조달구분'] == '제작' and row['구분'] in ['미세']:
+            if '미세' in row['자재명'] and row['BOM환산수량'] != 0:
+                return row['단가_미세'] * row['BOM환산수량'] / 입수
+            elif '배전' in row['자재명'] and row['BOM환산수량'] != 0:
+                return row['단가_배전'] * row['BOM환산수량'] / 입수
+
+        # 조건 10: '구분' 값이 '미세'이 아닌 경우 및 '품목자산분류'가 '원자재'이고 '자재번호'가 특정 패턴
+        if (
+            row['품목대분류'] == '조제'
+            and row['구분'] not in ['미세']
+            and row['품목자산분류'] == '원자재'
+            and pd.notna(row['자재번호'])
+            and bool(re.match(r'5\d[A|B]\d{5}', str(row['자재번호'])))
+        ):
+            if row['수율']:
+                return row['환산비용'] / row['수율']
+
+        # 조건 11: '구분' 값이 '미세'이 아닌 경우 및 '품목자산분류'가 '원자재'이고 '자재번호'가 특정 패턴이 아닌 경우
+        if (
+            row['품목대분류'] == '조제'
+            and row['구분'] not in ['미세']
+            and row['품목자산분류'] == '원자재'
+            and not bool(re.match(r'5\d[A|B]\d{5}', str(row['자재번호'])))
+        ):
+            return row['환산비용'] / 입수
+
+        # 조건 12: '품목대분류'가 '조제'이고 '구분'값이 '미세'이며, '품목자산분류'가 '원자재' 이고, '자재번호'가 특정패턴이 아닌 경우
+        if (
+            row['품목대분류'] == '조제'
+            and row['구분'] in ['미세']
+            and row['품목자산분류'] == '원자재'
+            and not bool(re.match(r'5\d[A|B]\d{5}', str(row['자재번호'])))
+        ):
+            return row['환산비용'] / 입수
+
+        # 조건 13: '구분' 값이 '미세'이 아닌 경우 및 '품목자산분류'가 '부자재'
+        if row['품목대분류'] == '조제' and row['구분'] not in ['미세'] and row['품목자산분류'] == '부자재':
+            return row['환산비용']
+
+        # 조건 14: '구분' 값이 '미세'이 아닌 경우 및 '공정'이 특정 값
+        if row['품목대분류'] == '조제' and row['구분'] not in ['미세'] and row['공정'] in ['스티커', '재활용분담금']:
+            return row['단가']
+
+        # 조건 15: '품목대분류'가 '조제'인 경우
+        if row['품목대분류'] == '조제' and row['공정흐름차수명'] in ['노무비', '제조경비'] and row['구분'] not in ['미세']:
+            return row['단가']
+
+        # 조건 16: '구분' 값이 '선물세트'이고 '품목자산분류'가 '0'이며, '품목소분류'가 '아워티(조제_NB)'일 때 '단가_스틱' * '소요량분자' 값 추출
+        if (
+            row['구분'] in ['선물세트']
+        and str(row['품목자산분류']).strip() == '0'
+            and row['품목소분류'] == '아워티(조제_NB)'
+        ):
+            return row['단가_스틱'] * row['소요량분자']
+
+
+        return None
+    except KeyError as e:
+        logging.warning(f"필드 누락: {e}")
+        return None
+
+
+LEGACY = {
+    '원두': legacy_bean_cost,
+    '조제': legacy_blend_cost,
+}
+
+
+def legacy_costing(df, family):
+    """
+    기존 구현: 행 단위 원가 계산 후 loss / 사전원가도 행 단위 apply
+    """
+    df[family] = df.apply(LEGACY[family], axis=1)
+    df[f'{family}_loss'] = df.apply(lambda row: row[family] * row['loss율'] if row['품목대분류'] == family and row['구분'] else None, axis=1)
+    df[f'사전원가_{family}'] = df.apply(lambda row: row[family] + row[f'{family}_loss'] if row['품목대분류'] == family and row['구분'] else None, axis=1)
+    return df
+
+
+def vectorized_costing(df, family):
+    product_costing.add_family_cost(df, family)
+    return product_costing.add_family_totals(df, family)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="제품군 원가 계산 벤치마크")
+    parser.add_argument("--family", choices=sorted(product_costing.BRANCHES), default="원두")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="합성 데이터 대신 사용할 단계 입력 CSV (예: 38단계 실행 전 uploads/사전원가_원두.csv)")
+    parser.add_argument("--skip-legacy", action="store_true", help="기존 구현 측정 생략 (대용량 데이터용)")
+    args = parser.parse_args()
+
+    if args.csv:
+        df = pd.read_csv(args.csv, encoding='utf-8-sig', low_memory=False)
+    else:
+        df = make_data(args.family, args.rows, args.seed)
+    print(f"제품군: {args.family} / 행 수: {len(df):,}")
+
+    new_df, new_seconds = timed(vectorized_costing, df.copy(), args.family)
+    print(f"분기 조건 + np.select: {new_seconds:.3f}초")
+
+    if not args.skip_legacy:
+        old_df, old_seconds = timed(legacy_costing, df.copy(), args.family)
+        print(f"기존 구현: {old_seconds:.3f}초")
+        for column in [args.family, f'{args.family}_loss', f'사전원가_{args.family}']:
+            old, new = old_df[column].astype(float), new_df[column]
+            if not old.equals(new):
+                mismatched = int((~((old == new) | (old.isna() & new.isna()))).sum())
+                raise SystemExit(f"❌ 결과 불일치: '{column}' 값이 {mismatched:,}행 다릅니다.")
+        print(f"✅ 결과 일치, {speedup(old_seconds, new_seconds):,.0f}배 빠름")
+
+
+if __name__ == "__main__":
+    main()
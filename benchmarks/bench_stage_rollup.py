@@ -0,0 +1,125 @@
+"""
+공정 비용 롤업(stage_rollup.rollup) 벤치마크
+기존 단계의 copy + groupby + merge(_x/_y 접미사) 구현과 stage_rollup을 비교하고 결과가 같은지 확인
+- 배전 롤업 (8/24/45단계): 품번별 배전비용 합계 → 단가_배전
+- 하위 BOM 합계 (11/27/31/35/48/52단계): 기존 <열>_y는 <열>_합계, <열>_x는 원래 열 이름으로 바꿔 비교
+
+사용법: python benchmarks/bench_stage_rollup.py --rows 200000 --products 5000
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import assert_same, speedup, timed
+import stage_rollup
+
+# ✅ 하위 BOM 합계 단계별 (합산할 단가 열, 공정 비용 열, 기존 merge 접미사, 결과 단가 열)
+TOTAL_STEPS = {
+    '11/27단계': ('단가_배전', '분쇄비용', '_분쇄', '분쇄단가'),
+    '31단계': ('단가_분쇄', '분/착비용', '_분/착', '분/착단가'),
+    '35단계': ('단가_분/착', '스틱비용', '_스틱', '스틱단가'),
+    '48단계': ('단가_배전', '미세비용', '_미세', '미세단가'),
+    '52단계': ('단가_미세', '스틱비용', '_스틱', '스틱단가'),
+}
+
+
+def make_data(rows, products, seed):
+    """
+    합성 BOM (일부 자재번호는 다른 품번(반제품)과 같은 값, 비용 열에 0과 결측값 포함, 자재번호 일부 결측)
+    """
+    rng = np.random.default_rng(seed)
+    product_numbers = np.array([f"2{i:07d}" for i in range(products)], dtype=object)
+    materials = np.array([f"51A{i:05d}" for i in range(products)], dtype=object)
+    picked = rng.integers(0, products, rows)
+    material_numbers = np.where(rng.random(rows) < 0.3, product_numbers[rng.integers(0, products, rows)], materials[picked])
+    material_numbers[rng.random(rows) < 0.01] = np.nan
+    costs = lambda: np.where(rng.random(rows) < 0.2, 0.0, np.where(rng.random(rows) < 0.05, np.nan, rng.random(rows) * 1000))
+    df = pd.DataFrame({
+        '품번': product_numbers[rng.integers(0, products, rows)],
+        '공정': np.array(['배전', '분쇄', '추출', '스틱'], dtype=object)[rng.integers(0, 4, rows)],
+        '자재번호': material_numbers,
+        '배전비용': costs(),
+    })
+    for source, cost, _, _ in TOTAL_STEPS.values():
+        df[source] = costs()
+        df[cost] = costs()
+    return df
+
+
+# 기존 구현 (8/24/45단계, 11/27/31/35/48/52단계 롤업 부분 그대로) -----------------------------------------
+
+def legacy_roast(bom_df):
+    bom_df['자재번호'] = bom_df['자재번호'].astype(str)
+    items = bom_df.copy()
+    items['품번'] = items['품번'].astype(str)
+    cost_sum = items.groupby('품번')['배전비용'].sum().reset_index()
+    bom_df = bom_df.merge(cost_sum, left_on='자재번호', right_on='품번', how='left', suffixes=('_x', '_y'))
+    bom_df['단가_배전'] = bom_df['배전비용_y'].fillna(0)
+    bom_df.loc[(bom_df['단가_배전'] == 0) & (bom_df['배전비용_x'] != 0), '단가_배전'] = bom_df['배전비용_x']
+    bom_df = bom_df.rename(columns={'품번_x': '품번'})
+    return bom_df.drop(columns=['배전비용_y', '품번_y', '배전비용_x'], errors='ignore')
+
+
+def legacy_total(bom_df, source, cost, suffix, output):
+    bom_df['자재번호'] = bom_df['자재번호'].astype(str)
+    items = bom_df.copy()
+    items['품번'] = items['품번'].astype(str)
+    dan_ga_sum = items.groupby('품번')[source].sum().reset_index()
+    bun_sae_cost_sum = items.groupby('품번')[cost].sum().reset_index()
+    bom_df = bom_df.merge(dan_ga_sum, left_on='자재번호', right_on='품번', how='left', suffixes=('_x', '_y'))
+    bom_df = bom_df.merge(bun_sae_cost_sum, left_on='자재번호', right_on='품번', how='left', suffixes=('', suffix))
+    bom_df[output] = bom_df[f'{cost}{suffix}'].fillna(0)
+    bom_df = bom_df.drop(columns=[f'{cost}{suffix}', '품번_y', '품번'], errors='ignore')
+    bom_df = bom_df.rename(columns={'품번_x': '품번', f'{cost}_x': cost})
+    # 비교용: 기존 _x/_y 열을 현재 열 이름으로 변경
+    return bom_df.rename(columns={f'{source}_x': source, f'{source}_y': f'{source}_합계'})
+
+
+# 현재 구현 (단계 코드와 같은 호출) ------------------------------------------------------------------
+
+def current_roast(bom_df):
+    bom_df['자재번호'] = bom_df['자재번호'].astype(str)
+    stage_rollup.rollup(bom_df, {'배전비용': '단가_배전'})
+    bom_df['단가_배전'] = bom_df['단가_배전'].fillna(0)
+    bom_df.loc[(bom_df['단가_배전'] == 0) & (bom_df['배전비용'] != 0), '단가_배전'] = bom_df['배전비용']
+    return bom_df.drop(columns=['배전비용'])
+
+
+def current_total(bom_df, source, cost, suffix, output):
+    bom_df['자재번호'] = bom_df['자재번호'].astype(str)
+    stage_rollup.rollup(bom_df, {source: f'{source}_합계', cost: output})
+    bom_df[output] = bom_df[output].fillna(0)
+    return bom_df
+
+
+def compare(name, legacy, current, df, *args):
+    expected, legacy_seconds = timed(legacy, df.copy(), *args)
+    actual, current_seconds = timed(current, df.copy(), *args)
+    assert_same(name, expected, actual)
+    print(f"{name}: merge {legacy_seconds:.3f}초 / stage_rollup {current_seconds:.3f}초"
+          f" ({speedup(legacy_seconds, current_seconds):,.1f}배 빠름)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공정 비용 롤업 벤치마크")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = make_data(args.rows, args.products, args.seed)
+    print(f"행 수: {len(df):,} / 품번 수: {df['품번'].nunique():,}")
+
+    compare('배전 롤업 (8/24/45단계)', legacy_roast, current_roast, df)
+    for name, step in TOTAL_STEPS.items():
+        compare(f'하위 BOM 합계 ({name})', legacy_total, current_total, df, *step)
+    print("✅ 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+공정 수율/공정비용 계산(yield_stages) 벤치마크
+기존 단계 스크립트의 apply / np.where / .loc 조건1…조건N 구현과 yield_stages를 비교하고 결과가 같은지 확인
+- 수율_X / loss율_X: 4/21/42, 9/25, 29, 33/50, 46단계 (add_yield_columns)
+- X비용: 7/23/44, 10, 26, 30, 34, 47, 51단계 (add_stage_cost, 입력은 앞 단계 수율 계산 결과)
+
+사용법: python benchmarks/bench_yield_stages.py --rows 100000
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import assert_same, speedup, timed
+import material_class
+import yield_stages
+
+
+def make_data(rows, seed):
+    """
+    합성 BOM 데이터 (모든 규칙 조건이 나오도록 값을 섞음, 수율에 0과 결측값, loss율/단가에 결측값 포함)
+    텍스트 열(품명/자재명/자재번호)은 기존 구현이 결측값을 처리하지 못하므로 결측값 없이 생성
+    """
+    rng = np.random.default_rng(seed)
+    pick = lambda values: np.array(values, dtype=object)[rng.integers(0, len(values), rows)]
+    with_gaps = lambda values, zero=False: np.where(rng.random(rows) < 0.1, np.nan,
+                                                    np.where(zero & (rng.random(rows) < 0.1), 0, values))
+    df = pd.DataFrame({
+        '품번': pick([f"2{i:07d}" for i in range(200)]),
+        '품명': pick(['스틱-아메리카노', '분/착 헤이즐넛', '미세 블렌드', '원두 1kg', '스틱-라떼 미세']),
+        '공정흐름차수명': pick(['노무비', '제조경비', '재료비', '임가공비']),
+        '공정': pick(['배전', '분쇄', '해포', '포장', '분/착', '미세', '비닐', '박스(30kg)', '재활용분담금', '스티커', '추출']),
+        '자재번호': pick(['51A00001', '52B12345', '40101001', '0']),
+        '자재명': pick(['배전-A', '분/착-B', '스틱-C', '미세-D', '설탕', '분/착-배전']),
+        '품목자산분류': pick(['원자재', '부자재', '0', '반제품']),
+        '조달구분': pick(['구매', '제작', '부재료비']),
+        '환산비용': with_gaps(rng.random(rows) * 1000),
+        '수율': with_gaps(rng.random(rows), zero=True),
+        'loss율': with_gaps(rng.random(rows) * 0.1),
+        '단가': with_gaps(rng.random(rows) * 1000),
+        '소요량분자': rng.random(rows),
+        '단가_배전': with_gaps(rng.random(rows) * 100, zero=True),
+        '단가_분/착': with_gaps(rng.random(rows) * 100, zero=True),
+    })
+    # 3단계와 같이 자재구분/자재공정 분류 열 추가 (현재 구현은 이 열을 읽고, 기존 구현은 무시)
+    # 단계 사이 중간 파일(csv)을 다시 읽은 것과 같도록 Categorical 대신 문자열 열로 변환
+    df = material_class.add_material_classes(df)
+    df[material_class.COLUMNS] = df[material_class.COLUMNS].astype(object)
+    return df
+
+
+# 기존 구현 (단계 스크립트의 조건과 계산 순서 그대로, 반복되는 수율→loss율→비용 재계산만 legacy_recalculate로 묶음) ---------
+
+def legacy_roast_yield(bom_df):
+    """4/21/42단계: 행 단위 apply, 배전이 아니거나 수율이 없으면 결측값"""
+    bom_df['수율_배전'] = bom_df.apply(
+        lambda row: row['환산비용'] / row['수율'] if row['공정'] == '배전' and pd.notna(row['수율']) and row['수율'] != 0 else None,
+        axis=1
+    )
+    bom_df['loss율_배전'] = bom_df.apply(
+        lambda row: row['수율_배전'] * row['loss율'] if row['공정'] == '배전' and pd.notna(row['loss율']) else None,
+        axis=1
+    )
+    return bom_df
+
+
+def legacy_stage_yield(stage):
+    """9/25/29/46단계 ('공정' 조건), 33/50단계 ('품명'에 '스틱-' 조건): np.where 후 결측값 0"""
+    def run(bom_df):
+        rows = bom_df['품명'].str.contains('스틱-', na=False) if stage == '스틱' else bom_df['공정'] == stage
+        bom_df[f'수율_{stage}'] = np.where(rows, bom_df['환산비용'] / bom_df['수율'].replace(0, np.nan), 0)
+        bom_df[f'수율_{stage}'] = bom_df[f'수율_{stage}'].fillna(0).astype(float)
+        bom_df[f'loss율_{stage}'] = np.where(rows, bom_df[f'수율_{stage}'] * bom_df['loss율'], 0)
+        bom_df[f'loss율_{stage}'] = bom_df[f'loss율_{stage}'].fillna(0).astype(float)
+        return bom_df
+    return run
+
+
+def legacy_prepare(bom_df, stage):
+    bom_df.fillna(0, inplace=True)
+    bom_df['품번'] = bom_df['품번'].astype(str)
+    bom_df[f'수율_{stage}'] = bom_df[f'수율_{stage}'].astype(float)
+    bom_df[f'loss율_{stage}'] = bom_df[f'loss율_{stage}'].astype(float)
+    bom_df['단가'] = bom_df['단가'].astype(float)
+    bom_df[f'{stage}비용'] = 0.0
+    return bom_df
+
+
+def legacy_roast_cost(bom_df):
+    """7/23/44단계"""
+    legacy_prepare(bom_df, '배전')
+    bom_df.loc[bom_df['공정'] == '배전', '배전비용'] = bom_df['수율_배전'] + bom_df['loss율_배전']
+    bom_df.loc[bom_df['공정'].isin(['비닐', '박스(30kg)']), '배전비용'] = bom_df['단가'] + bom_df['loss율_배전']
+    bom_df.loc[(bom_df['공정'] == '배전') & (bom_df['공정흐름차수명'].isin(['노무비', '제조경비'])), '배전비용'] = bom_df['단가']
+    return bom_df
+
+
+def legacy_grind_cost(processes):
+    """10단계 (분쇄/해포), 26단계 (분쇄/해포/포장)"""
+    def run(bom_df):
+        legacy_prepare(bom_df, '분쇄')
+        bom_df.loc[bom_df['공정'] == '분쇄', '분쇄비용'] = bom_df['수율_분쇄'] + bom_df['loss율_분쇄']
+        bom_df.loc[
+            (bom_df['공정'].isin(processes)) & (bom_df['공정흐름차수명'].isin(['노무비', '제조경비'])),
+            '분쇄비용'
+        ] = bom_df['단가']
+        return bom_df
+    return run
+
+
+def legacy_flavor_cost(bom_df):
+    """30단계"""
+    legacy_prepare(bom_df, '분/착')
+    condition_1 = (
+        (bom_df['품명'].str.contains('분/착')) &
+        (bom_df['품목자산분류'] == '원자재') &
+        (~bom_df['자재번호'].str.match(r'5\d[A|B]\d{5}'))
+    )
+    bom_df.loc[condition_1, '수율_분/착'] = bom_df['환산비용']
+    bom_df.loc[condition_1, 'loss율_분/착'] = bom_df['환산비용'] * bom_df['loss율']
+    bom_df.loc[condition_1, '분/착비용'] = bom_df['수율_분/착'] + bom_df['loss율_분/착']
+    condition_2 = (
+        (bom_df['품명'].str.contains('분/착')) &
+        (bom_df['품목자산분류'] == '원자재') &
+        (bom_df['자재번호'].str.match(r'5\d[A|B]\d{5}'))
+    )
+    bom_df.loc[condition_2, '분/착비용'] = bom_df['수율_분/착'] + bom_df['loss율_분/착']
+    condition_2 = (
+        (bom_df['품명'].str.contains('분/착')) &
+        (bom_df['공정'].isin(['비닐', '박스(30kg)']))
+    )
+    bom_df.loc[condition_2, '분/착비용'] = bom_df['단가_배전']
+    bom_df.loc[
+        (bom_df['공정'].isin(['분/착'])) & (bom_df['공정흐름차수명'].isin(['노무비', '제조경비'])),
+        '분/착비용'
+    ] = bom_df['단가']
+    labor = (bom_df['품명'].str.contains('분/착', na=False)) & (bom_df['공정'].isin(['배전'])) & \
+            (bom_df['공정흐름차수명'].isin(['노무비', '제조경비']))
+    bom_df.loc[labor, '분/착비용'] = bom_df.loc[labor, '단가']
+    return bom_df
+
+
+def legacy_recalculate(bom_df, condition, stage, value):
+    bom_df.loc[condition, f'수율_{stage}'] = value
+    bom_df.loc[condition, f'loss율_{stage}'] = bom_df[f'수율_{stage}'] * bom_df['loss율']
+    bom_df.loc[condition, f'{stage}비용'] = bom_df[f'수율_{stage}'] + bom_df[f'loss율_{stage}']
+
+
+def legacy_bean_stick_cost(bom_df):
+    """34단계"""
+    legacy_prepare(bom_df, '스틱')
+    condition_1 = bom_df['품명'].str.contains('스틱-')
+    bom_df.loc[condition_1, '수율_스틱'] = np.where(
+        bom_df.loc[condition_1, '자재명'].str.contains('분/착') & (bom_df.loc[condition_1, '단가_분/착'] != 0),
+        bom_df.loc[condition_1, '단가_분/착'] * bom_df.loc[condition_1, '소요량분자'],
+        np.where(
+            bom_df.loc[condition_1, '자재명'].str.contains('배전') & (bom_df.loc[condition_1, '단가_분/착'] == 0),
+            bom_df.loc[condition_1, '단가_배전'] * bom_df.loc[condition_1, '소요량분자'],
+            0
+        )
+    )
+    bom_df.loc[condition_1, 'loss율_스틱'] = bom_df['수율_스틱'] * bom_df['loss율']
+    bom_df.loc[condition_1, '스틱비용'] = bom_df['수율_스틱'] + bom_df['loss율_스틱']
+    legacy_recalculate(bom_df, (bom_df['품명'].str.contains('스틱-')) & (bom_df['품목자산분류'] == '원자재'), '스틱', 0)
+    legacy_recalculate(bom_df, (bom_df['품명'].str.contains('스틱-')) & ~(bom_df['품목자산분류'].isin(['원자재', '0'])),
+                       '스틱', bom_df['환산비용'])
+    legacy_recalculate(bom_df, (bom_df['품명'].str.contains('스틱-')) & (bom_df['조달구분'] == '부재료비'), '스틱', bom_df['단가'])
+    bom_df.loc[
+        (bom_df['품명'].str.contains('스틱-')) & (bom_df['공정흐름차수명'].isin(['노무비', '제조경비'])),
+        '스틱비용'
+    ] = bom_df['단가']
+    return bom_df
+
+
+def legacy_fine_cost(bom_df):
+    """47단계"""
+    legacy_prepare(bom_df, '미세')
+    condition_1 = (
+        (bom_df['품명'].str.contains('미세')) &
+        (bom_df['품목자산분류'] == '원자재') &
+        (~bom_df['자재번호'].str.match(r'5\d[A|B]\d{5}'))
+    )
+    bom_df.loc[condition_1, '수율_미세'] = bom_df['환산비용']
+    bom_df.loc[condition_1, 'loss율_미세'] = bom_df['환산비용'] * bom_df['loss율']
+    bom_df.loc[condition_1, '미세비용'] = bom_df['수율_미세'] + bom_df['loss율_미세']
+    condition_2 = (
+        (bom_df['품명'].str.contains('미세')) &
+        (bom_df['품목자산분류'] == '원자재') &
+        (bom_df['자재번호'].str.match(r'5\d[A|B]\d{5}'))
+    )
+    bom_df.loc[condition_2, '미세비용'] = bom_df['수율_미세'] + bom_df['loss율_미세']
+    condition_2 = (
+        (bom_df['품명'].str.contains('미세')) &
+        (bom_df['공정'].isin(['비닐', '박스(30kg)']))
+    )
+    bom_df.loc[condition_2, '미세비용'] = bom_df['단가_배전']
+    condition_3 = (
+        (bom_df['품명'].str.contains('미세')) &
+        (bom_df['품목자산분류'].isin(['부자재']))
+    )
+    bom_df.loc[condition_3, '미세비용'] = bom_df['수율_미세'] + bom_df['loss율_미세']
+    legacy_recalculate(bom_df, bom_df['공정'].isin(['재활용분담금', '스티커']), '미세', bom_df['단가'])
+    bom_df.loc[
+        (bom_df['공정'].isin(['미세'])) & (bom_df['공정흐름차수명'].isin(['노무비', '제조경비'])),
+        '미세비용'
+    ] = bom_df['단가']
+    return bom_df
+
+
+def legacy_blend_stick_cost(bom_df):
+    """51단계"""
+    legacy_prepare(bom_df, '스틱')
+    bom_df['스틱비용'] = bom_df['수율_스틱'] + bom_df['loss율_스틱']
+    legacy_recalculate(bom_df, (bom_df['품명'].str.contains('스틱-')) & (bom_df['조달구분'] == '부재료비'), '스틱', bom_df['단가'])
+    bom_df.loc[
+        (bom_df['품명'].str.contains('스틱-')) & (bom_df['공정흐름차수명'].isin(['노무비', '제조경비'])),
+        '스틱비용'
+    ] = bom_df['단가']
+    return bom_df
+
+
+# ✅ 수율 계산 단계: 이름 → (공정 단계, fill_value, 기존 구현)
+YIELD_STEPS = {
+    '4/21/42단계 배전': ('배전', None, legacy_roast_yield),
+    '9/25단계 분쇄': ('분쇄', 0, legacy_stage_yield('분쇄')),
+    '29단계 분/착': ('분/착', 0, legacy_stage_yield('분/착')),
+    '33/50단계 스틱': ('스틱', 0, legacy_stage_yield('스틱')),
+    '46단계 미세': ('미세', 0, legacy_stage_yield('미세')),
+}
+
+# ✅ 공정비용 계산 단계: 이름 → (브랜치, 공정 단계, 기존 구현)
+COST_STEPS = {
+    '7단계 배전': ('액상,추출액', '배전', legacy_roast_cost),
+    '23단계 배전': ('원두', '배전', legacy_roast_cost),
+    '44단계 배전': ('조제', '배전', legacy_roast_cost),
+    '10단계 분쇄': ('액상,추출액', '분쇄', legacy_grind_cost(['분쇄', '해포'])),
+    '26단계 분쇄': ('원두', '분쇄', legacy_grind_cost(['분쇄', '해포', '포장'])),
+    '30단계 분/착': ('원두', '분/착', legacy_flavor_cost),
+    '34단계 스틱': ('원두', '스틱', legacy_bean_stick_cost),
+    '47단계 미세': ('조제', '미세', legacy_fine_cost),
+    '51단계 스틱': ('조제', '스틱', legacy_blend_stick_cost),
+}
+
+
+def check(name, expected, actual, legacy_seconds, current_seconds):
+    assert_same(name, expected, actual)
+    print(f"  {name}: 기존 {legacy_seconds:.3f}초 / yield_stages {current_seconds:.3f}초"
+          f" ({speedup(legacy_seconds, current_seconds):,.1f}배 빠름)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공정 수율/공정비용 계산 벤치마크")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = make_data(args.rows, args.seed)
+    print(f"행 수: {len(df):,}")
+
+    print("수율_X / loss율_X")
+    for name, (stage, fill_value, legacy) in YIELD_STEPS.items():
+        expected, legacy_seconds = timed(legacy, df.copy())
+        actual, current_seconds = timed(yield_stages.add_yield_columns, df.copy(), stage, fill_value)
+        check(name, expected, actual, legacy_seconds, current_seconds)
+
+    print("X비용 (입력: 같은 공정 단계의 수율 계산 결과)")
+    for name, (branch, stage, legacy) in COST_STEPS.items():
+        fill_value = None if stage == '배전' else 0
+        source = yield_stages.add_yield_columns(df.copy(), stage, fill_value)
+        expected, legacy_seconds = timed(legacy, source.copy())
+        actual, current_seconds = timed(yield_stages.add_stage_cost, source.copy(), branch, stage)
+        check(name, expected, actual, legacy_seconds, current_seconds)
+    print("✅ 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+수율 조회 벤치마크
+- 기존 방식: 4/5/21/22/42/43단계가 각각 수율.csv를 읽고 조회마다 필터 + drop_duplicates + set_index(...).to_dict() 후 Series.map
+  (4/21/42단계는 필터 후 pd.merge)
+- yield_table: 프로세스 안에서 수율.csv를 한 번만 읽고 (yield_table.load 캐시) 조건별 품번 인덱스를 재사용
+  (pipeline_runner처럼 여러 단계를 한 프로세스에서 실행할 때의 비용, 단계마다 새 프로세스로 실행하면 파일 읽기는 줄지 않음)
+
+사용법: python benchmarks/bench_yield_table.py --rows 500000 --yield-rows 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import speedup, timed
+import frame_store
+import yield_table
+
+# ✅ 단계별 수율 조회: ('join', 조건, None) 또는 ('lookup', 조건, 중복 처리)
+STEP_QUERIES = {
+    '4단계': [('join', {'구분': '원자재'}, None)],
+    '5단계': [
+        ('lookup', {'구분': '부자재'}, 'first'),
+        ('lookup', {'비고': '재활용분담금'}, 'first'),
+        ('lookup', {'구분': '원자재'}, 'first'),
+        ('lookup', {'대분류': ['액상', '추출액'], '구분': '부자재'}, 'last'),
+    ],
+    '21단계': [('join', {'구분': '원자재'}, None)],
+    '22단계': [
+        ('lookup', {'비고': '재활용분담금'}, 'first'),
+        ('lookup', {'비고': ['재활용분담금', '스티커', '트레이더스']}, 'first'),
+        ('lookup', {'대분류': '원두', '구분': '부자재'}, 'first'),
+        ('lookup', {'비고': '이산화탄소'}, 'first'),
+        ('lookup', {}, 'last'),
+    ],
+    '42단계': [('join', {'구분': '원자재'}, None)],
+    '43단계': [('lookup', {'대분류': '조제', '구분': '부자재'}, 'first')],
+}
+
+
+def make_data(upload_dir, rows, yield_rows, seed):
+    """
+    합성 수율.csv 저장 후 BOM (품번 열) 반환 (같은 품번이 여러 구분/비고로 나오는 수율 행 포함)
+    """
+    rng = np.random.default_rng(seed)
+    parts = np.array([f"2{i:07d}" for i in range(yield_rows // 2)], dtype=object)
+    pick = lambda values, size: np.asarray(values, dtype=object)[rng.integers(0, len(values), size)]
+    yield_df = pd.DataFrame({
+        '품번': parts[rng.integers(0, len(parts), yield_rows)],
+        '품명': pick(['원두 블렌드', '스틱 커피', '콜드브루 원액'], yield_rows),
+        '대분류': pick(['원두', '조제', '액상', '추출액'], yield_rows),
+        '구분': pick(['원자재', '부자재'], yield_rows),
+        '비고': pick(['재활용분담금', '스티커', '트레이더스', '이산화탄소', '건조과일', np.nan], yield_rows),
+        '수율': rng.random(yield_rows),
+        'loss율': rng.random(yield_rows) / 10,
+    })
+    yield_df.to_csv(os.path.join(upload_dir, yield_table.YIELD_FILE), index=False, encoding='utf-8-sig')
+    return pd.DataFrame({'품번': parts[rng.integers(0, len(parts), rows)], '소요량분자': rng.random(rows)})
+
+
+# 기존 구현 (단계마다 수율.csv 읽기 + 조회마다 필터) ----------------------------------------------------
+
+def legacy_filter(yield_df, conditions):
+    mask = np.ones(len(yield_df), dtype=bool)
+    for column, value in conditions.items():
+        mask &= yield_df[column].isin(value if isinstance(value, list) else [value]).to_numpy()
+    return yield_df[mask]
+
+
+def legacy_read(upload_dir):
+    return frame_store.read_csv(os.path.join(upload_dir, yield_table.YIELD_FILE), encoding='utf-8-sig', low_memory=False)
+
+
+def legacy_queries(yield_df, bom_df, queries):
+    results = []
+    for kind, conditions, duplicates in queries:
+        filtered = legacy_filter(yield_df, conditions)
+        if kind == 'join':
+            results.append(pd.merge(bom_df, filtered[['품번', '수율', 'loss율']], on='품번', how='left'))
+            continue
+        filtered = filtered[['품번', 'loss율']]
+        if duplicates == 'first':
+            filtered = filtered.drop_duplicates(subset='품번', keep='first')
+        results.append(bom_df['품번'].map(filtered.set_index('품번')['loss율'].to_dict()))
+    return results
+
+
+def current_queries(yields, bom_df, queries):
+    results = []
+    for kind, conditions, duplicates in queries:
+        if kind == 'join':
+            results.append(yields.join(bom_df, ['수율', 'loss율'], **conditions))
+        else:
+            results.append(yields.lookup(bom_df['품번'], 'loss율', duplicates, **conditions))
+    return results
+
+
+def same(expected, actual):
+    if isinstance(expected, pd.DataFrame):
+        try:
+            pd.testing.assert_frame_equal(expected, actual, check_exact=True)
+        except AssertionError:
+            return False
+        return True
+    return np.array_equal(expected.to_numpy(dtype=float), actual.to_numpy(dtype=float), equal_nan=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수율 조회 벤치마크")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--yield-rows", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as upload_dir:
+        bom_df = make_data(upload_dir, args.rows, args.yield_rows, args.seed)
+        print(f"BOM 품번: {len(bom_df):,}행 / 수율: {args.yield_rows:,}행")
+
+        totals = np.zeros(4)   # 기존 읽기, 기존 조회, yield_table 읽기, yield_table 조회
+        for step, queries in STEP_QUERIES.items():
+            yield_df, legacy_read_seconds = timed(legacy_read, upload_dir)
+            expected, legacy_query_seconds = timed(legacy_queries, yield_df, bom_df, queries)
+            yields, load_seconds = timed(yield_table.load, upload_dir)
+            actual, query_seconds = timed(current_queries, yields, bom_df, queries)
+            for (_, conditions, _), want, got in zip(queries, expected, actual):
+                if not same(want, got):
+                    raise SystemExit(f"❌ {step} 조회 결과 불일치: {conditions}")
+            seconds = np.array([legacy_read_seconds, legacy_query_seconds, load_seconds, query_seconds])
+            totals += seconds
+            print(f"  {step} (조회 {len(queries)}회): 기존 읽기 {seconds[0]:.3f}초 + 조회 {seconds[1]:.3f}초"
+                  f" / yield_table 읽기 {seconds[2]:.3f}초 + 조회 {seconds[3]:.3f}초")
+
+    print(f"수율.csv 읽기 ({len(STEP_QUERIES)}개 단계): 기존 {totals[0]:.3f}초 / yield_table {totals[2]:.3f}초"
+          f" ({speedup(totals[0], totals[2]):,.1f}배 빠름)")
+    print(f"조회: 기존 {totals[1]:.3f}초 / yield_table {totals[3]:.3f}초"
+          f" ({speedup(totals[1], totals[3]):,.1f}배 빠름)")
+    print(f"합계: 기존 {totals[:2].sum():.3f}초 / yield_table {totals[2:].sum():.3f}초"
+          f" ({speedup(totals[:2].sum(), totals[2:].sum()):,.1f}배 빠름)")
+    print("✅ 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
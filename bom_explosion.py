@@ -0,0 +1,122 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+import bom_schema
+import frame_store
+
+# ✅ 차수별 제작 BOM 파일 이름 (001 = 최상위 제작 자재, 002 이후 = 전개 결과)
+LEVEL_FILE_NAME = "최종차수_제작_BOM_{:03d}.csv"
+
+# ✅ 전개 차수 상한 (순환 BOM 등으로 '제작' 행이 끝나지 않는 경우 방지)
+MAX_LEVELS = 50
+
+# ✅ 전개 시 상위 행에서 유지하는 정보 헤더
+RETAIN_HEADERS = ['품목자산분류', '품명', '품번', '규격', '단위', 'BOM차수', 'BOM차수명', '공정흐름차수', '공정흐름차수명', '공정', '공정품명', '공정품번', '공정품규격', '단위.1', '공정품소요량']
+
+# ✅ 전개 시 하위 자재에서 가져오는 정보 헤더
+COMPONENT_HEADERS = ['자재명', '자재번호', '자재규격', '단위.2', '소요량분자', '소요량분모', '소요량', '내부Loss율', '내부Loss율반영 소요량', '외부Loss율', '외부Loss율반영 소요량', '구매단가', '구매금액', '현재고', '대표거래처', '비고', '조달구분', '품목소분류']
+
+
+def level_file_path(upload_dir, level):
+    """
+    차수에 해당하는 제작 BOM 파일 경로 반환
+    """
+    return os.path.join(upload_dir, LEVEL_FILE_NAME.format(level))
+
+
+def existing_level_files(upload_dir):
+    """
+    001부터 연속으로 존재하는 제작 BOM 파일 경로 목록 반환
+    """
+    paths = []
+    level = 1
+    while frame_store.exists(level_file_path(upload_dir, level)):
+        paths.append(level_file_path(upload_dir, level))
+        level += 1
+    return paths
+
+
+def normalize_key(series):
+    """
+    자재번호/품번 형식 표준화 (bom_schema.normalize_key: 문자열 변환, 공백 제거, 대문자)
+    """
+    return bom_schema.normalize_key(series)
+
+
+def _component_index(materials_df, normalize):
+    """
+    품번 → 하위 자재 행 위치 인덱스 (전개할 때마다 전체 자재를 검색하지 않도록 한 번만 구축)
+    """
+    keys = normalize_key(materials_df['품번']) if normalize else materials_df['품번']
+    index = pd.DataFrame({'_key': keys.astype(object).to_numpy(), '_mat': np.arange(len(materials_df))})
+    return index[index['_key'].notna()]
+
+
+def expand_level(bom_df, materials_df, component_index, first_level=False):
+    """
+    한 차수 전개: '제작' 행을 하위 자재 행들로 바꾸고 BOM환산수량을 곱해 나감
+    - 하위 자재가 없는 '제작' 행은 제외
+    - '구매' 등 나머지 행은 그대로 유지 (첫 전개(001 → 002)에서는 제외)
+    - 첫 전개는 자재번호를 그대로 비교하고, 이후 전개는 표준화한 자재번호로 비교
+    """
+    bom_df = bom_df.reset_index(drop=True)
+    if not first_level:
+        bom_df['자재번호'] = normalize_key(bom_df['자재번호'])
+
+    is_make = (bom_df['조달구분'] == '제작').to_numpy()
+    parents = pd.DataFrame({'_key': bom_df['자재번호'].astype(object).to_numpy()[is_make], '_row': np.flatnonzero(is_make)})
+    parents = parents[parents['_key'].notna()]
+
+    # 상위 행 × 하위 자재 조인 (상위 행 순서 → 자재 순서 유지)
+    pairs = parents.merge(component_index, on='_key', how='inner').sort_values(['_row', '_mat'], kind='stable')
+    rows = pairs['_row'].to_numpy()
+    mats = pairs['_mat'].to_numpy()
+
+    made = bom_df[RETAIN_HEADERS].iloc[rows].reset_index(drop=True)
+    for header in COMPONENT_HEADERS:
+        if header in materials_df.columns:
+            made[header] = materials_df[header].to_numpy()[mats]
+        elif first_level:
+            made[header] = None
+
+    parent_qty = bom_df['소요량분자'] if first_level else bom_df['BOM환산수량']
+    child_qty = materials_df['소요량분자'].to_numpy()[mats] if '소요량분자' in materials_df.columns else 1
+    made['BOM환산수량'] = parent_qty.to_numpy()[rows] * child_qty
+    made['_row'] = rows
+
+    if first_level:
+        return made.drop(columns='_row')
+
+    passed = bom_df[~is_make].copy()
+    passed['_row'] = np.flatnonzero(~is_make)
+
+    expanded = pd.concat([made, passed], ignore_index=True).sort_values('_row', kind='stable')
+
+    # 열 순서: 첫 행의 출처(전개 행 / 유지 행)의 열 순서를 따름
+    if len(passed) and (len(made) == 0 or passed['_row'].iloc[0] < made['_row'].iloc[0]):
+        columns = list(bom_df.columns) + [c for c in made.columns if c not in bom_df.columns and c != '_row']
+    else:
+        columns = [c for c in made.columns if c != '_row'] + [c for c in bom_df.columns if c not in made.columns]
+    return expanded[columns].reset_index(drop=True)
+
+
+def explode_bom(bom_001_df, materials_df, max_levels=MAX_LEVELS):
+    """
+    001 제작 BOM을 '제작' 행이 남지 않을 때까지 다단계 전개
+    반환값: [002 차수, 003 차수, ...] DataFrame 목록 (마지막 항목이 최종 전개 결과)
+    """
+    raw_index = _component_index(materials_df, normalize=False)
+    normalized_index = _component_index(materials_df, normalize=True)
+
+    levels = [expand_level(bom_001_df, materials_df, raw_index, first_level=True)]
+    # 최소 한 번은 표준화된 자재번호로 전개 (003 차수)
+    while len(levels) < 2 or (levels[-1]['조달구분'] == '제작').any():
+        if len(levels) + 1 >= max_levels:
+            remaining = levels[-1].loc[levels[-1]['조달구분'] == '제작', '자재번호'].unique()
+            logging.warning(f"BOM 전개가 {max_levels:03d} 차수에서 중단되었습니다 (순환 BOM 확인 필요): {list(remaining)[:10]}")
+            break
+        levels.append(expand_level(levels[-1], materials_df, normalized_index))
+    return levels
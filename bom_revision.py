@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+
+def final_revision_mask(df_process, df_final_bom):
+    """
+    '제품별공정별소요자재조회' 행 중 (품번, BOM차수)가 최종차수 목록에 있는 행 여부 (bool 배열)
+    최종차수 키를 해시 집합으로 만들어 행마다 한 번만 조회
+    (결측값이 포함된 키는 어떤 행과도 같지 않으므로 제외)
+    """
+    keys = df_final_bom[['품번', 'BOM차수']].dropna()
+    final_keys = set(zip(keys['품번'], keys['BOM차수']))
+    return np.fromiter(
+        (key in final_keys for key in zip(df_process['품번'], df_process['BOM차수'])),
+        dtype=bool,
+        count=len(df_process),
+    )
+
+
+# ✅ 생산종료일 중 그대로 Timestamp로 처리하는 예외 날짜
+SPECIAL_END_DATES = ['9999-12-31', '2999-12-31', '2122-01-01']
+
+# ✅ 최종수정일 형식: 'YYYY-MM-DD 오전/오후 H:MM:SS' (공백 기준 앞의 세 부분만 사용, 시각은 정수 세 개)
+KOREAN_DATETIME_PATTERN = r'^([^ ]*) ([^ ]*) ([+-]?[0-9]+):([+-]?[0-9]+):([+-]?[0-9]+)(?: |$)'
+
+
+def parse_end_date(date_str):
+    """
+    '생산종료일' 값 하나를 날짜로 변환 (예외적인 날짜도 처리)
+    """
+    if date_str in SPECIAL_END_DATES:
+        return pd.Timestamp(date_str)
+    try:
+        return pd.to_datetime(date_str, errors='coerce')
+    except ValueError:
+        return pd.NaT
+
+
+def parse_end_dates(series):
+    """
+    '생산종료일' 열 변환: 고유값마다 한 번씩만 변환한 뒤 행에 다시 매핑
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    parsed = pd.Series(uniques, dtype=object).apply(parse_end_date)
+    return pd.Series(parsed.take(codes).to_numpy(), index=series.index, dtype=parsed.dtype)
+
+
+def parse_korean_datetimes(series):
+    """
+    '최종수정일' 열 변환 ('2024-01-11 오후 1:01:11' → 2024-01-11 13:01:11)
+    오후는 12시를 제외하고 12시간을 더하고, 오전 12시는 0시로 처리
+    형식이 맞지 않거나 날짜가 잘못된 값은 NaT
+    """
+    text = series.where(series.map(type) == str).astype(object)
+    parts = text.str.extract(KOREAN_DATETIME_PATTERN).dropna()
+
+    date_part, am_pm = parts[0], parts[1]
+    hour, minute, second = (parts[column].astype('int64') for column in (2, 3, 4))
+    hour = hour.mask((am_pm == '오후') & (hour != 12), hour + 12)
+    hour = hour.mask((am_pm == '오전') & (hour == 12), 0)
+
+    normalized = (
+        date_part + ' '
+        + hour.astype(str).str.zfill(2) + ':'
+        + minute.astype(str).str.zfill(2) + ':'
+        + second.astype(str).str.zfill(2)
+    )
+    parsed = pd.to_datetime(normalized, format='%Y-%m-%d %H:%M:%S', errors='coerce')
+    return parsed.reindex(series.index)
+
+
+def latest_end_date_labels(df):
+    """
+    품번별 '생산종료일_parsed' 최대값과 같은 행은 '최종차수', 나머지는 '이전차수'
+    예외 날짜가 섞이면 열이 object 타입이 되므로, 고유 날짜의 순위(정수)로 최대값을 계산
+    (NaT는 최대값 계산에서 제외)
+    """
+    parsed = df['생산종료일_parsed']
+    has_date = parsed.notna().to_numpy()
+    codes, uniques = pd.factorize(parsed[has_date])
+    rank_of = {value: rank for rank, value in enumerate(sorted(uniques))}
+
+    ranks = pd.Series(np.nan, index=df.index)
+    ranks[has_date] = np.array([rank_of[value] for value in uniques], dtype=float)[codes]
+    latest = ranks.groupby(df['품번']).transform('max')
+    return pd.Series(np.where(ranks == latest, "최종차수", "이전차수"), index=df.index)
+
+
+def final_status_labels(df):
+    """
+    '최종차수' 행 중 품번별 '최종수정일_parsed' 최대값과 같은 행은 '최종차수', 나머지는 '이전차수'
+    """
+    is_final = df['최종차수'] == "최종차수"
+    latest = df['최종수정일_parsed'].where(is_final).groupby(df['품번']).transform('max')
+    matched = (df['최종수정일_parsed'] == latest) & is_final
+    return pd.Series(np.where(matched, "최종차수", "이전차수"), index=df.index)
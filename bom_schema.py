@@ -0,0 +1,173 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# ✅ 항상 문자열로 유지하는 코드 열 (숫자로 추론되면 '21213226.0'처럼 바뀌는 문제 방지)
+KEY_COLUMNS = ['품번', '자재번호', '공정품번']
+
+# ✅ 메모리에 보관할 때 category로 압축하는 반복 문자열 열 (값 종류가 적은 분류/단위/공정 열, 품명·코드 열)
+CATEGORY_COLUMNS = [
+    '품목대분류', '품목중분류', '품목소분류', '품목자산분류', '구분', '항목',
+    'BOM차수명', '공정흐름차수명', '공정', '조달구분', '비고', '단위', '단위.1', '단위.2', '자재단위',
+    '규격', '공정품규격', '품명', '공정품명', '자재명', '자재구분', '자재공정',
+    *KEY_COLUMNS,
+]
+
+# ✅ 지원하는 컬럼형 저장 형식 → 파일 확장자
+COLUMNAR_EXTENSIONS = {"parquet": ".parquet", "feather": ".feather"}
+
+
+def key_dtypes():
+    """
+    CSV를 읽을 때 코드 열을 문자열로 읽기 위한 dtype 인자
+    """
+    return {column: str for column in KEY_COLUMNS}
+
+
+def to_key_strings(series):
+    """
+    코드 열을 문자열로 변환 (정수로 표현 가능한 실수는 소수점 없이, 결측값은 그대로)
+    """
+    def format_key(value):
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (float, np.floating)) and float(value).is_integer():
+            return str(int(value))
+        return str(value)
+
+    return series.map(format_key, na_action='ignore').astype(object)
+
+
+def _canonical_keys(keys):
+    keys = to_key_strings(pd.Series(keys, dtype=object))
+    return keys.str.strip().str.replace(r'^(\d+)\.0+$', r'\1', regex=True).str.upper()
+
+
+def normalize_key(series):
+    """
+    코드 열 표준 형식 (모든 단계가 같은 키 값을 보도록 읽을 때 한 번 적용)
+    - 문자열 (정수로 표현 가능한 실수와 '21213226.0' 같은 문자열은 소수점 없이)
+    - 앞뒤 공백 제거, 대문자
+    - 결측값은 그대로
+    고유값마다 한 번씩만 변환
+    """
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return pd.Series(np.nan, index=series.index, dtype=object, name=series.name)
+    labels = np.append(_canonical_keys(uniques).to_numpy(dtype=object), np.nan)
+    return pd.Series(labels[codes], index=series.index, dtype=object, name=series.name)
+
+
+def normalize_keys(df):
+    """
+    df의 코드 열(KEY_COLUMNS)을 표준 형식으로 변환 (df를 직접 수정 후 반환)
+    """
+    for column in KEY_COLUMNS:
+        if column in df.columns:
+            df[column] = normalize_key(df[column])
+    return df
+
+
+def apply_schema(df):
+    """
+    컬럼형 저장용 고정 스키마 적용
+    - 열 이름은 문자열
+    - 코드 열(KEY_COLUMNS)은 표준 형식 문자열
+    """
+    df = df.copy()
+    df.columns = [str(column) for column in df.columns]
+    return normalize_keys(df)
+
+
+def _is_text(series):
+    return series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty")
+
+
+def _downcast(series):
+    """
+    값이 바뀌지 않는 경우에만 숫자 열을 더 작은 타입으로 변환 (정수: 최소 정수 타입, 실수: float32로 정확히 표현되는 경우)
+    """
+    if series.dtype.kind in "iu":
+        return pd.to_numeric(series, downcast="integer")
+    if series.dtype == np.float64:
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True) and np.array_equal(np.signbit(narrowed), np.signbit(values)):
+            return pd.Series(narrowed, index=series.index, name=series.name)
+    return series
+
+
+def compact(df):
+    """
+    메모리 보관용 압축 스키마 적용 (CATEGORY_COLUMNS의 문자열 열은 category, 숫자 열은 값 손실 없이 downcast)
+    반환: (압축된 DataFrame, 바뀐 열 → 원래 dtype) / expand로 원래 열 타입과 값을 그대로 복원
+    """
+    columns = {}
+    restore = {}
+    for position, column in enumerate(df.columns):
+        series = df.iloc[:, position]
+        if column in CATEGORY_COLUMNS and _is_text(series):
+            narrowed = series.astype("category")
+        elif series.dtype.kind in "iuf":
+            narrowed = _downcast(series)
+        else:
+            narrowed = series
+        if narrowed.dtype != series.dtype:
+            restore[position] = series.dtype
+        columns[position] = narrowed
+
+    if not restore:
+        return df, restore
+    result = pd.concat(columns, axis=1)
+    result.columns = df.columns
+    return result, restore
+
+
+def expand(df, restore):
+    """
+    compact로 압축한 DataFrame을 원래 열 타입으로 복원 (category → object, downcast 숫자 → 원래 타입)
+    """
+    if not restore:
+        return df.copy()
+    columns = {}
+    for position in range(len(df.columns)):
+        series = df.iloc[:, position]
+        columns[position] = series.astype(restore[position]) if position in restore else series.copy()
+    result = pd.concat(columns, axis=1)
+    result.columns = df.columns
+    return result
+
+
+def memory_bytes(df):
+    """
+    문자열 값까지 포함한 DataFrame 메모리 사용량 (bytes)
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def columnar_path(path, file_format):
+    """
+    CSV 경로에 대응하는 컬럼형 파일 경로 (예: uploads/BOM.csv → uploads/BOM.parquet)
+    """
+    return f"{os.path.splitext(path)[0]}{COLUMNAR_EXTENSIONS[file_format]}"
+
+
+def write_columnar(df, path, file_format):
+    """
+    DataFrame을 Parquet/Feather 파일로 저장 (pyarrow 사용)
+    """
+    df = df.reset_index(drop=True)
+    if file_format == "parquet":
+        df.to_parquet(path, index=False, engine="pyarrow")
+    else:
+        df.to_feather(path)
+
+
+def read_columnar(path, file_format):
+    """
+    Parquet/Feather 파일 읽기 (pyarrow 사용)
+    """
+    if file_format == "parquet":
+        return pd.read_parquet(path, engine="pyarrow")
+    return pd.read_feather(path)
@@ -0,0 +1,178 @@
+import numpy as np
+
+import material_class
+
+# ✅ 공정흐름차수명 중 배합원가에 단가를 그대로 쓰는 흐름 / loss율_포장을 계산하지 않는 흐름
+DIRECT_FLOWS = ['노무비', '제조경비', '임가공비', '재료비']
+NO_LOSS_FLOWS = ['노무비', '제조경비', '임가공비']
+
+
+# ✅ 공통 행 조건 (이름 → 행 조건): 규칙 적용 중 한 번만 계산해 bool 배열로 재사용
+# 규칙이 값을 바꾸는 열(배합원가, loss율_포장, 사전원가)은 읽지 않아야 함
+PREDICATES = {
+    '구매': lambda df: df['조달구분'] == '구매',
+    '제작': lambda df: df['조달구분'] == '제작',
+    '스트로우': lambda df: df['조달구분'] == '스트로우',
+    '동판': lambda df: df['조달구분'] == '동판',
+    '원재료 자재번호': material_class.is_semi_finished,
+    '자재번호 없음': lambda df: df['자재번호'] == '0',
+    '추출 자재': lambda df: material_class.has_tag(df, '추출'),
+    '분쇄 자재': lambda df: material_class.has_tag(df, '분쇄'),
+    '천안 추출단가': lambda df: df['단가_추출_천안'] != 0,
+    '재활용분담금 공정': lambda df: df['공정'] == '재활용분담금',
+    '재활용분담금/동판 공정': lambda df: df['공정'].isin(['재활용분담금', '동판']),
+    '포장 공정': lambda df: df['공정'] == '포장',
+    '비닐 공정': lambda df: df['공정'] == '비닐',
+    '단가 적용 흐름': lambda df: df['공정흐름차수명'].isin(DIRECT_FLOWS),
+    '노무비/제조경비/임가공비': lambda df: df['공정흐름차수명'].isin(NO_LOSS_FLOWS),
+    '재료비': lambda df: df['공정흐름차수명'] == '재료비',
+    '삼양/동원시스템즈': lambda df: df['비고'].isin(['삼양', '동원시스템즈']),
+    '추출액': lambda df: df['품목대분류'] == '추출액',
+    '원두': lambda df: df['품목대분류'] == '원두',
+    '조제': lambda df: df['품목대분류'] == '조제',
+    '품번 21213226': lambda df: df['품번'] == '21213226',
+}
+
+
+# 값 계산식 -----------------------------------------------------------------------------------------
+
+def column(name):
+    return lambda df: df[name]
+
+
+def constant(value):
+    return lambda df: value
+
+
+def times(left, right):
+    return lambda df: df[left] * df[right]
+
+
+def plus(left, right):
+    return lambda df: df[left] + df[right]
+
+
+def converted(unit_price):
+    """
+    단가 × BOM환산수량 (BOM환산수량이 0이면 단가 × 소요량분자)
+    """
+    return lambda df: np.where(df['BOM환산수량'] != 0, df[unit_price] * df['BOM환산수량'], df[unit_price] * df['소요량분자'])
+
+
+def extraction_ratio(df):
+    """
+    추출액 분쇄 자재의 배합원가: 단가_분쇄 × 추출량비율 × 원두투입 / 추출량
+    """
+    return df['단가_분쇄'] * df['추출량비율'] * df['원두투입'] / df['추출량']
+
+
+# 규칙 표 -------------------------------------------------------------------------------------------
+# (규칙 이름, 값을 바꿀 열, 행 조건 이름 목록(모두 만족, '~'는 부정, None은 모든 행), 값 계산식)
+# 표의 순서대로 적용하며 같은 행에 여러 규칙이 맞으면 뒤의 규칙 값이 남음
+
+PURCHASE_RULES = [
+    ('구매 자재', '배합원가', ('구매', '~원재료 자재번호'), column('환산비용')),
+]
+
+DIRECT_COST_RULES = [
+    ('재활용분담금/동판', '배합원가', ('재활용분담금/동판 공정',), column('단가')),
+    ('노무비/제조경비/임가공비/재료비', '배합원가', ('단가 적용 흐름',), column('단가')),
+]
+
+LOSS_RULES = [
+    ('포장 loss', 'loss율_포장', ('~재활용분담금 공정', '~노무비/제조경비/임가공비'), times('배합원가', 'loss율')),
+    ('재활용분담금 loss', 'loss율_포장', ('재활용분담금 공정', '자재번호 없음'), times('배합원가', 'loss율')),
+    ('포장 노무비/제조경비/임가공비', 'loss율_포장', ('포장 공정', '노무비/제조경비/임가공비'), constant(0)),
+    ('스트로우 loss', 'loss율_포장', ('스트로우',), times('배합원가', 'loss율')),
+    ('삼양/동원시스템즈 재료비', 'loss율_포장', ('재료비', '삼양/동원시스템즈'), constant(0)),
+    ('동판 loss', 'loss율_포장', ('동판',), times('배합원가', 'loss율')),
+]
+
+TOTAL_RULES = [
+    ('사전원가 합계', '사전원가', None, plus('배합원가', 'loss율_포장')),
+]
+
+
+def _family_override(family):
+    """
+    완제품 BOM 합계로 덮어쓰기 (원두: 사전원가_원두 / 원두 / 원두_loss, 조제도 같은 형식)
+    """
+    return [
+        (f'{family} 사전원가', '사전원가', (family,), column(f'사전원가_{family}')),
+        (f'{family} 배합원가', '배합원가', (family,), column(family)),
+        (f'{family} loss', 'loss율_포장', (family,), column(f'{family}_loss')),
+    ]
+
+
+# ✅ 제품군별 배합원가 / loss율_포장 / 사전원가 규칙 (18단계: 액상,추출액, 39단계: 원두, 57단계: 조제)
+RULES = {
+    '액상,추출액': [
+        *PURCHASE_RULES,
+        ('추출 제작 (천안)', '배합원가', ('제작', '추출 자재', '천안 추출단가'), converted('단가_추출_천안')),
+        ('추출 제작 (외주)', '배합원가', ('제작', '추출 자재', '~천안 추출단가'), converted('단가_추출_외주')),
+        *DIRECT_COST_RULES,
+        *LOSS_RULES,
+        *TOTAL_RULES,
+        ('21213226 동판', '사전원가', ('품번 21213226', '동판'), column('배합원가')),
+        ('추출액 비닐', '사전원가', ('추출액', '비닐 공정'), column('단가_배전')),
+        ('추출액 분쇄 배합원가', '배합원가', ('추출액', '분쇄 자재'), extraction_ratio),
+        ('추출액 분쇄 loss', 'loss율_포장', ('추출액', '분쇄 자재'), times('배합원가', 'loss율')),
+        ('추출액 분쇄 사전원가', '사전원가', ('추출액', '분쇄 자재'), plus('배합원가', 'loss율_포장')),
+    ],
+    '원두': [*PURCHASE_RULES, *DIRECT_COST_RULES, *LOSS_RULES, *TOTAL_RULES, *_family_override('원두')],
+    '조제': [*PURCHASE_RULES, *DIRECT_COST_RULES, *LOSS_RULES, *TOTAL_RULES, *_family_override('조제')],
+}
+
+
+class RulePlan:
+    """
+    규칙 표를 실행 계획으로 변환
+    - 연속된 같은 열의 규칙을 한 단계로 묶어 np.select 한 번으로 적용 (뒤의 규칙이 우선)
+    - 행 조건은 실행마다 한 번씩만 계산해 캐시
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        for name, _, conditions, _ in self.rules:
+            for condition in conditions or ():
+                if condition.lstrip('~') not in PREDICATES:
+                    raise KeyError(f"규칙 '{name}'의 행 조건 '{condition}'이(가) 정의되지 않았습니다.")
+
+        self.phases = []   # [(열, [규칙, ...]), ...]
+        for rule in self.rules:
+            if self.phases and self.phases[-1][0] == rule[1]:
+                self.phases[-1][1].append(rule)
+            else:
+                self.phases.append((rule[1], [rule]))
+
+    def apply(self, df):
+        """
+        규칙을 df에 적용 (열이 없으면 NaN으로 생성) 후 규칙별 적용 행 수 반환
+        """
+        cache = {}
+        hits = {}
+        for target, rules in self.phases:
+            masks = [self._mask(df, conditions, cache) for _, _, conditions, _ in rules]
+            values = [value(df) for _, _, _, value in rules]
+            current = df[target].to_numpy() if target in df.columns else np.full(len(df), np.nan)
+            df[target] = np.select(masks[::-1], values[::-1], default=current)
+            for (name, _, _, _), mask in zip(rules, masks):
+                hits[name] = int(mask.sum())
+        return hits
+
+    @staticmethod
+    def _mask(df, conditions, cache):
+        mask = np.ones(len(df), dtype=bool)
+        for condition in conditions or ():
+            name = condition.lstrip('~')
+            if name not in cache:
+                cache[name] = np.asarray(PREDICATES[name](df), dtype=bool)
+            mask &= ~cache[name] if condition.startswith('~') else cache[name]
+        return mask
+
+
+def compile_rules(family):
+    """
+    제품군의 규칙 표를 실행 계획으로 변환
+    """
+    return RulePlan(RULES[family])
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+# ✅ 천안 공장에서 진행하는 공정 (추출 반제품 단가를 '단가_추출_천안'으로 적용, 나머지 공정은 '단가_추출_외주')
+CHEONAN_PROCESSES = ['미세', '배/착', '배전', '배합', '분/착', '분쇄', '제/배', '포장']
+
+# ✅ 여러 추출물을 배합하는 추출 품번 여부 (17단계에서 행마다 기록, 18단계 '사전원가_액상,추출액.csv'까지 유지)
+BLEND_COLUMN = '추출_배합'
+
+
+def _lookup(values, keys, fill_value=0.0):
+    """
+    품번 → 값 Series를 keys(행별 품번) 순서로 한 번에 매핑 (없는 품번은 fill_value)
+    """
+    positions = values.index.get_indexer(keys)
+    mapped = pd.api.extensions.take(values.to_numpy(dtype=float), positions, allow_fill=True, fill_value=fill_value)
+    return pd.Series(mapped, index=keys.index)
+
+
+def routing_rows(bom_df):
+    """
+    추출 routing 행 조건: 공정이 '추출'이고 자재명이 '0'인 행을 (천안, 외주) 로 구분
+    비고에 '외주'가 있으면 외주, 없으면 천안 (천안 routing에서 운반비는 제외)
+    """
+    routing = (bom_df['공정'] == '추출') & (bom_df['자재명'] == '0')
+    outsourced = bom_df['비고'].str.contains('외주', na=False)
+    return routing & ~outsourced & (bom_df['조달구분'] != '운반비'), routing & outsourced
+
+
+def add_routing_costs(bom_df):
+    """
+    '추출_routing' / '추출_routing_외주' 계산 (품번별 집계 1회 + 행 매핑 1회)
+    - 추출_routing: 품번별 천안 routing 단가 합계
+    - 추출_routing_외주: 외주 routing 행이 1개이면 추출_routing + 외주 단가, 여러 개이면 외주 단가 합계
+    routing 행이 없는 품번은 0
+    (외주 단가 합계도 추출_routing과 같은 groupby 합계라 기존 Series.sum과 마지막 자리 반올림이 다를 수 있음)
+    """
+    in_house, outsourced = routing_rows(bom_df)
+
+    routing = bom_df.loc[in_house].groupby('품번')['단가'].sum()
+    bom_df['추출_routing'] = _lookup(routing, bom_df['품번'])
+
+    outsourced_price = bom_df.loc[outsourced].groupby('품번')['단가']
+    counts = outsourced_price.size()
+    single = outsourced_price.first().add(routing.reindex(counts.index, fill_value=0.0))
+    outsourced_routing = single.where(counts == 1, outsourced_price.sum())
+    bom_df['추출_routing_외주'] = _lookup(outsourced_routing, bom_df['품번'])
+    return bom_df
+
+
+def extraction_totals(bom_df):
+    """
+    추출 품번별 (천안, 외주) 추출 단가: 품번의 첫 번째 추출 행(공정 '추출', loss율_추출 ≠ 0) 기준
+    - 천안: 수율_추출 + loss율_추출 + 추출_routing
+    - 외주: 수율_추출 + loss율_추출 + 추출_routing_외주
+    """
+    qualifying = bom_df[(bom_df['공정'] == '추출') & (bom_df['loss율_추출'] != 0)]
+    first = qualifying.drop_duplicates('품번').set_index('품번')
+    cost = first['수율_추출'] + first['loss율_추출']
+    return cost + first['추출_routing'], cost + first['추출_routing_외주']
+
+
+def add_extraction_unit_prices(bom_df):
+    """
+    추출 반제품을 자재로 쓰는 행에 '단가_추출_천안' / '단가_추출_외주' 적용 (자재번호 기준 매핑 1회)
+    천안 공정 행은 단가_추출_천안, 그 외 공정 행은 단가_추출_외주, 해당하지 않는 값은 0
+    """
+    cheonan, outsourced = extraction_totals(bom_df)
+    in_cheonan = bom_df['공정'].isin(CHEONAN_PROCESSES)
+
+    bom_df['단가_추출_천안'] = _lookup(cheonan, bom_df['자재번호']).where(in_cheonan, 0.0)
+    bom_df['단가_추출_외주'] = _lookup(outsourced, bom_df['자재번호']).where(~in_cheonan, 0.0)
+    return bom_df
+
+
+def blend_products(bom_df):
+    """
+    품번별 배합 추출 여부 (bool Series, 품번 index)
+    추출량비율이 0/1이 아닌 행 중 자재번호와 추출비용이 각각 2종류 이상인 품번 (결측값도 한 종류로 셈)
+    """
+    partial = bom_df[(bom_df['추출량비율'] != 0) & (bom_df['추출량비율'] != 1)]
+    stats = partial.groupby('품번')[['자재번호', '추출비용']].nunique(dropna=False)
+    return (stats['자재번호'] > 1) & (stats['추출비용'] > 1)
+
+
+def add_blend_flags(bom_df):
+    """
+    BLEND_COLUMN 열 추가 (행의 품번이 배합 추출 품번이면 True) 후 배합 추출 품번 목록 반환
+    """
+    blends = blend_products(bom_df)
+    products = blends.index[blends.to_numpy()]
+    bom_df[BLEND_COLUMN] = bom_df['품번'].isin(products)
+    return products
+
+
+def blend_totals(bom_df, products):
+    """
+    배합 추출 품번별 (천안, 외주) 추출 단가 합계 (groupby 1회)
+    행마다 수율_추출 + loss율_추출 + routing - routing/2 를 계산해 품번별로 합산
+    """
+    rows = bom_df[bom_df['품번'].isin(products)]
+    cost = rows['수율_추출'] + rows['loss율_추출']
+    values = pd.DataFrame({
+        '천안': cost + rows['추출_routing'] - (rows['추출_routing'] / 2),
+        '외주': cost + rows['추출_routing_외주'] - (rows['추출_routing_외주'] / 2),
+    })
+    totals = values.groupby(rows['품번']).sum()
+    return totals['천안'], totals['외주']
+
+
+def add_blend_unit_prices(bom_df, products, cheonan, outsourced):
+    """
+    배합 추출 품번을 자재로 쓰는 행의 '단가_추출_천안' / '단가_추출_외주'를 합계로 갱신
+    천안 공정 행은 천안 합계, 그 외 공정 행은 외주 합계 (합계가 없으면 기존 값 유지)
+    """
+    uses_blend = bom_df['자재번호'].isin(products)
+    in_cheonan = bom_df['공정'].isin(CHEONAN_PROCESSES)
+
+    for column, totals, rows in (('단가_추출_천안', cheonan, uses_blend & in_cheonan),
+                                 ('단가_추출_외주', outsourced, uses_blend & ~in_cheonan)):
+        if column not in bom_df.columns:
+            bom_df[column] = np.nan
+        mapped = bom_df.loc[rows, '자재번호'].map(totals)
+        bom_df.loc[rows, column] = mapped.fillna(bom_df.loc[rows, column])
+    return bom_df
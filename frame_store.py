@@ -0,0 +1,405 @@
+import fnmatch
+import io
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import bom_schema
+import step_metrics
+
+# ✅ 디버그 모드: 활성화 시 모든 중간 결과를 즉시 파일로 저장 (환경변수 COST_DEBUG=1)
+DEBUG = os.environ.get("COST_DEBUG", "0") == "1"
+
+# ✅ 중간 파일 저장 형식 (환경변수 COST_INTERMEDIATE_FORMAT=csv | parquet | feather)
+#    parquet/feather이면 'BOM.csv' 대신 'BOM.parquet'처럼 같은 이름의 컬럼형 파일로 저장하고,
+#    코드 열(품번, 자재번호 등)은 문자열 스키마로 고정
+FILE_FORMAT = os.environ.get("COST_INTERMEDIATE_FORMAT", "csv").lower()
+if FILE_FORMAT != "csv" and FILE_FORMAT not in bom_schema.COLUMNAR_EXTENSIONS:
+    raise ValueError(f"지원하지 않는 중간 파일 형식입니다: {FILE_FORMAT} (csv, parquet, feather 중 선택)")
+
+# ✅ 메모리 모드에서 보관하는 DataFrame을 압축 스키마(bom_schema.compact)로 보관 (환경변수 COST_COMPACT_FRAMES=0이면 비활성)
+#    단계에는 항상 원래 열 타입으로 복원해 전달
+COMPACT = os.environ.get("COST_COMPACT_FRAMES", "1") == "1"
+
+# ✅ 브랜치 경계 파일: 메모리 모드에서도 실행 종료 시 파일로 저장
+#    (0단계가 덮어쓰는 업로드 원본, 공통 BOM 결과, 각 브랜치의 최종 사전원가 파일)
+PERSISTED_FILES = {
+    "2.생산사업장별생산품목등록.csv",
+    "BOM_가공.csv",
+    "사전원가_액상.csv",
+    "사전원가_추출액.csv",
+    "사전원가_원두.csv",
+    "사전원가_조제.csv",
+}
+
+# ✅ read_csv가 결측값으로 해석하는 문자열 (pandas 기본 na_values)
+NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+}
+
+# ✅ read_csv가 bool로 해석하는 문자열
+BOOL_STRINGS = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+
+# ✅ 메모리에서 직접 처리할 수 있는 read_csv / to_csv 인자
+SUPPORTED_READ_OPTIONS = {"encoding", "low_memory", "nrows"}
+SUPPORTED_WRITE_OPTIONS = {"encoding", "index"}
+
+_frames = {}          # 파일 경로 → DataFrame
+_restore = {}         # 파일 경로 → 압축 전 열 타입 (bom_schema.compact 반환값)
+_write_options = {}   # 파일 경로 → to_csv 인자
+_dirty = set()        # 메모리에만 있고 아직 저장되지 않은 파일
+_codec_calls = {"compact": 0, "expand": 0}        # 압축(저장) / 복원(읽기) 횟수
+_codec_seconds = {"compact": 0.0, "expand": 0.0}  # 압축 / 복원 누적 시간(초)
+_active = False
+
+
+def _key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def is_active():
+    return _active
+
+
+def activate():
+    """
+    메모리 모드 시작 (이전 실행의 데이터는 모두 비움)
+    """
+    global _active
+    _frames.clear()
+    _restore.clear()
+    _write_options.clear()
+    _dirty.clear()
+    _reset_codec_stats()
+    _active = True
+
+
+def deactivate():
+    """
+    메모리 모드 종료 (저장되지 않은 데이터는 버림)
+    """
+    global _active
+    _frames.clear()
+    _restore.clear()
+    _write_options.clear()
+    _dirty.clear()
+    _reset_codec_stats()
+    _active = False
+
+
+def is_columnar():
+    return FILE_FORMAT != "csv"
+
+
+def _reset_codec_stats():
+    for name in _codec_calls:
+        _codec_calls[name] = 0
+        _codec_seconds[name] = 0.0
+
+
+def _count_codec(name, start):
+    _codec_calls[name] += 1
+    _codec_seconds[name] += time.perf_counter() - start
+
+
+def _store(key, df):
+    if COMPACT:
+        start = time.perf_counter()
+        _frames[key], _restore[key] = bom_schema.compact(df)
+        _count_codec("compact", start)
+    else:
+        _frames[key], _restore[key] = df, {}
+
+
+def _stored(key):
+    """
+    메모리에 보관한 DataFrame을 원래 열 타입으로 복원한 사본
+    """
+    start = time.perf_counter()
+    df = bom_schema.expand(_frames[key], _restore[key])
+    if _restore[key]:
+        _count_codec("expand", start)
+    return df
+
+
+def memory_report():
+    """
+    메모리에 보관 중인 파일별 메모리 사용량 (압축 전 / 압축 후 bytes, 문자열 값 포함)
+    """
+    report = []
+    for key in sorted(_frames):
+        compact_bytes = bom_schema.memory_bytes(_frames[key])
+        report.append({
+            "file": os.path.basename(key),
+            "rows": int(len(_frames[key])),
+            "memory_bytes": bom_schema.memory_bytes(bom_schema.expand(_frames[key], _restore[key])) if _restore[key] else compact_bytes,
+            "compact_bytes": compact_bytes,
+        })
+    return report
+
+
+def codec_report():
+    """
+    이번 실행의 압축(저장 시) / 복원(읽기 시) 횟수와 누적 시간(초)
+    """
+    return {name: {"calls": _codec_calls[name], "seconds": round(_codec_seconds[name], 3)} for name in _codec_calls}
+
+
+def log_memory_report():
+    """
+    메모리에 보관 중인 데이터의 압축 전후 메모리 사용량 합계와,
+    그 대가로 쓴 압축 / 복원 시간(저장·읽기 1회당 평균)을 로그로 기록
+    """
+    report = memory_report()
+    before = sum(item["memory_bytes"] for item in report)
+    after = sum(item["compact_bytes"] for item in report)
+    costs = [
+        f"{label} {_codec_calls[name]}회 {_codec_seconds[name]:.3f}초 (1회당 {_codec_seconds[name] / _codec_calls[name] * 1000:.1f}ms)"
+        for name, label in (("compact", "저장 시 압축"), ("expand", "읽기 시 복원"))
+        if _codec_calls[name]
+    ]
+    logging.info(
+        f"메모리 보관 데이터 {len(report)}개: 압축 전 {before / 1024 / 1024:.1f}MB → 압축 후 {after / 1024 / 1024:.1f}MB"
+        + (f" ({before / after:.1f}배 감소)" if after else "")
+        + (f" / {', '.join(costs)}" if costs else "")
+    )
+    return report
+
+
+def flush(persist_all=False, persist_files=()):
+    """
+    메모리에만 있는 데이터를 파일로 저장
+    persist_all이 False이면 브랜치 경계 파일(PERSISTED_FILES)과
+    persist_files에 지정한 파일(와일드카드 사용 가능, 다른 프로세스가 이어서 읽는 파일)만 저장하고,
+    저장하지 않는 파일은 이전 실행이 디스크에 남긴 사본을 삭제 (이후 단계별 실행이 오래된 데이터를 읽지 않도록)
+    """
+    for key in sorted(_dirty):
+        file_name = os.path.basename(key)
+        if persist_all or file_name in PERSISTED_FILES or any(fnmatch.fnmatchcase(file_name, pattern) for pattern in persist_files):
+            if is_columnar():
+                bom_schema.write_columnar(_stored(key), bom_schema.columnar_path(key, FILE_FORMAT), FILE_FORMAT)
+            else:
+                _stored(key).to_csv(key, **_write_options[key])
+            _dirty.discard(key)
+            logging.info(f"메모리 데이터를 파일로 저장했습니다: {key}")
+        else:
+            for file_path in _disk_paths(key):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                    logging.info(f"이번 실행에서 저장하지 않는 이전 파일을 삭제했습니다: {file_path}")
+
+
+def exists(path):
+    """
+    메모리 또는 디스크에 파일이 존재하는지 확인
+    """
+    if _active and _key(path) in _frames:
+        return True
+    return os.path.exists(path) or (is_columnar() and os.path.exists(bom_schema.columnar_path(path, FILE_FORMAT)))
+
+
+def remove(path):
+    """
+    메모리와 디스크에서 파일 삭제 (이전 실행이 남긴 파일 정리용)
+    """
+    key = _key(path)
+    _frames.pop(key, None)
+    _restore.pop(key, None)
+    _write_options.pop(key, None)
+    _dirty.discard(key)
+    for file_path in _disk_paths(path):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def _disk_paths(path):
+    """
+    디스크에 있을 수 있는 파일 경로 (CSV와 모든 컬럼형 형식)
+    """
+    return [path] + [bom_schema.columnar_path(path, file_format) for file_format in bom_schema.COLUMNAR_EXTENSIONS]
+
+
+def read_csv(path, **kwargs):
+    """
+    pd.read_csv 대체 함수
+    메모리 모드에서는 이전 단계가 저장한 DataFrame의 사본을 반환하고,
+    처음 읽는 파일은 디스크에서 읽은 뒤 메모리에 보관
+    """
+    key = _key(path)
+    if _active and key in _frames:
+        df = _stored(key)
+        if not set(kwargs) <= SUPPORTED_READ_OPTIONS:
+            df = _reparse(df, **kwargs)
+        else:
+            nrows = kwargs.get("nrows")
+            df = df.head(nrows).copy() if nrows is not None else df
+        step_metrics.record_read(path, df)
+        return df
+
+    df = _read_disk(path, **kwargs)
+    step_metrics.record_read(path, df, _disk_file(path))
+    if _active and kwargs.get("nrows") is None and set(kwargs) <= SUPPORTED_READ_OPTIONS:
+        _store(key, df.copy())
+    return df
+
+
+def to_csv(df, path, **kwargs):
+    """
+    DataFrame.to_csv 대체 함수
+    메모리 모드에서는 저장 후 다시 읽은 것과 같은 형태로 변환해 메모리에 보관
+    (디버그 모드이면 즉시 파일로도 저장)
+    """
+    if not _active:
+        _write_disk(df, path, **kwargs)
+        step_metrics.record_write(path, df, _written_file(path))
+        return
+
+    key = _key(path)
+    stored = _as_stored(df, **kwargs)
+    _store(key, stored)
+    _write_options[key] = {"index": False, "encoding": kwargs.get("encoding", "utf-8-sig")}
+
+    if DEBUG:
+        _write_disk(df, path, **kwargs)
+        _dirty.discard(key)
+        step_metrics.record_write(path, stored, _written_file(path))
+    else:
+        _dirty.add(key)
+        step_metrics.record_write(path, stored)
+
+
+def _disk_file(path):
+    """
+    디스크에서 실제로 읽을 파일 경로
+    컬럼형 형식이면 CSV보다 최신인 컬럼형 파일을 우선 사용
+    """
+    if is_columnar():
+        columnar_file = bom_schema.columnar_path(path, FILE_FORMAT)
+        if os.path.exists(columnar_file) and (not os.path.exists(path) or os.path.getmtime(columnar_file) >= os.path.getmtime(path)):
+            return columnar_file
+    return path
+
+
+def _written_file(path):
+    return bom_schema.columnar_path(path, FILE_FORMAT) if is_columnar() else path
+
+
+def _read_disk(path, **kwargs):
+    """
+    디스크에서 읽기
+    컬럼형 형식이면 CSV보다 최신인 컬럼형 파일을 우선 사용하고,
+    CSV(업로드 원본 등)를 읽을 때는 코드 열을 문자열로 읽어 표준 형식(bom_schema.normalize_key)으로 변환
+    """
+    disk_file = _disk_file(path) if is_columnar() else path
+    if disk_file != path:
+        df = bom_schema.read_columnar(disk_file, FILE_FORMAT)
+        if not set(kwargs) <= SUPPORTED_READ_OPTIONS:
+            return _reparse(df, **kwargs)
+        nrows = kwargs.get("nrows")
+        return df.head(nrows) if nrows is not None else df
+
+    return bom_schema.normalize_keys(pd.read_csv(path, **{"dtype": bom_schema.key_dtypes(), **kwargs}))
+
+
+def _reparse(df, **kwargs):
+    """
+    메모리에서 직접 처리할 수 없는 read_csv 인자가 있으면 CSV 텍스트로 바꿔 다시 읽음
+    """
+    options = {"dtype": bom_schema.key_dtypes(), **{k: v for k, v in kwargs.items() if k != "encoding"}}
+    return bom_schema.normalize_keys(pd.read_csv(io.StringIO(df.to_csv(index=False)), **options))
+
+
+def _write_disk(df, path, **kwargs):
+    """
+    디스크에 저장 (컬럼형 형식이면 고정 스키마를 적용해 컬럼형 파일로 저장)
+    """
+    if is_columnar():
+        bom_schema.write_columnar(_as_stored(df, **kwargs), bom_schema.columnar_path(path, FILE_FORMAT), FILE_FORMAT)
+    else:
+        df.to_csv(path, **kwargs)
+
+
+def _as_stored(df, **kwargs):
+    """
+    저장 후 다시 읽은 것과 같은 형태로 변환
+    CSV와 같은 열 타입 추론을 적용하고, 코드 열은 표준 형식 문자열로 고정 (다시 읽을 때와 같은 값)
+    """
+    if set(kwargs) <= SUPPORTED_WRITE_OPTIONS and kwargs.get("index", True) is False:
+        stored = as_csv_roundtrip(df)
+    else:
+        stored = pd.read_csv(io.StringIO(df.to_csv(**{k: v for k, v in kwargs.items() if k != "encoding"})))
+    return bom_schema.apply_schema(stored) if is_columnar() else bom_schema.normalize_keys(stored)
+
+
+def as_csv_roundtrip(df):
+    """
+    to_csv(index=False) 후 read_csv 한 결과와 같은 열 타입/값으로 변환
+    (문자열 열의 숫자 추론, 빈 문자열·'nan' 등의 결측 처리, 인덱스 초기화)
+    float 열은 메모리 값을 그대로 유지 (CSV 파싱 시 생기는 마지막 자리 오차가 없음)
+    """
+    if df.columns.has_duplicates:
+        # 중복 열 이름은 read_csv의 이름 변경('열.1')까지 맞추기 위해 실제 CSV 변환으로 처리
+        return pd.read_csv(io.StringIO(df.to_csv(index=False)), low_memory=False)
+
+    columns = {}
+    for column in df.columns:
+        columns[column] = _roundtrip_column(df[column])
+    result = pd.DataFrame(columns, columns=df.columns)
+    result.index = pd.RangeIndex(len(result))
+    return result
+
+
+def _roundtrip_column(series):
+    series = series.reset_index(drop=True)
+
+    if len(series) == 0:
+        return series.astype(object)
+    if series.dtype.kind in "biuf":
+        return series
+    if series.dtype != object:
+        # 날짜 등 그 밖의 타입은 해당 열만 실제 CSV 변환으로 처리
+        return pd.read_csv(io.StringIO(series.to_frame("_").to_csv(index=False)))["_"]
+
+    missing = series.isna().to_numpy()
+    text = series.astype(str)
+    missing |= text.isin(NA_STRINGS).to_numpy()
+    if missing.all():
+        return pd.Series(np.nan, index=series.index, dtype=float)
+
+    values = text[~missing]
+    first = values.iloc[0]
+
+    # 숫자로 해석 가능한 경우 (read_csv와 동일하게 int → 결측이 있으면 float)
+    if _looks_numeric(first):
+        numbers = pd.to_numeric(values, errors="coerce")
+        if numbers.notna().all():
+            if missing.any():
+                result = pd.Series(np.nan, index=series.index, dtype=float)
+                result[~missing] = numbers.astype(float)
+                return result
+            return numbers
+
+    # True/False 문자열만 있는 경우
+    if first in BOOL_STRINGS and values.isin(BOOL_STRINGS.keys()).all():
+        mapped = values.map(BOOL_STRINGS)
+        if not missing.any():
+            return mapped.astype(bool)
+        result = pd.Series(np.nan, index=series.index, dtype=object)
+        result[~missing] = mapped
+        return result
+
+    return text.where(~missing, np.nan)
+
+
+def _looks_numeric(value):
+    if "_" in value:
+        return False
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
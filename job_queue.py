@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pipeline_runner
+
+# ✅ 작업 상태 값
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+# ✅ 메모리에 보관하는 종료된 작업 수 (오래된 작업부터 삭제)
+MAX_FINISHED_JOBS = 50
+
+# ✅ 실행은 한 번에 하나씩 (모든 작업이 같은 uploads/results 디렉토리를 사용하므로 순서대로 처리)
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cost-job")
+_jobs: Dict[str, "Job"] = {}
+_jobs_lock = threading.Lock()
+
+# ✅ 입력 파일(uploads) 잠금 (작업 실행 중에는 업로드가 작업이 읽는 입력 파일을 덮어쓰지 못하게 함)
+_inputs_lock = threading.Lock()
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class Job:
+    """
+    백그라운드 단계 실행 작업 하나의 상태와 진행 이벤트
+    (job_id는 단계별 계측 결과의 run_id로도 사용)
+    """
+
+    def __init__(self, step_numbers: List[int]):
+        self.job_id = uuid.uuid4().hex
+        self.step_numbers = step_numbers
+        self.status = STATUS_QUEUED
+        self.created_at = _now()
+        self.started_at = None
+        self.finished_at = None
+        self.running_steps = set()
+        self.finished_steps = set()
+        self.failed_step = None
+        self.error = None
+        self.timings = []
+        self.total_seconds = None
+        self.events = []
+        self._lock = threading.Lock()
+        self.record({"type": "job_queued", "time": self.created_at})
+
+    def record(self, event: Dict) -> None:
+        """
+        진행 이벤트 기록 및 현재 상태 갱신
+        """
+        with self._lock:
+            event_type = event["type"]
+            if event_type == "step_started":
+                self.running_steps.add(event["step"])
+            elif event_type == "step_finished":
+                self.running_steps.discard(event["step"])
+                self.finished_steps.add(event["step"])
+            elif event_type == "step_failed":
+                self.running_steps.discard(event["step"])
+                # 병렬 실행 중 여러 세그먼트가 실패하면 처음 실패한 단계를 유지 (오류 메시지의 단계와 일치)
+                if self.failed_step is None:
+                    self.failed_step = event["step"]
+            self.events.append({"index": len(self.events), **event})
+
+    def to_dict(self) -> Dict:
+        """
+        상태 조회 API 응답
+        """
+        with self._lock:
+            total = len(self.step_numbers)
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "current_steps": sorted(self.running_steps),
+                "completed_steps": len(self.finished_steps),
+                "total_steps": total,
+                "progress": round(len(self.finished_steps) / total, 3) if total else 1.0,
+                "failed_step": self.failed_step,
+                "error": self.error,
+                "timings": self.timings,
+                "step_seconds": round(sum(t["seconds"] for t in self.timings), 3) if self.timings else None,
+                "total_seconds": self.total_seconds,
+            }
+
+    def events_after(self, after: int) -> List[Dict]:
+        with self._lock:
+            return self.events[max(after, 0):]
+
+
+def submit(step_numbers: Iterable[int], persist_all: bool = False) -> Job:
+    """
+    단계 실행 작업을 등록하고 바로 반환 (실행은 백그라운드 스레드에서 진행)
+    """
+    job = Job(list(step_numbers))
+    with _jobs_lock:
+        _jobs[job.job_id] = job
+        _discard_old_jobs()
+    _executor.submit(_run, job, persist_all)
+    return job
+
+
+def get(job_id: str) -> Optional[Job]:
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def running_job() -> Optional[Job]:
+    """
+    실행 중인 작업 반환 (없으면 None)
+    """
+    with _jobs_lock:
+        return next((job for job in _jobs.values() if job.status == STATUS_RUNNING), None)
+
+
+def try_lock_inputs() -> bool:
+    """
+    입력 파일 잠금 획득 (실행 중인 작업이 있으면 기다리지 않고 False 반환)
+    잠금을 얻으면 unlock_inputs()로 반드시 해제
+    """
+    return _inputs_lock.acquire(blocking=False)
+
+
+def unlock_inputs() -> None:
+    _inputs_lock.release()
+
+
+def _discard_old_jobs() -> None:
+    finished = [job for job in _jobs.values() if job.status in (STATUS_COMPLETED, STATUS_FAILED)]
+    for job in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+        del _jobs[job.job_id]
+
+
+def _run(job: Job, persist_all: bool) -> None:
+    # 업로드 중이면 끝날 때까지 기다렸다가 시작하고, 실행하는 동안에는 업로드를 막음
+    with _inputs_lock:
+        _execute(job, persist_all)
+
+
+def _execute(job: Job, persist_all: bool) -> None:
+    job.status = STATUS_RUNNING
+    job.started_at = _now()
+    job.record({"type": "job_started", "time": job.started_at})
+    logging.info(f"🚀 작업 {job.job_id} 실행 시작 ({len(job.step_numbers)}개 단계)")
+
+    start = time.perf_counter()
+    try:
+        timings = pipeline_runner.run_parallel(job.step_numbers, persist_all=persist_all, on_event=job.record, run_id=job.job_id)
+    except Exception as e:
+        job.error = str(e)
+        job.total_seconds = round(time.perf_counter() - start, 3)
+        job.finished_at = _now()
+        job.status = STATUS_FAILED
+        job.record({"type": "job_failed", "time": job.finished_at, "error": job.error})
+        logging.error(f"❌ 작업 {job.job_id} 실행 중 오류 발생: {job.error}")
+        return
+
+    job.timings = timings
+    job.total_seconds = round(time.perf_counter() - start, 3)
+    job.finished_at = _now()
+    job.status = STATUS_COMPLETED
+    job.record({"type": "job_completed", "time": job.finished_at, "seconds": job.total_seconds})
+    for t in timings:
+        logging.info(f"⏱ {t['step']}단계: {t['seconds']}초")
+    logging.info(f"✅ 작업 {job.job_id} 완료 (전체 {job.total_seconds}초)")
@@ -0,0 +1,110 @@
+import numpy as np
+
+import yield_stages
+
+# ✅ 규칙 적용 방식
+#    SHARED_MATERIAL: 조건 행의 자재번호를 가진 모든 행에 적용 (조건 행의 품번이면 수율 loss율, 값이 없으면 기존 값 유지, 그 외 품번은 결측값)
+#    DIRECT: 조건 행에 수율 loss율을 그대로 적용 (품번이 수율에 없으면 결측값)
+SHARED_MATERIAL = 'shared_material'
+DIRECT = 'direct'
+
+
+# ✅ 행 조건 (이름 → 행 조건): 적용 중 한 번만 계산해 bool 배열로 재사용, loss율 열은 읽지 않아야 함
+PREDICATES = {
+    '박스/케이스/봉투/스트로우/이산화탄소 자재': lambda df: df['자재명'].str.contains('박스|케이스|봉투|스트로우|이산화탄소', na=False),
+    '박스/케이스/봉투/스트로우 자재': lambda df: df['자재명'].str.contains('박스|케이스|봉투|스트로우', na=False),
+    '재료비': lambda df: df['공정흐름차수명'].str.contains('재료비', na=False),
+    '동판': lambda df: df['공정'].str.contains('동판', na=False),
+    '재활용분담금 공정': lambda df: df['공정'] == '재활용분담금',
+    '재활용분담금/스티커/트레이더스 공정': lambda df: df['공정'].isin(['재활용분담금', '스티커', '트레이더스']),
+    '이산화탄소 조달': lambda df: df['조달구분'] == '이산화탄소',
+    '원두 부자재': lambda df: (df['품목대분류'] == '원두') & (df['품목자산분류'] == '부자재'),
+    '비닐/박스 공정': lambda df: df['공정'].isin(yield_stages.PACKAGING_PROCESSES),
+}
+
+
+# 규칙 표 -------------------------------------------------------------------------------------------
+# (규칙 이름, 적용 방식, 행 조건 이름, 수율 조회 조건, 중복 품번 처리)
+# 표의 순서대로 우선순위가 높아지며 같은 행에 여러 규칙이 맞으면 뒤의 규칙 값이 남음
+
+RULES = {
+    # 5단계
+    '액상,추출액': [
+        ('자재명', SHARED_MATERIAL, '박스/케이스/봉투/스트로우/이산화탄소 자재', {'구분': '부자재'}, 'first'),
+        ('공정흐름', SHARED_MATERIAL, '재료비', {'구분': '부자재'}, 'first'),
+        ('동판', SHARED_MATERIAL, '동판', {'구분': '부자재'}, 'first'),
+        ('재활용분담금', DIRECT, '재활용분담금 공정', {'비고': '재활용분담금'}, 'first'),
+        ('이산화탄소', DIRECT, '이산화탄소 조달', {'구분': '원자재'}, 'first'),
+        ('비닐/박스', DIRECT, '비닐/박스 공정', {'대분류': ['액상', '추출액'], '구분': '부자재'}, 'last'),
+    ],
+    # 22단계
+    '원두': [
+        ('자재명', SHARED_MATERIAL, '박스/케이스/봉투/스트로우 자재', {'비고': '재활용분담금'}, 'first'),
+        ('공정흐름', SHARED_MATERIAL, '재료비', {'비고': '재활용분담금'}, 'first'),
+        ('동판', SHARED_MATERIAL, '동판', {'비고': '재활용분담금'}, 'first'),
+        ('재활용분담금/스티커/트레이더스', DIRECT, '재활용분담금/스티커/트레이더스 공정',
+         {'비고': ['재활용분담금', '스티커', '트레이더스']}, 'first'),
+        ('원두 부자재', DIRECT, '원두 부자재', {'대분류': '원두', '구분': '부자재'}, 'first'),
+        ('이산화탄소', DIRECT, '이산화탄소 조달', {'비고': '이산화탄소'}, 'first'),
+        ('비닐/박스', DIRECT, '비닐/박스 공정', {}, 'last'),
+    ],
+}
+
+
+class LossRateResolver:
+    """
+    loss율 규칙 표를 한 번에 적용
+    - 행마다 적용할 수율 출처(규칙별 조회 결과 / 결측값 / 기존 값)를 정한 뒤 한 번의 gather로 loss율을 채움
+    - 행 조건과 수율 조회 결과는 실행마다 한 번씩만 계산해 캐시 (같은 조회 조건을 쓰는 규칙끼리 공유)
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        for name, mode, condition, _, _ in self.rules:
+            if mode not in (SHARED_MATERIAL, DIRECT):
+                raise ValueError(f"규칙 '{name}'의 적용 방식 '{mode}'을(를) 지원하지 않습니다.")
+            if condition not in PREDICATES:
+                raise KeyError(f"규칙 '{name}'의 행 조건 '{condition}'이(가) 정의되지 않았습니다.")
+
+    def apply(self, df, yields):
+        """
+        df의 'loss율'을 규칙에 따라 갱신 (yields: yield_table.YieldTable) 후 규칙별 적용 행 수 반환
+        """
+        sources = {}    # (중복 처리, 조회 조건) → 출처 번호
+        columns = []    # 출처별 loss율 배열
+        choices, masks, hits = [], [], {}
+        for name, mode, condition, yield_conditions, duplicates in self.rules:
+            key = (duplicates, tuple(sorted((column, str(value)) for column, value in yield_conditions.items())))
+            if key not in sources:
+                sources[key] = len(columns)
+                columns.append(yields.lookup(df['품번'], 'loss율', duplicates, **yield_conditions).to_numpy(dtype=float))
+            source = sources[key]
+
+            rows = np.asarray(PREDICATES[condition](df), dtype=bool)
+            if mode == DIRECT:
+                mask, choice = rows, source
+            else:
+                in_parts = df['품번'].isin(df.loc[rows, '품번']).to_numpy()
+                in_materials = df['자재번호'].isin(df.loc[rows, '자재번호']).to_numpy()
+                # 조건 행의 품번이지만 수율 값이 없으면 적용하지 않음 (앞 규칙 값 또는 기존 값 유지)
+                mask = in_materials & ~(in_parts & np.isnan(columns[source]))
+                choice = np.where(in_parts, source, -1)
+            masks.append(mask)
+            choices.append(choice)
+            hits[name] = int(mask.sum())
+
+        # 출처 번호: 0..n-1 수율 조회 결과, n 결측값, n+1 기존 값
+        missing, current = len(columns), len(columns) + 1
+        choices = [np.where(np.asarray(choice) == -1, missing, choice) for choice in choices]
+        chosen = np.select(masks[::-1], choices[::-1], default=current)
+        stacked = np.vstack([*columns, np.full(len(df), np.nan), df['loss율'].to_numpy(dtype=float)])
+        df['loss율'] = stacked[chosen, np.arange(len(df))]
+        return hits
+
+
+def compile_rules(family):
+    """
+    제품군의 loss율 규칙 표를 실행 계획으로 변환
+    """
+    return LossRateResolver(RULES[family])
+
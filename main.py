@@ -4,12 +4,14 @@ from fastapi.middleware.cors import CORSMiddleware
 import os
 import logging
 import pandas as pd
-import subprocess
-from typing import List
+from typing import List, Optional
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 from jinja2 import Template
 import uvicorn
+import pipeline_runner
+import job_queue
+import step_metrics
 
 # ✅ FastAPI 앱 생성
 app = FastAPI()
@@ -43,32 +45,41 @@ async def upload_files(files: List[UploadFile] = File(...)):
     """
     여러 개의 파일 업로드 및 XLSX → CSV 변환 API
     """
-    uploaded_files = []
+    # ✅ 실행 중인 작업이 입력 파일을 읽는 동안에는 덮어쓰지 않도록 업로드 거부
+    if not job_queue.try_lock_inputs():
+        job = job_queue.running_job()
+        detail = f"실행 중인 작업이 있어 업로드할 수 없습니다. 작업이 끝난 뒤 다시 시도하세요. (작업 ID: {job.job_id if job else '-'})"
+        logger.warning(detail)
+        raise HTTPException(status_code=409, detail=detail)
 
-    for file in files:
-        file_path = os.path.join(UPLOAD_DIR, file.filename)
-        logger.info(f"파일 업로드 시작: {file.filename}")
-
-        # 파일 저장
-        with open(file_path, "wb") as f:
-            f.write(await file.read())
-
-        # ✅ XLSX → CSV 변환 (업로드 시 변환 수행)
-        if file.filename.endswith(".xlsx"):
-            try:
-                df = pd.read_excel(file_path, engine="openpyxl")
-                csv_file_path = file_path.replace(".xlsx", ".csv")
-                df.to_csv(csv_file_path, index=False, encoding="utf-8-sig")
-                logger.info(f"XLSX → CSV 변환 완료: {csv_file_path}")
-
-                # 원본 XLSX 삭제 (선택 사항)
-                os.remove(file_path)
-                uploaded_files.append(csv_file_path.split("/")[-1])  # 변환된 CSV 파일명 저장
-            except Exception as e:
-                logger.error(f"XLSX 변환 실패: {str(e)}")
-                raise HTTPException(status_code=500, detail=f"XLSX 변환 실패: {str(e)}")
-        else:
-            uploaded_files.append(file.filename)
+    uploaded_files = []
+    try:
+        for file in files:
+            file_path = os.path.join(UPLOAD_DIR, file.filename)
+            logger.info(f"파일 업로드 시작: {file.filename}")
+
+            # 파일 저장
+            with open(file_path, "wb") as f:
+                f.write(await file.read())
+
+            # ✅ XLSX → CSV 변환 (업로드 시 변환 수행)
+            if file.filename.endswith(".xlsx"):
+                try:
+                    df = pd.read_excel(file_path, engine="openpyxl")
+                    csv_file_path = file_path.replace(".xlsx", ".csv")
+                    df.to_csv(csv_file_path, index=False, encoding="utf-8-sig")
+                    logger.info(f"XLSX → CSV 변환 완료: {csv_file_path}")
+
+                    # 원본 XLSX 삭제 (선택 사항)
+                    os.remove(file_path)
+                    uploaded_files.append(csv_file_path.split("/")[-1])  # 변환된 CSV 파일명 저장
+                except Exception as e:
+                    logger.error(f"XLSX 변환 실패: {str(e)}")
+                    raise HTTPException(status_code=500, detail=f"XLSX 변환 실패: {str(e)}")
+            else:
+                uploaded_files.append(file.filename)
+    finally:
+        job_queue.unlock_inputs()
 
     return {"message": "파일 업로드 및 변환 완료", "uploaded_files": uploaded_files}
 
@@ -76,9 +87,9 @@ async def upload_files(files: List[UploadFile] = File(...)):
 # ✅ 단계별 실행 함수
 def run_step(step_number: int):
     """
-    특정 단계의 Python 스크립트를 실행하는 함수
+    특정 단계의 Python 스크립트를 작업 프로세스 안에서 실행하는 함수
     """
-    script_path = f"사전원가_{step_number}단계.py"
+    script_path = pipeline_runner.step_script_path(step_number)
     
     if not os.path.exists(script_path):
         logger.error(f"파일이 존재하지 않음: {script_path}")
@@ -86,10 +97,10 @@ def run_step(step_number: int):
 
     try:
         logger.info(f"🚀 {step_number}단계 실행 중...")
-        subprocess.run(["python", script_path], check=True)  # ✅ Python 실행
-        logger.info(f"✅ {step_number}단계 실행 완료")
-        return {"message": f"Step {step_number} executed successfully"}
-    except subprocess.CalledProcessError as e:
+        timings = pipeline_runner.run_in_worker([step_number])  # ✅ 작업 프로세스에서 실행
+        logger.info(f"✅ {step_number}단계 실행 완료 ({timings[0]['seconds']}초)")
+        return {"message": f"Step {step_number} executed successfully", "timings": timings}
+    except Exception as e:
         logger.error(f"❌ {step_number}단계 실행 중 오류 발생: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Step {step_number} 실행 오류: {str(e)}")
 
@@ -102,23 +113,53 @@ def run_single_step(step_number: int):
     return run_step(step_number)
 
 
-@app.post("/run-processing/")
+@app.post("/run-processing/", status_code=202)
 def run_all_steps():
     """
-    0단계부터 59단계까지 순차적으로 실행하는 API
+    0단계부터 59단계까지 실행하는 작업을 등록하는 API
+    작업 ID를 바로 반환하고 실행은 백그라운드에서 진행 (진행 상황은 /jobs/{job_id}로 조회)
+    단계별 입출력 선언으로 의존 관계를 만들어 서로 독립인 브랜치는 작업 프로세스 여러 개에서 동시에 실행
     """
-    try:
-        logger.info("🚀 전체 단계 실행 시작")
+    job = job_queue.submit(range(pipeline_runner.STEP_COUNT), persist_all=False)
+    logger.info(f"📥 전체 단계 실행 작업 등록: {job.job_id}")
+    return {"message": "전체 단계 실행 작업이 등록되었습니다", "job_id": job.job_id, "status": job.status}
 
-        for step in range(60):  # ✅ 0~59단계 실행
-            run_step(step)
 
-        logger.info("✅ 모든 단계 실행 완료")
-        return {"message": "모든 단계 실행 완료"}
-    
-    except Exception as e:
-        logger.error(f"❌ 전체 실행 중 오류 발생: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"전체 실행 오류: {str(e)}")
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    작업 상태 조회 API (상태, 실행 중인 단계, 진행률, 실패 단계 및 오류)
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/events")
+def get_job_events(job_id: str, after: int = 0):
+    """
+    작업 진행 이벤트 조회 API
+    after에 마지막으로 받은 이벤트 index + 1을 넘기면 그 이후 이벤트만 반환
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    events = job.events_after(after)
+    return {"job_id": job_id, "status": job.status, "events": events, "next": max(after, 0) + len(events)}
+
+@app.get("/metrics")
+def get_metrics(run_id: Optional[str] = None):
+    """
+    단계별 계측 결과 조회 API (벽시계/CPU 시간, 최대 메모리, 입출력 행 수 및 파일 크기)
+    run_id(작업 ID)를 생략하면 가장 최근 실행 결과 반환
+    """
+    records = step_metrics.read_metrics(run_id)
+    return {
+        "run_id": records[0]["run_id"] if records else run_id,
+        "summary": step_metrics.summarize(records),
+        "steps": records,
+    }
 
 @app.get("/list-results/")
 async def list_results():
@@ -258,4 +299,4 @@ def keep_alive():
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))  # Render에서 제공하는 포트 사용
-    uvicorn.run(app, host="0.0.0.0", port=port, timeout_keep_alive=300)
+    uvicorn.run(app, host="0.0.0.0", port=port)
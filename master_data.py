@@ -0,0 +1,83 @@
+import logging
+import os
+
+import pandas as pd
+
+import frame_store
+import material_class
+
+# ✅ 기준정보 원본 파일 (UPLOAD_DIR 기준)
+BOM_FILE = 'BOM_가공.csv'
+ITEM_FILE = '품목조회(추가정보).csv'
+MATERIAL_FILE = '자재조회(추가정보).csv'
+RAW_COST_FILE = 'raw_사전원가.csv'
+SOURCE_FILES = [BOM_FILE, ITEM_FILE, MATERIAL_FILE, RAW_COST_FILE]
+
+# ✅ raw_사전원가 열 → BOM 열 이름
+RAW_COST_COLUMNS = {
+    '품명': '품명',
+    '품번': '품번',
+    '공정': '공정',
+    '항목': '공정흐름차수명',
+    '합계': '단가',
+    '작업단계': '조달구분',
+    '구분': '비고',
+    '구분.1': '규격',
+}
+
+# ✅ raw_사전원가 '항목' 값 중 '공정' 열로 옮기는 항목 (공정흐름차수명은 공백 처리)
+PROCESS_ITEMS = ['비닐', '박스(30kg)', '재활용분담금', '스티커', '트레이더스']
+
+
+def raw_cost_rows(raw_cost_df):
+    """
+    raw_사전원가를 BOM 열 형식으로 변환 (필요한 열 선택, 이름 변경, PROCESS_ITEMS 항목을 '공정' 열로 이동)
+    """
+    rows = raw_cost_df[list(RAW_COST_COLUMNS)].rename(columns=RAW_COST_COLUMNS)
+    moved = rows['공정흐름차수명'].isin(PROCESS_ITEMS)
+    rows.loc[moved, '공정'] = rows['공정흐름차수명']
+    rows.loc[moved, '공정흐름차수명'] = ''
+    return rows
+
+
+def _move_before(columns, column, anchor):
+    columns.insert(columns.index(anchor), columns.pop(columns.index(column)))
+
+
+def enrich(bom_df, item_df, material_df, raw_cost_df):
+    """
+    BOM + raw_사전원가 결합 후 기준정보 열 추가
+    - 품목대분류: 품목조회(추가정보)의 품번 기준 조회 ('품명' 앞)
+    - 품목자산분류: 자재조회(추가정보)의 자재번호 기준 조회 ('자재명' 앞)
+    - 자재구분 / 자재공정: material_class 분류
+    """
+    combined_df = pd.concat([bom_df, raw_cost_rows(raw_cost_df)], ignore_index=True)
+    logging.info("raw_사전원가 데이터를 BOM 데이터에 결합했습니다.")
+
+    combined_df['품목대분류'] = combined_df['품번'].map(item_df.set_index('품번')['품목대분류'])
+    logging.info("'품목대분류' 열을 생성하고 값 매핑을 완료했습니다.")
+
+    combined_df['품목자산분류'] = combined_df['자재번호'].map(material_df.set_index('자재번호')['품목자산분류'])
+    logging.info("'품목자산분류' 열을 생성하고 값 매핑을 완료했습니다.")
+
+    # 자재번호(사내 반제품 형식)와 자재명(공정 태그)을 한 번 분류해 '자재구분' / '자재공정' 열로 저장 (이후 단계에서 재사용)
+    material_class.add_material_classes(combined_df)
+    logging.info("'자재구분' / '자재공정' 열을 생성했습니다.")
+
+    columns = combined_df.columns.tolist()
+    _move_before(columns, '품목대분류', '품명')
+    _move_before(columns, '품목자산분류', '자재명')
+    logging.info("열 순서를 재배치했습니다.")
+    return combined_df[columns]
+
+
+def build(upload_dir):
+    """
+    기준정보 원본 파일을 읽어 결합 BOM 생성
+    3단계(액상,추출액), 20단계(원두), 41단계(조제)가 각자 호출하고 브랜치 전용 열은 각 단계에서 추가
+    (결합 BOM을 파일로 공유하면 브랜치마다 큰 CSV를 다시 읽어야 해 원본을 읽어 결합하는 것보다 느림)
+    """
+    frames = [frame_store.read_csv(os.path.join(upload_dir, file_name), encoding='utf-8-sig', low_memory=False)
+              for file_name in SOURCE_FILES]
+    logging.info("모든 파일을 성공적으로 불러왔습니다.")
+    return enrich(*frames)
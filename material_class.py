@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+# ✅ 사내 반제품 자재번호 형식 (5x + A/B + 숫자 5자리, 예: 51A00001)
+SEMI_FINISHED_PATTERN = r'5\d[A|B]\d{5}'
+
+# ✅ 자재번호 분류 열 ('반제품' / '일반')
+MATERIAL_CLASS_COLUMN = '자재구분'
+MATERIAL_CLASSES = ['반제품', '일반']
+
+# ✅ 자재명 공정 태그 열: 태그 이름 → 자재명에 포함되는 문자열 (여러 개면 하나라도 포함)
+# 값은 자재명에 포함된 태그를 '|'로 이은 문자열, 태그가 없으면 NO_TAG
+PROCESS_TAG_COLUMN = '자재공정'
+PROCESS_TAGS = {
+    '배전': ['배전-'],
+    '배/착': ['배/착-'],
+    '분쇄': ['분쇄-'],
+    '분/착': ['분/착-'],
+    '스틱': ['스틱-'],
+    '미세': ['미세-'],
+    '추출': ['추출-'],
+    '조/배': ['조/배-'],
+    '건조/열풍': ['건조', '열풍'],
+}
+NO_TAG = '없음'
+
+# ✅ 분류 열 목록 (단계에서 열을 골라 저장할 때 함께 유지)
+COLUMNS = [MATERIAL_CLASS_COLUMN, PROCESS_TAG_COLUMN]
+
+
+def _broadcast(series, classify_uniques, default):
+    """
+    고유값마다 한 번씩만 분류한 뒤 행으로 펼친 Categorical 반환 (결측값은 default)
+    """
+    codes, uniques = pd.factorize(series)
+    labels = np.append(np.asarray(classify_uniques(pd.Series(uniques, dtype=object)), dtype=object), default)
+    label_codes, categories = pd.factorize(labels)
+    return pd.Categorical.from_codes(label_codes[codes], categories=categories)
+
+
+def _semi_finished_labels(material_numbers):
+    matched = material_numbers.astype(str).str.strip().str.match(SEMI_FINISHED_PATTERN)
+    return np.where(matched, MATERIAL_CLASSES[0], MATERIAL_CLASSES[1])
+
+
+def _tag_labels(names):
+    found = {
+        tag: np.logical_or.reduce([names.str.contains(text, regex=False, na=False).to_numpy(dtype=bool) for text in texts])
+        for tag, texts in PROCESS_TAGS.items()
+    }
+    return ['|'.join(tag for tag in PROCESS_TAGS if found[tag][i]) or NO_TAG for i in range(len(names))]
+
+
+def material_classes(material_numbers):
+    """
+    자재번호 → '자재구분' Categorical (반제품 / 일반)
+    """
+    classes = _broadcast(material_numbers, _semi_finished_labels, MATERIAL_CLASSES[1])
+    return classes.set_categories(MATERIAL_CLASSES)
+
+
+def process_tags(names):
+    """
+    자재명 → '자재공정' Categorical (포함된 공정 태그, 정규식 검사는 고유 자재명마다 한 번)
+    """
+    return _broadcast(names, _tag_labels, NO_TAG)
+
+
+def add_material_classes(df):
+    """
+    BOM 원본을 읽은 직후 한 번 '자재구분' / '자재공정' 열 추가 (이후 단계는 이 열을 읽음)
+    """
+    df[MATERIAL_CLASS_COLUMN] = pd.Series(material_classes(df['자재번호']), index=df.index)
+    df[PROCESS_TAG_COLUMN] = pd.Series(process_tags(df['자재명']), index=df.index)
+    return df
+
+
+def _lookup(df, column, compute, matches):
+    """
+    분류 열에서 조건(matches: 분류 값 → bool)에 맞는 행 (bool 배열)
+    열이 없거나 값이 없는 행(분류 이후 추가된 행)은 원본 열에서 다시 분류
+    """
+    if column in df.columns:
+        values = df[column]
+        labels = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype('category')
+    else:
+        labels = pd.Series(compute(), index=df.index)
+
+    categories = labels.cat.categories
+    codes = labels.cat.codes.to_numpy()
+    per_category = np.append(np.array([matches(label) for label in categories], dtype=bool), False)
+    result = per_category[codes]
+
+    missing = codes == -1
+    if missing.any():
+        recomputed = pd.Series(compute(), index=df.index)[missing]
+        result[missing] = [matches(label) for label in recomputed]
+    return result
+
+
+def is_semi_finished(df):
+    """
+    자재번호가 사내 반제품 형식인 행 (기존 자재번호.str.match(SEMI_FINISHED_PATTERN)과 같은 결과)
+    """
+    return _lookup(df, MATERIAL_CLASS_COLUMN, lambda: material_classes(df['자재번호']),
+                   lambda label: label == MATERIAL_CLASSES[0])
+
+
+def has_tag(df, *tags):
+    """
+    자재명에 공정 태그 중 하나라도 포함된 행 (기존 자재명.str.contains('배전-|분쇄-', na=False)와 같은 결과)
+    """
+    for tag in tags:
+        if tag not in PROCESS_TAGS:
+            raise KeyError(f"정의되지 않은 공정 태그입니다: {tag}")
+    wanted = set(tags)
+    return _lookup(df, PROCESS_TAG_COLUMN, lambda: process_tags(df['자재명']),
+                   lambda label: not wanted.isdisjoint(str(label).split('|')))
@@ -0,0 +1,56 @@
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+# ✅ 품명에 이 문구가 있으면 규격과 관계없이 입수 1 (원두 시그니처 팩)
+SIGNATURE_PACK = '시그니처 팩'
+
+_STAR_COUNT = re.compile(r'\*(\d+)')
+_PACK_COUNT = re.compile(r'(\d+)[pP]')
+
+
+def star_count(value):
+    """
+    원두 규격: 'p' 앞 부분에서 '*' 뒤의 숫자 (예: '1kg*10' → 10, 숫자가 없으면 None)
+    """
+    if 'p' in value.lower():
+        value = value.split('p')[0].strip()
+    match = _STAR_COUNT.search(value)
+    return int(match.group(1)) if match else None
+
+
+def pack_count(value):
+    """
+    조제 규격: 'p' 또는 'P' 앞의 숫자 (예: '12g*30P' → 30, 숫자가 없으면 None)
+    """
+    match = _PACK_COUNT.search(value)
+    return int(match.group(1)) if match else None
+
+
+def pack_counts(specs, parser):
+    """
+    규격 열 → 입수 Series (고유 규격마다 한 번만 파싱해 행으로 펼침, 결측값은 None)
+    결과 dtype은 Series.apply(parser)와 같음 (모두 숫자면 int64, 일부 None이면 float64)
+    """
+    codes, uniques = pd.factorize(specs)
+    parsed = np.empty(len(uniques) + 1, dtype=object)
+    for position, value in enumerate(uniques):
+        try:
+            parsed[position] = parser(value)
+        except ValueError:
+            logging.warning(f"값 변환 오류: {value}")
+            parsed[position] = None
+    parsed[-1] = None
+    return pd.Series(parsed[codes], index=specs.index).infer_objects()
+
+
+def add_pack_counts(df, parser, signature_pack=False):
+    """
+    '규격'에서 '입수' 열 생성, signature_pack이면 '품명'에 SIGNATURE_PACK이 있는 행은 입수 1
+    """
+    df['입수'] = pack_counts(df['규격'], parser)
+    if signature_pack:
+        df.loc[df['품명'].str.contains(SIGNATURE_PACK, na=False), '입수'] = 1
+    return df
@@ -0,0 +1,228 @@
+import importlib.util
+import logging
+import multiprocessing
+import os
+import queue
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+import frame_store
+import step_graph
+import step_metrics
+
+# ✅ 단계 스크립트가 위치한 디렉토리 (각 단계도 이 디렉토리로 chdir 함)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ✅ 전체 단계 수 (0단계 ~ 59단계)
+STEP_COUNT = 60
+
+# ✅ main() 대신 다른 진입 함수를 사용하는 단계
+ENTRY_FUNCTIONS = {59: "integrate_cost_files"}
+
+# ✅ 병렬 실행 시 최대 작업 프로세스 수 (환경변수 COST_MAX_WORKERS, 기본값은 CPU 수)
+MAX_WORKERS = int(os.environ.get("COST_MAX_WORKERS", os.cpu_count() or 1))
+
+# ✅ 진행 이벤트를 확인하는 간격 (초)
+EVENT_POLL_SECONDS = 0.5
+
+
+def step_script_path(step_number: int) -> str:
+    """
+    단계 번호에 해당하는 스크립트 경로 반환
+    """
+    return os.path.join(SCRIPT_DIR, f"사전원가_{step_number}단계.py")
+
+
+def reset_logging() -> None:
+    """
+    루트 로거의 핸들러를 모두 제거
+    (각 단계의 logging.basicConfig가 단계별 로그 파일을 다시 설정할 수 있도록 함)
+    """
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+
+
+class _ErrorCounter(logging.Filter):
+    """
+    루트 로거에 기록되는 ERROR 이상 로그를 세는 필터
+    (단계 main()은 예외를 잡아 logging.error로 남기고 끝나므로, 실행기는 이 기록으로 단계 실패를 판단)
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.first_message = None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            self.count += 1
+            if self.first_message is None:
+                self.first_message = record.getMessage()
+        return True
+
+
+def execute_step(step_number: int) -> float:
+    """
+    현재 프로세스에서 단계 스크립트를 로드하고 진입 함수를 실행한 뒤 소요 시간(초)을 반환
+    0단계는 모듈 수준 코드가 곧 단계 본문이므로 로드만으로 실행됨
+    단계가 ERROR 로그를 남기면 (예외를 단계 안에서 잡았더라도) RuntimeError 발생
+    """
+    script_path = step_script_path(step_number)
+    if not os.path.exists(script_path):
+        raise FileNotFoundError(f"해당 단계의 파일이 존재하지 않습니다: {script_path}")
+
+    reset_logging()
+    os.chdir(SCRIPT_DIR)
+
+    # 핸들러 대신 필터로 세어야 단계의 logging.basicConfig가 로그 파일 핸들러를 그대로 설정함
+    errors = _ErrorCounter()
+    root_logger = logging.getLogger()
+    root_logger.addFilter(errors)
+    start = time.perf_counter()
+    try:
+        spec = importlib.util.spec_from_file_location(f"사전원가_{step_number}단계", script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        entry = getattr(module, ENTRY_FUNCTIONS.get(step_number, "main"), None)
+        if entry is not None:
+            entry()
+    finally:
+        root_logger.removeFilter(errors)
+    if errors.count:
+        raise RuntimeError(f"오류 로그 {errors.count}건 기록: {errors.first_message}")
+    return time.perf_counter() - start
+
+
+def step_event(event_type: str, step_number: int, **fields) -> Dict:
+    """
+    단계 진행 이벤트 생성 (step_started / step_finished / step_failed)
+    """
+    return {"type": event_type, "step": step_number, "time": datetime.now().isoformat(timespec="seconds"), **fields}
+
+
+def run_steps(
+    step_numbers: List[int],
+    persist_all: bool = True,
+    persist_files: Iterable[str] = (),
+    events=None,
+    run_id: Optional[str] = None,
+) -> List[Dict]:
+    """
+    주어진 단계들을 한 프로세스 안에서 순서대로 실행하고 단계별 소요 시간을 반환
+    단계 사이의 중간 데이터는 frame_store를 통해 메모리로 전달하며,
+    persist_all이 False이면 브랜치 경계 파일과 persist_files만 CSV로 저장
+    events(큐)가 주어지면 단계 시작/완료/실패 이벤트를 넣음
+    단계별 계측 결과(시간, 메모리, 입출력 행 수)는 run_id로 묶어 step_metrics.METRICS_FILE에 기록
+    """
+    run_id = run_id or uuid.uuid4().hex
+    timings = []
+    frame_store.activate()
+    try:
+        for step_number in step_numbers:
+            if events is not None:
+                events.put(step_event("step_started", step_number))
+            step_metrics.start_step(step_number, run_id)
+            try:
+                elapsed = execute_step(step_number)
+            except Exception as e:
+                step_metrics.finish_step(error=str(e))
+                if events is not None:
+                    events.put(step_event("step_failed", step_number, error=str(e)))
+                if isinstance(e, FileNotFoundError):
+                    raise
+                raise RuntimeError(f"{step_number}단계 실행 오류: {e}") from e
+            step_metrics.finish_step()
+            timings.append({"step": step_number, "seconds": round(elapsed, 3)})
+            if events is not None:
+                events.put(step_event("step_finished", step_number, seconds=round(elapsed, 3)))
+        frame_store.log_memory_report()
+        frame_store.flush(persist_all=persist_all, persist_files=tuple(persist_files))
+    finally:
+        frame_store.deactivate()
+        reset_logging()
+        os.chdir(SCRIPT_DIR)
+    return timings
+
+
+def run_in_worker(step_numbers: List[int], persist_all: bool = True, run_id: Optional[str] = None) -> List[Dict]:
+    """
+    단일 작업 프로세스를 띄워 단계들을 실행
+    (인터프리터 기동 및 pandas/numpy 임포트 비용은 실행 1회당 한 번만 발생)
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run_steps, list(step_numbers), persist_all, (), None, run_id).result()
+
+
+def run_parallel(
+    step_numbers: Iterable[int],
+    persist_all: bool = True,
+    max_workers: Optional[int] = None,
+    on_event: Optional[Callable[[Dict], None]] = None,
+    run_id: Optional[str] = None,
+) -> List[Dict]:
+    """
+    단계별 입출력 선언(INPUT_FILES / OUTPUT_FILES)으로 의존 관계를 만들어,
+    서로 의존하지 않는 세그먼트(액상/추출액, 원두, 조제 브랜치 등)를 여러 작업 프로세스에서 동시에 실행
+    세그먼트 안의 단계는 메모리로 데이터를 넘기고, 다른 세그먼트가 읽는 파일만 세그먼트 종료 시 저장
+    on_event가 주어지면 작업 프로세스의 단계 진행 이벤트를 호출한 스레드에서 전달
+    """
+    run_id = run_id or uuid.uuid4().hex
+    if on_event is None:
+        return _run_plan(step_numbers, persist_all, max_workers, None, None, run_id)
+
+    with multiprocessing.Manager() as manager:
+        return _run_plan(step_numbers, persist_all, max_workers, manager.Queue(), on_event, run_id)
+
+
+def _drain_events(events, on_event) -> None:
+    while True:
+        try:
+            event = events.get_nowait()
+        except queue.Empty:
+            return
+        on_event(event)
+
+
+def _run_plan(step_numbers, persist_all, max_workers, events, on_event, run_id) -> List[Dict]:
+    plan = step_graph.StepPlan(list(step_numbers), step_script_path)
+    for line in plan.describe():
+        logging.info(line)
+
+    workers = max(1, min(max_workers or MAX_WORKERS, len(plan.segments)))
+    timings = []
+    finished = set()
+    running = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit_ready():
+            for index, segment in enumerate(plan.segments):
+                if index in finished or index in running.values():
+                    continue
+                if plan.segment_dependencies[index] <= finished:
+                    future = executor.submit(run_steps, segment, persist_all, sorted(plan.boundary_files[index]), events, run_id)
+                    running[future] = index
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, timeout=EVENT_POLL_SECONDS if events is not None else None, return_when=FIRST_COMPLETED)
+            if events is not None:
+                _drain_events(events, on_event)
+            for future in done:
+                index = running.pop(future)
+                try:
+                    timings.extend(future.result())
+                except Exception:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    if events is not None:
+                        _drain_events(events, on_event)
+                    raise
+                finished.add(index)
+            submit_ready()
+
+    return sorted(timings, key=lambda t: t["step"])
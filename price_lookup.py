@@ -0,0 +1,37 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+# ✅ 같은 품번이 여러 번 나올 때 사용할 값 (first: 첫 번째, last: 마지막, error: 오류 발생)
+DUPLICATE_POLICIES = ("first", "last", "error")
+
+
+def build_price_map(cost_df, key_column='품번', price_column='원가', duplicates='first'):
+    """
+    품번 → 원가 조회용 해시 맵(Series) 생성 (한 번만 생성해서 재사용)
+    품번이 비어 있는 행은 어떤 자재번호와도 일치하지 않으므로 제외
+    """
+    if duplicates not in DUPLICATE_POLICIES:
+        raise ValueError(f"지원하지 않는 중복 처리 방식입니다: {duplicates} (가능한 값: {', '.join(DUPLICATE_POLICIES)})")
+
+    prices = cost_df[[key_column, price_column]].dropna(subset=[key_column])
+    duplicated = prices[key_column].duplicated(keep=False)
+    if duplicated.any():
+        duplicated_keys = prices.loc[duplicated, key_column].unique()
+        if duplicates == "error":
+            raise ValueError(f"{key_column} 중복 {len(duplicated_keys)}건: {list(duplicated_keys)[:10]}")
+        logging.info(f"{key_column} 중복 {len(duplicated_keys)}건은 '{duplicates}' 기준으로 {price_column}을 사용합니다.")
+        prices = prices.drop_duplicates(subset=[key_column], keep=duplicates)
+
+    return pd.Series(prices[price_column].to_numpy(), index=prices[key_column].to_numpy())
+
+
+def lookup_prices(keys, price_map, default):
+    """
+    자재번호별 원가 조회 (벡터 연산)
+    맵에 있는 자재번호는 원가(비어 있으면 NaN 그대로), 없는 자재번호는 default 값 사용
+    """
+    found = keys.isin(price_map.index).to_numpy()
+    prices = np.where(found, keys.map(price_map).to_numpy(dtype=object), default.to_numpy(dtype=object))
+    return pd.Series(prices, index=keys.index).infer_objects()
@@ -0,0 +1,142 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+import material_class
+
+# ✅ 제품군별 포장 구분 (원두: 드립백/커피백/캡슐 포장 제품, 조제: 미세)
+PACK_TYPES = {
+    '원두': ['드립백', '커피백', '캡슐'],
+    '조제': ['미세'],
+}
+
+# ✅ 공정비용 단가를 그대로 쓰는 공정흐름차수명
+LABOR_FLOWS = ['노무비', '제조경비']
+
+
+def _column(df, name):
+    """
+    열 값 (열이 없으면 경고 후 NaN, 기존 행 단위 계산의 KeyError 처리와 같은 결과)
+    """
+    if name in df.columns:
+        return df[name]
+    logging.warning(f"필드 누락: '{name}'")
+    return pd.Series(np.nan, index=df.index)
+
+
+def _truthy(series):
+    """
+    행마다 파이썬 bool(값)과 같은 결과 (NaN은 True, 0과 빈 문자열은 False)
+    """
+    return series.to_numpy(dtype=bool)
+
+
+def _masks(df, family):
+    """
+    제품군 원가 계산에 공통으로 쓰는 행 조건 (한 번씩만 계산)
+    """
+    semi_finished = material_class.is_semi_finished(df)
+    return {
+        'family': (df['품목대분류'] == family).to_numpy(),
+        'pack': df['구분'].isin(PACK_TYPES[family]).to_numpy(),
+        '원자재': (df['품목자산분류'] == '원자재').to_numpy(),
+        '부자재': (df['품목자산분류'] == '부자재').to_numpy(),
+        'labor': df['공정흐름차수명'].isin(LABOR_FLOWS).to_numpy(),
+        '제작': (df['조달구분'] == '제작').to_numpy(),
+        'raw_code': df['자재번호'].notna().to_numpy() & semi_finished,
+        'other_code': ~semi_finished,
+        'yield': _truthy(df['수율']),
+    }
+
+
+def _name_contains(df, text):
+    return df['자재명'].str.contains(text, regex=False, na=False).to_numpy()
+
+
+def _bean_branches(df, m):
+    """
+    원두 원가 분기 (위에서부터 처음 만족하는 분기의 값, 38단계 calculate_ondoo와 같은 순서)
+    """
+    family, pack, packed_count = m['family'], m['pack'], _truthy(df['입수'])
+    per_count = lambda values: values.where(packed_count, np.nan)
+    make = family & m['제작'] & pack & (df['BOM환산수량'] == 0).to_numpy()
+
+    branches = [
+        (family & m['부자재'] & pack, per_count(df['환산비용'] / df['입수'])),
+        (family & m['labor'] & pack, df['단가']),
+        (family & df['공정'].isin(['스티커', '재활용분담금']).to_numpy() & pack, df['단가']),
+    ]
+    for text in ['배전', '배/착', '분쇄', '분/착', '스틱']:
+        branches.append((make & _name_contains(df, text), per_count(_column(df, f'단가_{text}') * df['소요량분자'] / df['입수'])))
+    branches += [
+        (family & ~pack & m['원자재'] & m['raw_code'] & m['yield'], df['환산비용'] / df['수율']),
+        (family & ~pack & m['원자재'] & m['other_code'], df['환산비용']),
+        (family & (df['구분'] == '캡슐').to_numpy() & m['원자재'] & m['other_code'], df['환산비용'] / df['입수']),
+        (family & ~pack & m['부자재'], df['환산비용']),
+        (family & ~pack & df['공정'].isin(['스티커', '재활용분담금', '트레이더스']).to_numpy(), df['단가']),
+        (family & m['labor'] & ~pack, df['단가']),
+    ]
+    return branches
+
+
+def _blend_branches(df, m):
+    """
+    조제 원가 분기 (위에서부터 처음 만족하는 분기의 값, 55단계 calculate_ondoo와 같은 순서)
+    입수가 없거나 0이면 1로 나눔
+    """
+    family, pack = m['family'], m['pack']
+    count = df['입수'].where(df['입수'].notna() & (df['입수'] != 0), 1)
+    make = family & m['제작'] & pack & (df['BOM환산수량'] != 0).to_numpy()
+
+    return [
+        (family & m['부자재'], df['환산비용'] / count),
+        (family & m['labor'] & pack, df['단가']),
+        (family & df['공정'].isin(['스티커', '재활용분담금']).to_numpy() & pack, df['단가']),
+        (make & _name_contains(df, '미세'), _column(df, '단가_미세') * df['BOM환산수량'] / count),
+        (make & _name_contains(df, '배전'), df['단가_배전'] * df['BOM환산수량'] / count),
+        (family & ~pack & m['원자재'] & m['raw_code'] & m['yield'], df['환산비용'] / df['수율']),
+        (family & ~pack & m['원자재'] & m['other_code'], df['환산비용'] / count),
+        (family & pack & m['원자재'] & m['other_code'], df['환산비용'] / count),
+        (family & ~pack & m['부자재'], df['환산비용']),
+        (family & ~pack & df['공정'].isin(['스티커', '재활용분담금']).to_numpy(), df['단가']),
+        (family & m['labor'] & ~pack, df['단가']),
+        ((df['구분'] == '선물세트').to_numpy()
+         & (df['품목자산분류'].astype(str).str.strip() == '0').to_numpy()
+         & (_column(df, '품목소분류') == '아워티(조제_NB)').to_numpy(),
+         _column(df, '단가_스틱') * df['소요량분자']),
+    ]
+
+
+# ✅ 제품군별 원가 분기
+BRANCHES = {
+    '원두': _bean_branches,
+    '조제': _blend_branches,
+}
+
+
+def family_cost(df, family):
+    """
+    제품군 원가 (38단계 '원두', 55단계 '조제' 열): 분기 조건을 한 번에 계산한 뒤 np.select로 선택
+    어떤 분기에도 해당하지 않으면 NaN
+    """
+    branches = BRANCHES[family](df, _masks(df, family))
+    conditions = [condition for condition, _ in branches]
+    values = [np.asarray(value, dtype=float) for _, value in branches]
+    return pd.Series(np.select(conditions, values, default=np.nan), index=df.index)
+
+
+def add_family_cost(df, family):
+    df[family] = family_cost(df, family)
+    return df
+
+
+def add_family_totals(df, family):
+    """
+    '{제품군}_loss' = 원가 × loss율, '사전원가_{제품군}' = 원가 + loss
+    (품목대분류가 제품군이고 구분 값이 있는 행만, 나머지는 NaN)
+    """
+    rows = (df['품목대분류'] == family).to_numpy() & _truthy(df['구분'])
+    df[f'{family}_loss'] = (df[family] * df['loss율']).where(rows)
+    df[f'사전원가_{family}'] = (df[family] + df[f'{family}_loss']).where(rows)
+    return df
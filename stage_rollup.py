@@ -0,0 +1,25 @@
+import pandas as pd
+
+
+def product_totals(bom_df, value_columns, group_column='품번'):
+    """
+    품번별 비용 합계 (품번 → 합계 해시 맵, 품번이 비어 있는 행은 제외)
+    전체 BOM을 복사하지 않고 합산할 열만 사용
+    """
+    return bom_df[list(value_columns)].groupby(bom_df[group_column]).sum()
+
+
+def rollup(bom_df, columns, key_column='자재번호', group_column='품번'):
+    """
+    공정 비용 롤업: 품번별로 합산한 비용을 같은 값의 자재번호 행에 채움
+    (반제품 자재의 단가 = 그 반제품 BOM의 비용 합계)
+    columns는 {합산할 열: 결과 열} 형태이며, 결과 열을 bom_df에 직접 추가/갱신
+    일치하는 품번이 없는 행은 NaN (모든 행이 일치하면 원래 열 타입 유지)
+    """
+    totals = product_totals(bom_df, columns.keys(), group_column)
+    positions = totals.index.get_indexer(bom_df[key_column])
+
+    for value_column, output_column in columns.items():
+        values = pd.api.extensions.take(totals[value_column].to_numpy(), positions, allow_fill=True)
+        bom_df[output_column] = pd.Series(values, index=bom_df.index)
+    return bom_df
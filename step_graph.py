@@ -0,0 +1,158 @@
+import ast
+import os
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# ✅ 각 단계 스크립트가 모듈 수준에서 선언하는 입출력 파일 목록 변수 이름
+INPUT_VARIABLE = "INPUT_FILES"
+OUTPUT_VARIABLE = "OUTPUT_FILES"
+
+
+def read_declarations(script_path: str) -> Optional[Tuple[List[str], List[str]]]:
+    """
+    단계 스크립트를 실행하지 않고 INPUT_FILES / OUTPUT_FILES 선언만 읽어서 반환
+    선언이 없으면 None (이 경우 해당 단계는 앞뒤 모든 단계와 순서를 지킴)
+    """
+    if not os.path.exists(script_path):
+        raise FileNotFoundError(f"해당 단계의 파일이 존재하지 않습니다: {script_path}")
+
+    with open(script_path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=script_path)
+
+    declared = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if name in (INPUT_VARIABLE, OUTPUT_VARIABLE):
+                declared[name] = list(ast.literal_eval(node.value))
+
+    if INPUT_VARIABLE not in declared or OUTPUT_VARIABLE not in declared:
+        return None
+    return declared[INPUT_VARIABLE], declared[OUTPUT_VARIABLE]
+
+
+def build_dependencies(step_numbers: List[int], declarations: Dict[int, Optional[Tuple[List[str], List[str]]]]) -> Dict[int, Set[int]]:
+    """
+    단계 번호 순서와 입출력 선언으로 의존 관계 생성 (단계 → 먼저 끝나야 하는 단계 집합)
+    - 읽는 파일을 마지막으로 쓴 단계 (쓰기 후 읽기)
+    - 같은 파일을 마지막으로 쓴 단계 (쓰기 후 쓰기)
+    - 마지막 쓰기 이후 그 파일을 읽은 단계 (읽기 후 쓰기)
+    선언이 없는 단계는 앞의 모든 단계 뒤에, 뒤의 모든 단계 앞에 실행
+    """
+    dependencies = {}
+    last_writer = {}   # 파일 → 마지막으로 쓴 단계
+    readers = {}       # 파일 → 마지막 쓰기 이후 읽은 단계들
+    barrier = None     # 마지막으로 나온 선언 없는 단계
+
+    for index, step_number in enumerate(step_numbers):
+        declaration = declarations[step_number]
+        if declaration is None:
+            dependencies[step_number] = set(step_numbers[:index])
+            barrier = step_number
+            continue
+
+        inputs, outputs = declaration
+        deps = set() if barrier is None else {barrier}
+        for file_name in inputs:
+            if file_name in last_writer:
+                deps.add(last_writer[file_name])
+        for file_name in outputs:
+            if file_name in last_writer:
+                deps.add(last_writer[file_name])
+            deps.update(readers.get(file_name, ()))
+        deps.discard(step_number)
+        dependencies[step_number] = deps
+
+        for file_name in inputs:
+            readers.setdefault(file_name, set()).add(step_number)
+        for file_name in outputs:
+            last_writer[file_name] = step_number
+            readers[file_name] = set()
+
+    return dependencies
+
+
+def plan_segments(step_numbers: List[int], dependencies: Dict[int, Set[int]]) -> List[List[int]]:
+    """
+    의존 관계 그래프의 일직선 구간을 하나의 세그먼트로 묶음
+    앞 단계의 유일한 후속 단계이고 그 앞 단계에만 의존하는 단계는 같은 세그먼트에 이어 붙이고,
+    갈라지거나 합쳐지는 지점에서는 새 세그먼트를 시작
+    (세그먼트 하나는 한 프로세스에서 메모리로 데이터를 넘기며 순서대로 실행)
+    """
+    dependents = {step_number: set() for step_number in step_numbers}
+    for step_number, deps in dependencies.items():
+        for dep in deps:
+            dependents[dep].add(step_number)
+
+    segments = []
+    segment_of = {}
+    for step_number in step_numbers:
+        deps = dependencies[step_number]
+        if len(deps) == 1:
+            (dep,) = deps
+            segment = segments[segment_of[dep]]
+            if segment[-1] == dep and dependents[dep] == {step_number}:
+                segment.append(step_number)
+                segment_of[step_number] = segment_of[dep]
+                continue
+        segment_of[step_number] = len(segments)
+        segments.append([step_number])
+    return segments
+
+
+def segment_dependencies(segments: List[List[int]], dependencies: Dict[int, Set[int]]) -> List[Set[int]]:
+    """
+    세그먼트별로 먼저 끝나야 하는 세그먼트 번호 집합
+    """
+    segment_of = {step_number: index for index, segment in enumerate(segments) for step_number in segment}
+    result = []
+    for index, segment in enumerate(segments):
+        deps = {segment_of[dep] for step_number in segment for dep in dependencies[step_number]}
+        deps.discard(index)
+        result.append(deps)
+    return result
+
+
+def boundary_files(segments: List[List[int]], declarations: Dict[int, Optional[Tuple[List[str], List[str]]]]) -> List[Set[str]]:
+    """
+    세그먼트별로 다른 세그먼트가 읽는 출력 파일 목록 (세그먼트 종료 시 디스크에 저장해야 하는 파일)
+    선언이 없는 단계가 있으면 모든 파일을 저장하도록 '*' 반환
+    """
+    segment_of = {step_number: index for index, segment in enumerate(segments) for step_number in segment}
+    result = [set() for _ in segments]
+    for writer, writer_declaration in declarations.items():
+        if writer_declaration is None:
+            result[segment_of[writer]].add("*")
+            continue
+        for reader, reader_declaration in declarations.items():
+            if segment_of[reader] == segment_of[writer]:
+                continue
+            if reader_declaration is None:
+                result[segment_of[writer]].add("*")
+                continue
+            result[segment_of[writer]].update(set(writer_declaration[1]) & set(reader_declaration[0]))
+    return result
+
+
+class StepPlan:
+    """
+    단계 실행 계획 (세그먼트, 세그먼트 간 의존 관계, 세그먼트별 경계 파일)
+    """
+
+    def __init__(self, step_numbers: List[int], script_path: Callable[[int], str]):
+        self.step_numbers = list(step_numbers)
+        self.declarations = {n: read_declarations(script_path(n)) for n in self.step_numbers}
+        self.dependencies = build_dependencies(self.step_numbers, self.declarations)
+        self.segments = plan_segments(self.step_numbers, self.dependencies)
+        self.segment_dependencies = segment_dependencies(self.segments, self.dependencies)
+        self.boundary_files = boundary_files(self.segments, self.declarations)
+
+    def describe(self) -> List[str]:
+        """
+        로그 출력용 세그먼트 설명
+        """
+        lines = []
+        for index, segment in enumerate(self.segments):
+            steps = ", ".join(str(step_number) for step_number in segment)
+            after = ", ".join(str(dep) for dep in sorted(self.segment_dependencies[index])) or "-"
+            lines.append(f"세그먼트 {index}: {steps}단계 ({len(segment)}개, 선행 세그먼트: {after})")
+        return lines
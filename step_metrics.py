@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # psutil이 없으면 /proc 또는 resource 정보만 사용
+    psutil = None
+
+# ✅ 단계별 계측 결과 파일 (JSON lines, 단계 스크립트의 log_*.log 파일과 같은 위치)
+METRICS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "log_metrics.jsonl")
+
+# ✅ /metrics 요약에 표시할 오래 걸린 단계 수
+SLOWEST_STEP_COUNT = 10
+
+_current = None   # 현재 실행 중인 단계의 계측 정보
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _reset_peak_rss() -> None:
+    """
+    리눅스에서는 프로세스 최대 메모리(VmHWM)를 현재 값으로 초기화해 단계별 최대값을 측정
+    (다른 OS에서는 프로세스 시작 이후 최대값)
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            match = re.search(r"VmHWM:\s+(\d+) kB", f.read())
+        if match:
+            return int(match.group(1)) * 1024
+    except OSError:
+        pass
+    if psutil is not None:
+        memory = psutil.Process().memory_info()
+        return getattr(memory, "peak_wset", memory.rss)
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _file_size(path) -> Optional[int]:
+    return os.path.getsize(path) if path and os.path.exists(path) else None
+
+
+def start_step(step_number: int, run_id: str) -> None:
+    """
+    단계 계측 시작 (벽시계 시간, CPU 시간, 최대 메모리, 입출력 기록 초기화)
+    """
+    global _current
+    _reset_peak_rss()
+    _current = {
+        "run_id": run_id,
+        "step": step_number,
+        "pid": os.getpid(),
+        "started_at": _now(),
+        "inputs": [],
+        "outputs": [],
+        "_wall": time.perf_counter(),
+        "_cpu": time.process_time(),
+    }
+
+
+def record_read(path, df, source_path=None) -> None:
+    """
+    단계가 읽은 파일 기록 (source_path: 디스크에서 읽었으면 실제 파일 경로, 메모리에서 읽었으면 None)
+    """
+    if _current is not None:
+        _current["inputs"].append(_frame_info(path, df, source_path))
+
+
+def record_write(path, df, written_path=None) -> None:
+    """
+    단계가 저장한 파일 기록 (written_path: 디스크에 바로 저장했으면 실제 파일 경로)
+    """
+    if _current is not None:
+        _current["outputs"].append(_frame_info(path, df, written_path))
+
+
+def _frame_info(path, df, disk_path) -> Dict:
+    return {
+        "file": os.path.basename(path),
+        "rows": int(len(df)),
+        "columns": int(len(df.columns)),
+        "file_bytes": _file_size(disk_path),
+        "memory_bytes": int(df.memory_usage(index=False).sum()),
+        "source": "disk" if disk_path else "memory",
+    }
+
+
+def finish_step(error: Optional[str] = None) -> Optional[Dict]:
+    """
+    단계 계측 종료 후 결과를 METRICS_FILE에 한 줄(JSON)로 추가하고 반환
+    """
+    global _current
+    if _current is None:
+        return None
+
+    record = {key: value for key, value in _current.items() if not key.startswith("_")}
+    record["wall_seconds"] = round(time.perf_counter() - _current["_wall"], 3)
+    record["cpu_seconds"] = round(time.process_time() - _current["_cpu"], 3)
+    peak = _peak_rss_bytes()
+    record["peak_rss_mb"] = round(peak / 1024 / 1024, 1) if peak is not None else None
+    record["rows_in"] = sum(item["rows"] for item in record["inputs"])
+    record["rows_out"] = sum(item["rows"] for item in record["outputs"])
+    record["status"] = "failed" if error else "completed"
+    record["error"] = error
+    _current = None
+
+    try:
+        with open(METRICS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        logging.error(f"계측 결과 저장 실패: {e}")
+    return record
+
+
+def read_metrics(run_id: Optional[str] = None) -> List[Dict]:
+    """
+    METRICS_FILE에서 실행 하나의 단계별 계측 결과를 읽어 단계 번호 순으로 반환
+    run_id가 없으면 가장 최근 실행
+    """
+    if not os.path.exists(METRICS_FILE):
+        return []
+
+    records = []
+    with open(METRICS_FILE, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    if not records:
+        return []
+
+    if run_id is None:
+        run_id = records[-1]["run_id"]
+    return sorted((r for r in records if r["run_id"] == run_id), key=lambda r: r["step"])
+
+
+def summarize(records: List[Dict]) -> Dict:
+    """
+    실행 하나의 계측 요약 (합계 및 오래 걸린 단계 순위)
+    """
+    slowest = sorted(records, key=lambda r: r["wall_seconds"], reverse=True)[:SLOWEST_STEP_COUNT]
+    peaks = [r["peak_rss_mb"] for r in records if r["peak_rss_mb"] is not None]
+    return {
+        "steps": len(records),
+        "failed_steps": [r["step"] for r in records if r["status"] == "failed"],
+        "wall_seconds": round(sum(r["wall_seconds"] for r in records), 3),
+        "cpu_seconds": round(sum(r["cpu_seconds"] for r in records), 3),
+        "peak_rss_mb": max(peaks) if peaks else None,
+        "slowest_steps": [
+            {"step": r["step"], "wall_seconds": r["wall_seconds"], "cpu_seconds": r["cpu_seconds"], "rows_in": r["rows_in"], "rows_out": r["rows_out"]}
+            for r in slowest
+        ],
+    }
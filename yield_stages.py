@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+
+import material_class
+
+# ✅ 노무비/제조경비 행 (공정비용에 단가를 그대로 사용)
+LABOR_FLOWS = ['노무비', '제조경비']
+
+# ✅ 포장재 공정 (배전비용 = 단가 + loss율)
+PACKAGING_PROCESSES = ['비닐', '박스(30kg)']
+
+
+# 행 조건 -------------------------------------------------------------------------------------------
+
+def process_is(*processes):
+    return lambda df: df['공정'].isin(processes)
+
+
+def name_contains(text, **kwargs):
+    return lambda df: df['품명'].str.contains(text, **kwargs)
+
+
+def labor_of(rows):
+    return lambda df: rows(df) & df['공정흐름차수명'].isin(LABOR_FLOWS)
+
+
+def all_of(*conditions):
+    def condition(df):
+        mask = conditions[0](df)
+        for other in conditions[1:]:
+            mask = mask & other(df)
+        return mask
+    return condition
+
+
+def column_equals(column, value):
+    return lambda df: df[column] == value
+
+
+def column_in(column, values):
+    return lambda df: df[column].isin(values)
+
+
+def raw_material_code(matches=True):
+    def condition(df):
+        matched = material_class.is_semi_finished(df)
+        return matched if matches else ~matched
+    return condition
+
+
+# ✅ 공정 단계 정의: 단계 이름 → 수율/loss율을 계산하는 행 조건
+STAGES = {
+    '배전': process_is('배전'),
+    '분쇄': process_is('분쇄'),
+    '분/착': process_is('분/착'),
+    '미세': process_is('미세'),
+    '스틱': name_contains('스틱-', na=False),
+}
+
+
+def yield_column(stage):
+    return f'수율_{stage}'
+
+
+def loss_column(stage):
+    return f'loss율_{stage}'
+
+
+def cost_column(stage):
+    return f'{stage}비용'
+
+
+def add_yield_columns(df, stage, fill_value=0):
+    """
+    단계 행의 '수율_X' = 환산비용 / 수율, 'loss율_X' = 수율_X × loss율 을 한 번에 계산
+    단계가 아닌 행이나 수율이 없거나 0인 행은 fill_value (None이면 결측값 그대로)
+    """
+    rows = STAGES[stage](df).to_numpy(dtype=bool)
+
+    yields = (df['환산비용'] / df['수율'].replace(0, np.nan)).where(rows)
+    if fill_value is not None:
+        yields = yields.fillna(fill_value).astype(float)
+    df[yield_column(stage)] = yields
+
+    losses = (yields * df['loss율']).where(rows)
+    if fill_value is not None:
+        losses = losses.fillna(fill_value).astype(float)
+    df[loss_column(stage)] = losses
+    return df
+
+
+def prepare_cost_frame(df, stage):
+    """
+    공정비용 계산 전 공통 처리 (결측값 0, 품번 문자열, 수율/loss율/단가 실수, 공정비용 0으로 초기화)
+    """
+    df.fillna(0, inplace=True)
+    df['품번'] = df['품번'].astype(str)
+    df[yield_column(stage)] = df[yield_column(stage)].astype(float)
+    df[loss_column(stage)] = df[loss_column(stage)].astype(float)
+    df['단가'] = df['단가'].astype(float)
+    df[cost_column(stage)] = 0.0
+    return df
+
+
+def apply_rules(df, rules):
+    """
+    (행 조건, {열: 값 계산식}) 규칙을 순서대로 적용 (뒤의 규칙이 앞의 값을 덮어씀)
+    행 조건이 None이면 모든 행, 같은 규칙 안의 계산식은 앞에서 갱신한 열 값을 사용
+    """
+    for condition, updates in rules:
+        mask = None if condition is None else condition(df)
+        for column, value in updates.items():
+            if mask is None:
+                df[column] = value(df)
+            else:
+                df.loc[mask, column] = value(df)
+    return df
+
+
+# 값 계산식 -----------------------------------------------------------------------------------------
+
+def column(name):
+    return lambda df: df[name]
+
+
+def stage_total(stage):
+    """
+    수율_X + loss율_X
+    """
+    return lambda df: df[yield_column(stage)] + df[loss_column(stage)]
+
+
+def stage_loss(stage):
+    """
+    수율_X × loss율
+    """
+    return lambda df: df[yield_column(stage)] * df['loss율']
+
+
+def recalculate(stage, yield_value):
+    """
+    수율_X를 yield_value로 바꾸고 loss율_X와 공정비용을 다시 계산하는 갱신 목록
+    """
+    return {
+        yield_column(stage): yield_value,
+        loss_column(stage): stage_loss(stage),
+        cost_column(stage): stage_total(stage),
+    }
+
+
+def stick_yield(df):
+    """
+    스틱 행의 수율: 자재명에 '분/착'이 있고 단가_분/착이 있으면 단가_분/착 × 소요량분자,
+    자재명에 '배전'이 있고 단가_분/착이 없으면 단가_배전 × 소요량분자, 그 외 0
+    """
+    with_flavor = df['자재명'].str.contains('분/착') & (df['단가_분/착'] != 0)
+    roasted = df['자재명'].str.contains('배전') & (df['단가_분/착'] == 0)
+    values = np.where(
+        with_flavor,
+        df['단가_분/착'] * df['소요량분자'],
+        np.where(roasted, df['단가_배전'] * df['소요량분자'], 0),
+    )
+    return pd.Series(values, index=df.index)
+
+
+# ✅ 브랜치/단계별 공정비용 계산 규칙 (기존 단계 스크립트의 .loc 갱신 순서와 동일)
+COST_RULES = {
+    ('액상,추출액', '배전'): [
+        (STAGES['배전'], {'배전비용': stage_total('배전')}),
+        (process_is(*PACKAGING_PROCESSES), {'배전비용': lambda df: df['단가'] + df['loss율_배전']}),
+        (labor_of(process_is('배전')), {'배전비용': column('단가')}),
+    ],
+    ('액상,추출액', '분쇄'): [
+        (STAGES['분쇄'], {'분쇄비용': stage_total('분쇄')}),
+        (labor_of(process_is('분쇄', '해포')), {'분쇄비용': column('단가')}),
+    ],
+    ('원두', '분쇄'): [
+        (STAGES['분쇄'], {'분쇄비용': stage_total('분쇄')}),
+        (labor_of(process_is('분쇄', '해포', '포장')), {'분쇄비용': column('단가')}),
+    ],
+    ('원두', '분/착'): [
+        (all_of(name_contains('분/착'), column_equals('품목자산분류', '원자재'), raw_material_code(False)),
+         {'수율_분/착': column('환산비용'),
+          'loss율_분/착': lambda df: df['환산비용'] * df['loss율'],
+          '분/착비용': stage_total('분/착')}),
+        (all_of(name_contains('분/착'), column_equals('품목자산분류', '원자재'), raw_material_code(True)),
+         {'분/착비용': stage_total('분/착')}),
+        (all_of(name_contains('분/착'), process_is(*PACKAGING_PROCESSES)), {'분/착비용': column('단가_배전')}),
+        (labor_of(process_is('분/착')), {'분/착비용': column('단가')}),
+        (labor_of(all_of(name_contains('분/착', na=False), process_is('배전'))), {'분/착비용': column('단가')}),
+    ],
+    ('원두', '스틱'): [
+        (name_contains('스틱-'), recalculate('스틱', stick_yield)),
+        (all_of(name_contains('스틱-'), column_equals('품목자산분류', '원자재')), recalculate('스틱', lambda df: 0)),
+        (all_of(name_contains('스틱-'), lambda df: ~df['품목자산분류'].isin(['원자재', '0'])), recalculate('스틱', column('환산비용'))),
+        (all_of(name_contains('스틱-'), column_equals('조달구분', '부재료비')), recalculate('스틱', column('단가'))),
+        (labor_of(name_contains('스틱-')), {'스틱비용': column('단가')}),
+    ],
+    ('조제', '미세'): [
+        (all_of(name_contains('미세'), column_equals('품목자산분류', '원자재'), raw_material_code(False)),
+         {'수율_미세': column('환산비용'),
+          'loss율_미세': lambda df: df['환산비용'] * df['loss율'],
+          '미세비용': stage_total('미세')}),
+        (all_of(name_contains('미세'), column_equals('품목자산분류', '원자재'), raw_material_code(True)),
+         {'미세비용': stage_total('미세')}),
+        (all_of(name_contains('미세'), process_is(*PACKAGING_PROCESSES)), {'미세비용': column('단가_배전')}),
+        (all_of(name_contains('미세'), column_in('품목자산분류', ['부자재'])), {'미세비용': stage_total('미세')}),
+        (process_is('재활용분담금', '스티커'), recalculate('미세', column('단가'))),
+        (labor_of(process_is('미세')), {'미세비용': column('단가')}),
+    ],
+    ('조제', '스틱'): [
+        (None, {'스틱비용': stage_total('스틱')}),
+        (all_of(name_contains('스틱-'), column_equals('조달구분', '부재료비')), recalculate('스틱', column('단가'))),
+        (labor_of(name_contains('스틱-')), {'스틱비용': column('단가')}),
+    ],
+}
+COST_RULES[('원두', '배전')] = COST_RULES[('액상,추출액', '배전')]
+COST_RULES[('조제', '배전')] = COST_RULES[('액상,추출액', '배전')]
+
+
+def add_stage_cost(df, branch, stage):
+    """
+    공정비용('X비용') 계산: 공통 처리 후 브랜치/단계별 규칙을 순서대로 적용
+    """
+    prepare_cost_frame(df, stage)
+    return apply_rules(df, COST_RULES[(branch, stage)])
@@ -0,0 +1,130 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+import frame_store
+
+# ✅ 수율 파일 (UPLOAD_DIR 기준)
+YIELD_FILE = '수율.csv'
+
+# ✅ 품번과 함께 조회 키로 쓰는 열: (품번, 구분), (품번, 대분류, 구분), (품번, 비고) 조합으로 조회
+CONDITION_COLUMNS = ['구분', '대분류', '비고']
+
+# ✅ 같은 조건에서 품번이 여러 번 나올 때 사용할 행
+#    first: 첫 번째 (drop_duplicates(keep='first')와 같음), last: 마지막 (set_index(...).to_dict()와 같음), error: 오류 발생
+DUPLICATE_POLICIES = ("first", "last", "error")
+
+_tables = {}   # 파일 경로 → (파일 상태, YieldTable)
+
+
+def _values(value):
+    return tuple(value) if isinstance(value, (list, tuple, set)) else (value,)
+
+
+class YieldTable:
+    """
+    수율.csv 조회 (한 번 읽어 둔 표에서 조건별 품번 인덱스를 만들어 재사용)
+    조건은 CONDITION_COLUMNS 열 이름을 키워드로 지정 (값 또는 값 목록, 예: 구분='부자재', 대분류=['액상', '추출액'])
+    """
+
+    def __init__(self, yield_df):
+        self.df = yield_df.reset_index(drop=True)
+        self._masks = {}     # (열, 값 목록) → 행 조건 bool 배열
+        self._indexes = {}   # (중복 처리, 조건) → (품번 Index, 행 위치)
+
+    def rows(self, **conditions):
+        """
+        조건을 모두 만족하는 행 위치 (원래 행 순서)
+        """
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, value in conditions.items():
+            if column not in CONDITION_COLUMNS:
+                raise KeyError(f"지원하지 않는 수율 조회 조건입니다: {column} (가능한 조건: {', '.join(CONDITION_COLUMNS)})")
+            key = (column, _values(value))
+            if key not in self._masks:
+                self._masks[key] = self.df[column].isin(key[1]).to_numpy()
+            mask &= self._masks[key]
+        return np.flatnonzero(mask)
+
+    def _index(self, duplicates, conditions):
+        """
+        조건에 맞는 행의 품번 인덱스 (중복 품번은 duplicates 기준 한 행만)
+        품번이 비어 있는 행도 키로 남김 (기존 to_dict + map / pd.merge와 같이 품번이 비어 있는 BOM 행과 일치)
+        """
+        if duplicates not in DUPLICATE_POLICIES:
+            raise ValueError(f"지원하지 않는 중복 처리 방식입니다: {duplicates} (가능한 값: {', '.join(DUPLICATE_POLICIES)})")
+
+        key = (duplicates, tuple((column, _values(value)) for column, value in conditions.items()))
+        if key not in self._indexes:
+            positions = self.rows(**conditions)
+            keys = pd.Series(self.df['품번'].to_numpy(dtype=object)[positions], dtype=object)
+
+            duplicated = keys.duplicated(keep=False).to_numpy()
+            if duplicated.any():
+                duplicated_keys = keys[duplicated].unique()
+                described = ', '.join(f"{column}={value}" for column, value in conditions.items()) or '전체'
+                if duplicates == "error":
+                    raise ValueError(f"수율 ({described}) 품번 중복 {len(duplicated_keys)}건: {list(duplicated_keys)[:10]}")
+                logging.warning(f"수율 ({described}) 품번 중복 {len(duplicated_keys)}건은 '{duplicates}' 기준 값을 사용합니다.")
+                keep = ~keys.duplicated(keep=duplicates).to_numpy()
+                positions, keys = positions[keep], keys[keep]
+
+            self._indexes[key] = (pd.Index(keys.to_numpy(), dtype=object), positions)
+        return self._indexes[key]
+
+    def mapping(self, value_columns, duplicates="first", **conditions):
+        """
+        품번 → 값 (value_columns가 열 이름이면 Series, 열 목록이면 DataFrame)
+        """
+        index, positions = self._index(duplicates, conditions)
+        values = self.df[value_columns].iloc[positions]
+        values.index = index
+        return values
+
+    def lookup(self, keys, value_columns, duplicates="first", **conditions):
+        """
+        keys(품번 열)의 값을 한 번에 조회 (keys와 같은 index, 없는 품번은 NaN)
+        value_columns가 열 이름이면 Series, 열 목록이면 DataFrame
+        """
+        index, positions = self._index(duplicates, conditions)
+        found = index.get_indexer(keys)
+        rows = np.where(found >= 0, positions[np.maximum(found, 0)] if len(positions) else -1, -1)
+
+        def take(column):
+            return pd.Series(pd.api.extensions.take(self.df[column].to_numpy(), rows, allow_fill=True), index=keys.index, name=column)
+
+        if isinstance(value_columns, str):
+            return take(value_columns)
+        return pd.concat([take(column) for column in value_columns], axis=1)
+
+    def join(self, df, value_columns, **conditions):
+        """
+        df에 조건에 맞는 수율 행의 value_columns를 품번 기준으로 left join (pd.merge와 같은 결과)
+        같은 품번의 수율 행이 여러 개이면 df 행도 그만큼 반복
+        """
+        right = self.df[['품번', *value_columns]].iloc[self.rows(**conditions)]
+        return pd.merge(df, right, on='품번', how='left')
+
+
+def _file_state(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load(upload_dir):
+    """
+    수율 조회 객체 (프로세스 안에서 한 번만 읽고 조건별 인덱스를 재사용, 파일이 바뀌면 다시 읽음)
+    """
+    path = os.path.join(upload_dir, YIELD_FILE)
+    key = os.path.abspath(path)
+    state = _file_state(path)
+    cached = _tables.get(key)
+    if cached is None or cached[0] != state:
+        table = YieldTable(frame_store.read_csv(path, encoding='utf-8-sig', low_memory=False))
+        _tables[key] = (state, table)
+    return _tables[key][1]
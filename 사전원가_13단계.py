@@ -1,6 +1,6 @@
-import pandas as pd
 import os
 import logging
+import frame_store
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,6 +8,10 @@ os.chdir(script_dir)
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM_분쇄_액상,추출액.csv']
+OUTPUT_FILES = ['BOM_추출_액상,추출액.csv']
+
 # 로그 설정
 logging.basicConfig(filename="log_BOM_추출_액상,추출액.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -17,7 +21,7 @@ def main():
         bom_file = os.path.join(UPLOAD_DIR,'BOM_분쇄_액상,추출액.csv')
 
         # 파일 불러오기 (encoding='utf-8-sig')
-        bom_df = pd.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
+        bom_df = frame_store.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
         logging.info("BOM 파일을 성공적으로 불러왔습니다.")
 
         # 자재명 열의 데이터에서 공백 제거
@@ -57,7 +61,7 @@ def main():
 
         # 결과 저장
         output_file = os.path.join(UPLOAD_DIR,'BOM_추출_액상,추출액.csv')
-        bom_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        frame_store.to_csv(bom_df, output_file, index=False, encoding='utf-8-sig')
         print("BOM 원가 가공 완료 - BOM_가공.csv 파일 갱신 완료")
         logging.info("BOM 원가 가공 작업이 완료되었습니다.")
 
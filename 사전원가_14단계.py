@@ -1,6 +1,7 @@
 import pandas as pd
 import os
 import logging
+import frame_store
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,6 +9,10 @@ os.chdir(script_dir)
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM_추출_액상,추출액.csv', 'raw_사전원가.csv']
+OUTPUT_FILES = ['BOM_추출_액상,추출액.csv']
+
 # 로그 설정
 logging.basicConfig(filename="log_BOM_추출_액상,추출액.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -18,14 +23,10 @@ def main():
         routing_file = os.path.join(UPLOAD_DIR,'raw_사전원가.csv')
 
         # 파일 불러오기
-        bom_df = pd.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
-        routing_df = pd.read_csv(routing_file, encoding='utf-8-sig', low_memory=False)
+        bom_df = frame_store.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
+        routing_df = frame_store.read_csv(routing_file, encoding='utf-8-sig', low_memory=False)
         logging.info("BOM 및 Routing 파일을 성공적으로 불러왔습니다.")
 
-        # 데이터 타입 일치
-        bom_df['품번'] = bom_df['품번'].astype(str)
-        routing_df['품번'] = routing_df['품번'].astype(str)
-
         # 'raw_사전원가'에서 '원두투입'과 '추출량' 데이터 병합
         bom_df = pd.merge(bom_df, routing_df[['품번', '원두투입', '추출량']], on='품번', how='left')
         logging.info("품번 기준으로 '원두투입'과 '추출량' 데이터를 BOM에 병합 완료.")
@@ -61,7 +62,7 @@ def main():
         logging.info("'품목대분류'가 '추출액'인 경우, '공정흐름차수명'이 '노무비', '제조경비', '0'은 보존하며, 나머지 데이터에 중복 제거를 적용 완료.")
 
         # 결과 저장
-        bom_df.to_csv(bom_file, index=False, encoding='utf-8-sig')
+        frame_store.to_csv(bom_df, bom_file, index=False, encoding='utf-8-sig')
         print("BOM_추출_액상,추출액에 '원두투입', '추출량', 및 '추출비용' 데이터 추가 및 갱신 완료 - BOM_추출_액상,추출액.csv 파일 저장")
         logging.info("BOM 추출 파일 갱신 작업이 완료되었습니다.")
 
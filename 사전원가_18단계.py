@@ -1,7 +1,10 @@
 import pandas as pd
 import os
-import numpy as np
 import logging
+import frame_store
+import material_class
+import cost_rules
+import extraction_costing
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,132 +12,25 @@ os.chdir(script_dir)
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM_추출_액상,추출액.csv']
+OUTPUT_FILES = ['사전원가_액상,추출액.csv']
+
+# ✅ 배합원가 / loss율_포장 / 사전원가 규칙 실행 계획
+COST_RULES = cost_rules.compile_rules('액상,추출액')
+
 # 로그 설정
 logging.basicConfig(filename="log_BOM_사전원가_액상,추출액.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 def process_file(file_name):
     try:
         # 파일 불러오기
-        bom_df = pd.read_csv(file_name, encoding='utf-8-sig', low_memory=False)
+        bom_df = frame_store.read_csv(file_name, encoding='utf-8-sig', low_memory=False)
         logging.info(f"파일 '{file_name}'을 성공적으로 불러왔습니다.")
 
-        # 1) '자재번호'와 '품번'을 문자열 타입으로 변환하여 일관성 확보
-        bom_df['자재번호'] = bom_df['자재번호'].astype(str).str.strip()
-        bom_df['품번'] = bom_df['품번'].astype(str).str.strip()
-
-        # 2) '배합원가' 헤더 생성 및 '조달구분'이 '구매'이고, '5xAxxxxx' 형태를 제외한 값 처리
-        if '배합원가' not in bom_df.columns:
-            bom_df['배합원가'] = np.nan  # '배합원가' 헤더 생성
-        
-        # 정규식으로 '5xAxxxxx', '5xBxxxxx' 패턴 확인 및 조건 설정
-        구매_조건 = (bom_df['조달구분'] == '구매') & ~bom_df['자재번호'].str.match(r'5\d[A|B]\d{5}')
-
-        # '배합원가'에 값 채우기
-        bom_df.loc[구매_조건, '배합원가'] = bom_df.loc[구매_조건, '환산비용']
-
-        # 3) '조달구분'이 '제작'이고 '자재명'에 '추출-' 포함된 경우 처리
-        제작_조건 = (bom_df['조달구분'] == '제작') & bom_df['자재명'].str.contains('추출-', na=False)
-        천안_조건 = bom_df['단가_추출_천안'] != 0
-
-        # 천안 값을 사용하여 배합원가 계산
-        bom_df.loc[제작_조건 & 천안_조건, '배합원가'] = (
-            np.where(
-                bom_df.loc[제작_조건 & 천안_조건, 'BOM환산수량'] != 0,
-                bom_df.loc[제작_조건 & 천안_조건, '단가_추출_천안'] * bom_df.loc[제작_조건 & 천안_조건, 'BOM환산수량'],
-                bom_df.loc[제작_조건 & 천안_조건, '단가_추출_천안'] * bom_df.loc[제작_조건 & 천안_조건, '소요량분자']
-            )
-        )
-
-        # 외주 값을 사용하여 배합원가 계산
-        bom_df.loc[제작_조건 & ~천안_조건, '배합원가'] = (
-            np.where(
-                bom_df.loc[제작_조건 & ~천안_조건, 'BOM환산수량'] != 0,
-                bom_df.loc[제작_조건 & ~천안_조건, '단가_추출_외주'] * bom_df.loc[제작_조건 & ~천안_조건, 'BOM환산수량'],
-                bom_df.loc[제작_조건 & ~천안_조건, '단가_추출_외주'] * bom_df.loc[제작_조건 & ~천안_조건, '소요량분자']
-            )
-        )
-
-        # 4) '공정'이 '재활용분담금'인 경우 처리
-        재활용_조건 = (bom_df['공정'].isin(['재활용분담금','동판']))
-        bom_df.loc[재활용_조건, '배합원가'] = bom_df.loc[재활용_조건, '단가']
-
-        # 5) '공정흐름차수명'이 '노무비', '제조경비', '임가공비'인 경우 처리
-        흐름_조건 = bom_df['공정흐름차수명'].isin(['노무비', '제조경비', '임가공비','재료비'])
-        bom_df.loc[흐름_조건, '배합원가'] = bom_df.loc[흐름_조건, '단가']
-
-        # 'loss율_포장' 헤더 생성 후 조건에 따른 값 계산 및 추가
-        if 'loss율_포장' not in bom_df.columns:
-            bom_df['loss율_포장'] = np.nan  # 'loss율_포장' 헤더 생성
-
-        # 6) '공정'이 '재활용분담금'이 아니고 '공정흐름차수명'이 특정 값이 아닌 경우
-        조건1 = (
-            (bom_df['공정'] != '재활용분담금') & 
-            (~bom_df['공정흐름차수명'].isin(['노무비', '제조경비', '임가공비']))
-        )
-        bom_df.loc[조건1, 'loss율_포장'] = bom_df.loc[조건1, '배합원가'] * bom_df.loc[조건1, 'loss율']
-
-        # 7) '공정'이 '재활용분담금'인 경우
-        조건2 = (
-            (bom_df['공정'] == '재활용분담금') & 
-            (bom_df['자재번호'] == '0'))
-        
-        bom_df.loc[조건2, 'loss율_포장'] = bom_df.loc[조건2, '배합원가'] * bom_df.loc[조건2, 'loss율']
-
-        # 8) '공정'이 '포장'이고 '공정흐름차수명'이 '노무비', '제조경비', '임가공비'인 경우
-        조건3 = (
-            (bom_df['공정'] == '포장') & 
-            (bom_df['공정흐름차수명'].isin(['노무비', '제조경비', '임가공비']))
-        )
-        bom_df.loc[조건3, 'loss율_포장'] = 0
-
-        # 9) 조건 설정: '조달구분'이 '스트로우'인 경우
-        조건4 = bom_df['조달구분'] == '스트로우'
-        # '배합원가' * 'loss율' 값을 'loss율_포장'에 추가
-        bom_df.loc[조건4, 'loss율_포장'] = bom_df.loc[조건4, '배합원가'] * bom_df.loc[조건4, 'loss율']
-
-        # 10) '공정흐름차수명'이 '재료비'고 '비고'가 특정 값인 경우
-        조건5 = ((bom_df['공정흐름차수명'] == '재료비') & (bom_df['비고'].isin(['삼양','동원시스템즈'])))
-        bom_df.loc[조건5, 'loss율_포장'] = 0
-
-        # 11) '조달구분'이 '동판'인 경우
-        조건6 = bom_df['조달구분'] == '동판'
-        bom_df.loc[조건6, 'loss율_포장'] = bom_df.loc[조건6, '배합원가'] * bom_df.loc[조건6, 'loss율']
-
-        # 12) '사전원가' 헤더 생성 후 '배합원가' + 'loss율_포장' 계산
-        if '사전원가' not in bom_df.columns:
-            bom_df['사전원가'] = np.nan  # '사전원가' 헤더 생성
-
-        # '배합원가'와 'loss율_포장' 계산
-        bom_df['사전원가'] = bom_df['배합원가'] + bom_df['loss율_포장']
-
-        # 13) '품번'이 '21213226'인 경우
-        조건7 = ((bom_df['품번'] == '21213226') & (bom_df['조달구분'] == '동판'))
-        bom_df.loc[조건7, '사전원가'] = bom_df.loc[조건7, '배합원가']
-
-        # 14) '품목대분류'가 '추출액'이고, '공정'이 '비닐' 경우
-        조건8 = ((bom_df['품목대분류'] == '추출액') & (bom_df['공정'] == '비닐'))
-        bom_df.loc[조건8, '사전원가'] = bom_df.loc[조건8, '단가_배전']
-
-        # 15) '품목대분류'가 '추출액'인 경우
-        조건9 = ((bom_df['품목대분류'] == '추출액') & bom_df['자재명'].str.contains('분쇄-', na=False))
-
-        # 배합원가 계산
-        bom_df.loc[조건9, '배합원가'] = (
-            np.where(
-                bom_df.loc[조건9, 'BOM환산수량'] != 0,
-                bom_df.loc[조건9, '단가_분쇄'] * bom_df.loc[조건9 , 'BOM환산수량'],
-                bom_df.loc[조건9, '단가_분쇄'] * bom_df.loc[조건9 , '소요량분자']
-            )
-        )
-        
-        # 'loss율_포장' 계산
-        bom_df.loc[조건9, '배합원가'] = bom_df.loc[조건9, '단가_분쇄'] * bom_df.loc[조건9, '추출량비율'] * bom_df.loc[조건9, '원두투입'] / bom_df.loc[조건9, '추출량']
-
-        # 'loss율_포장' 계산
-        bom_df.loc[조건9, 'loss율_포장'] = bom_df.loc[조건9, '배합원가'] * bom_df.loc[조건9, 'loss율']
-
-        # '사전원가' 계산
-        bom_df.loc[조건9, '사전원가'] = bom_df.loc[조건9, '배합원가'] + bom_df.loc[조건9, 'loss율_포장']
+        # 2) '배합원가' / 'loss율_포장' / '사전원가' 계산 ('액상,추출액' 규칙 표를 순서대로 적용, 공통 조건은 한 번만 계산)
+        hits = COST_RULES.apply(bom_df)
+        logging.info(f"배합원가/loss율_포장/사전원가 규칙별 적용 행 수: {hits}")
 
         # '조달구분' 값을 '품목자산분류'에 추가
         if '품목자산분류' not in bom_df.columns:
@@ -159,7 +55,7 @@ def process_file(file_name):
         bom_df['품목자산분류'] = bom_df['품목자산분류'].replace(replacements)
 
         # 추가 조건: '사전원가'에 값이 있고, '자재명'에 '추출-'이 포함된 경우
-        조건_추출_원자재 = (bom_df['사전원가'].notna()) & (bom_df['자재명'].str.contains('추출-', na=False))
+        조건_추출_원자재 = (bom_df['사전원가'].notna()) & material_class.has_tag(bom_df, '추출')
         bom_df.loc[조건_추출_원자재, '품목자산분류'] = '원자재'
 
 
@@ -186,13 +82,13 @@ def process_file(file_name):
             '품목자산분류', '자재명', '자재번호', '자재규격', '단위.2', '소요량분자', '대표거래처', 
             '비고', '조달구분', 'BOM환산수량', '단가', '환산비용', '수율', 'loss율', 
             '단가_배전', '단가_분쇄', '단가_추출_천안', '단가_추출_외주', '배합원가', 
-            'loss율_포장', '사전원가'
+            'loss율_포장', '사전원가', extraction_costing.BLEND_COLUMN
         ]
         필터링된_df = 필터링된_df[selected_columns]  # 지정된 컬럼만 선택
 
         # 최종 결과를 '사전원가.csv'로 저장
         output_file = os.path.join(UPLOAD_DIR, "사전원가_액상,추출액.csv")
-        필터링된_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        frame_store.to_csv(필터링된_df, output_file, index=False, encoding='utf-8-sig')
         logging.info(f"최종 파일 저장 완료: '{output_file}'")
         print(f"최종 파일 저장 완료: '{output_file}'")
 
@@ -205,7 +101,7 @@ def main():
         # 고정된 입력 파일명 설정
         input_file = os.path.join(UPLOAD_DIR, "BOM_추출_액상,추출액.csv")
 
-        if not os.path.exists(input_file):
+        if not frame_store.exists(input_file):
             print(f"'{input_file}' 파일이 존재하지 않습니다.")
             logging.info(f"'{input_file}' 파일이 존재하지 않습니다.")
             return
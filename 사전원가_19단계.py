@@ -1,6 +1,8 @@
 import pandas as pd
 import os
 import logging
+import frame_store
+import material_class
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,6 +10,10 @@ os.chdir(script_dir)
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['사전원가_액상,추출액.csv']
+OUTPUT_FILES = ['사전원가_액상.csv', '사전원가_추출액.csv']
+
 # 로그 설정
 logging.basicConfig(filename="log_BOM_사전원가_액상,추출액.log", level=logging.INFO, 
                     format="%(asctime)s - %(levelname)s - %(message)s")
@@ -15,7 +21,7 @@ logging.basicConfig(filename="log_BOM_사전원가_액상,추출액.log", level=
 def process_file(file_name):
     try:
         # 파일 불러오기
-        bom_df = pd.read_csv(file_name, encoding='utf-8-sig', low_memory=False)
+        bom_df = frame_store.read_csv(file_name, encoding='utf-8-sig', low_memory=False)
         logging.info(f"파일 '{file_name}'을 성공적으로 불러왔습니다.")
 
         # 0) '품목대분류'가 '원두'인 데이터만 추출
@@ -23,7 +29,8 @@ def process_file(file_name):
         logging.info("'품목대분류'가 '액상','추출액' 인 데이터만 추출하였습니다.")
 
         # 1) '공정' 헤더의 값이 '스티커','재활용분담금','트레이더스' 인 경우 '자재명'으로 값을 채움
-        bom_df.loc[bom_df['공정'].isin(['스티커', '재활용분담금', '트레이더스']), '자재명'] = bom_df.loc[bom_df['공정'].isin(['스티커', '재활용분담금', '트레이더스']), '공정']
+        공정명_행 = bom_df['공정'].isin(['스티커', '재활용분담금', '트레이더스'])
+        bom_df.loc[공정명_행, '자재명'] = bom_df.loc[공정명_행, '공정']
 
         # 2) '구분' 헤더 생성 후 '공정흐름차수명' 값을 채움
         bom_df['구분'] = bom_df['공정흐름차수명']
@@ -43,7 +50,8 @@ def process_file(file_name):
         bom_df.loc[조건1, '항목'] = bom_df.loc[조건1, '품목자산분류']
 
         # 7) '자재명' 값이 특정 패턴인 경우 '항목'에 '원자재'로 설정
-        조건2 = bom_df['자재명'].str.contains('배전-|배/착-|분쇄-|분/착-|스틱-', na=False)
+        # (1)에서 공정 이름으로 바꾼 자재명에는 공정 태그가 없음
+        조건2 = material_class.has_tag(bom_df, '배전', '배/착', '분쇄', '분/착', '스틱') & ~공정명_행.to_numpy()
         bom_df.loc[조건2, '항목'] = '원자재'
 
         # 8) '자재명' 값이 '0'인 경우 '항목'에 '조달구분' 값을 설정
@@ -89,11 +97,11 @@ def process_file(file_name):
         액상_df = bom_df[bom_df['품목대분류'] == '액상']
         추출액_df = bom_df[bom_df['품목대분류'] == '추출액']
 
-        액상_df.to_csv(os.path.join(UPLOAD_DIR,"사전원가_액상.csv"), index=False, encoding='utf-8-sig')
+        frame_store.to_csv(액상_df, os.path.join(UPLOAD_DIR,"사전원가_액상.csv"), index=False, encoding='utf-8-sig')
         logging.info("파일 저장 완료: '사전원가_액상.csv'")
         print("파일 저장 완료: '사전원가_액상.csv'")
 
-        추출액_df.to_csv(os.path.join(UPLOAD_DIR,"사전원가_추출액.csv"), index=False, encoding='utf-8-sig')
+        frame_store.to_csv(추출액_df, os.path.join(UPLOAD_DIR,"사전원가_추출액.csv"), index=False, encoding='utf-8-sig')
         logging.info("파일 저장 완료: '사전원가_추출액.csv'")
         print("파일 저장 완료: '사전원가_추출액.csv'")
 
@@ -107,7 +115,7 @@ def main():
         # 고정된 입력 파일명 설정
         input_file = os.path.join(UPLOAD_DIR,"사전원가_액상,추출액.csv")
 
-        if not os.path.exists(input_file):
+        if not frame_store.exists(input_file):
             print(f"'{input_file}' 파일이 존재하지 않습니다.")
             logging.info(f"'{input_file}' 파일이 존재하지 않습니다.")
             return
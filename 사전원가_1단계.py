@@ -1,9 +1,15 @@
 import pandas as pd
 import logging
 import os
+import frame_store
+import bom_explosion
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM.csv', '최종차수_제작_BOM_*.csv']
+OUTPUT_FILES = ['BOM_가공.csv']
+
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
 os.chdir(script_dir)
@@ -15,20 +21,15 @@ def main():
     try:
         # 파일 경로 설정 및 파일 목록 정의
         bom_file = os.path.join(UPLOAD_DIR,'BOM.csv')
-        bom_files_to_merge = [
-            os.path.join(UPLOAD_DIR,'최종차수_제작_BOM_001.csv'),
-            os.path.join(UPLOAD_DIR,'최종차수_제작_BOM_002.csv'),
-            os.path.join(UPLOAD_DIR,'최종차수_제작_BOM_003.csv'),
-            os.path.join(UPLOAD_DIR,'최종차수_제작_BOM_004.csv'),
-            os.path.join(UPLOAD_DIR,'최종차수_제작_BOM_005.csv')
-        ]
+        # 0단계에서 전개된 차수만큼 존재하는 최종차수_제작_BOM_001 ~ 파일
+        bom_files_to_merge = bom_explosion.existing_level_files(UPLOAD_DIR)
 
         # BOM.csv 파일 불러오기
-        bom_df = pd.read_csv(bom_file, encoding='utf-8-sig')
+        bom_df = frame_store.read_csv(bom_file, encoding='utf-8-sig')
         
         # 최종차수_제작_BOM 파일들을 순차적으로 불러와서 BOM.csv에 추가
         for file_name in bom_files_to_merge:
-            temp_df = pd.read_csv(file_name, encoding='utf-8-sig')
+            temp_df = frame_store.read_csv(file_name, encoding='utf-8-sig')
             
             # 데이터 병합
             bom_df = pd.concat([bom_df, temp_df], ignore_index=True)
@@ -42,7 +43,7 @@ def main():
 
         # 데이터 저장
         output_file = os.path.join(UPLOAD_DIR,'BOM_가공.csv')
-        bom_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        frame_store.to_csv(bom_df, output_file, index=False, encoding='utf-8-sig')
         print("BOM 가공 완료 - BOM.csv 파일에 병합 및 중복 제거 완료")
 
     except FileNotFoundError as e:
@@ -1,6 +1,8 @@
-import pandas as pd
 import os
 import logging
+import frame_store
+import yield_stages
+import yield_table
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,6 +10,10 @@ os.chdir(script_dir)
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM_가공_원두.csv', '수율.csv']
+OUTPUT_FILES = ['BOM_배전_원두.csv']
+
 # 로그 설정
 logging.basicConfig(filename="log_BOM_배전_원두.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -15,29 +21,16 @@ def main():
     try:
         # 파일 경로 설정
         bom_file = os.path.join(UPLOAD_DIR,'BOM_가공_원두.csv')
-        yield_file = os.path.join(UPLOAD_DIR,'수율.csv')
-
-        # 파일 불러오기 (encoding='utf-8-sig')
-        bom_df = pd.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
-        yield_df = pd.read_csv(yield_file, encoding='utf-8-sig', low_memory=False)
 
-        # '원자재' 구분 데이터만 포함한 yield_df와 병합 (필요한 열만 병합)
-        yield_filtered = yield_df[yield_df['구분'] == '원자재'][['품번', '수율', 'loss율']]
-        merged_df = pd.merge(bom_df, yield_filtered, on='품번', how='left')
+        # 파일 불러오기 (encoding='utf-8-sig', 수율은 yield_table이 프로세스 안에서 한 번만 읽음)
+        bom_df = frame_store.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
+        yields = yield_table.load(UPLOAD_DIR)
 
-        # 1. '수율_배전' 계산: '공정'이 '배전'인 경우 조건을 만족하면 계산, 그렇지 않으면 NaN 할당
-        merged_df['수율_배전'] = merged_df.apply(
-            lambda row: row['환산비용'] / row['수율'] 
-            if row['공정'] == '배전' and pd.notna(row['수율']) and row['수율'] != 0 
-            else None,
-            axis=1
-        )
+        # '원자재' 구분 수율 행과 병합 (필요한 열만 병합, 같은 품번의 수율 행이 여러 개면 모두 병합)
+        merged_df = yields.join(bom_df, ['수율', 'loss율'], 구분='원자재')
 
-        # 2. 'loss율_배전' 계산: '공정'이 '배전'인 경우 조건을 만족하면 계산, 그렇지 않으면 NaN 할당
-        merged_df['loss율_배전'] = merged_df.apply(
-            lambda row: row['수율_배전'] * row['loss율'] if row['공정'] == '배전' and pd.notna(row['loss율']) else None,
-            axis=1
-        )
+        # '수율_배전', 'loss율_배전' 계산: '공정'이 '배전'이고 수율/loss율이 있는 행만 계산, 그 외는 결측값
+        yield_stages.add_yield_columns(merged_df, '배전', fill_value=None)
         logging.info("수율_배전 및 loss율_배전 계산이 완료되었습니다.")
 
         # '공정흐름차수명'이 '노무비', '제조경비', '임가공비'인 경우 'loss율' 값을 제거
@@ -51,7 +44,7 @@ def main():
 
         # 3. 결과를 'BOM_배전_원두.csv' 파일로 저장
         output_file = os.path.join(UPLOAD_DIR,'BOM_배전_원두.csv')
-        merged_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        frame_store.to_csv(merged_df, output_file, index=False, encoding='utf-8-sig')
         print("BOM 배전 완료 - BOM_배전_원두.csv 파일 갱신 완료")
         logging.info("BOM 배전 작업이 완료되었습니다.")
 
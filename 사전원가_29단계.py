@@ -1,7 +1,7 @@
 import os
-import pandas as pd
 import logging
-import numpy as np
+import frame_store
+import yield_stages
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,6 +9,10 @@ os.chdir(script_dir)
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM_분쇄_원두.csv']
+OUTPUT_FILES = ['BOM_분쇄_착향_원두.csv']
+
 # 로그 설정
 logging.basicConfig(filename="log_BOM_분쇄_원두_착향.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -18,30 +22,16 @@ def main():
         bom_file = os.path.join(UPLOAD_DIR,'BOM_분쇄_원두.csv')
 
         # 파일 불러오기 (encoding='utf-8-sig')
-        bom_df = pd.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
+        bom_df = frame_store.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
         logging.info("BOM 파일을 성공적으로 불러왔습니다.")
 
-        # '수율_분/착' 열 생성 및 '공정'이 '분/착'일 때 처리
-        bom_df['수율_분/착'] = np.where(
-            bom_df['공정'] == '분/착', 
-            bom_df['환산비용'] / bom_df['수율'].replace(0, np.nan), 
-            0
-        )
-        bom_df['수율_분/착'] = bom_df['수율_분/착'].fillna(0).astype(float)
-        logging.info("수율_분/착 열 생성 완료.")
-
-        # 'loss율_분/착' 열 생성 및 '공정'이 '분/착'일 때 처리
-        bom_df['loss율_분/착'] = np.where(
-            bom_df['공정'] == '분/착', 
-            bom_df['수율_분/착'] * bom_df['loss율'], 
-            0
-        )
-        bom_df['loss율_분/착'] = bom_df['loss율_분/착'].fillna(0).astype(float)
-        logging.info("loss율_분/착 열 생성 완료.")
+        # '수율_분/착', 'loss율_분/착' 열 생성 ('공정'이 '분/착'인 행만 계산, 나머지는 0)
+        yield_stages.add_yield_columns(bom_df, '분/착')
+        logging.info("수율_분/착, loss율_분/착 열 생성 완료.")
 
         # 결과 저장
         output_file = os.path.join(UPLOAD_DIR,'BOM_분쇄_착향_원두.csv')
-        bom_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        frame_store.to_csv(bom_df, output_file, index=False, encoding='utf-8-sig')
         print("BOM 분/착 가공 완료 - BOM_분/착.csv 파일 갱신 완료")
         logging.info("BOM 분/착 가공 작업이 완료되었습니다.")
 
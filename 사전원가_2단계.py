@@ -1,9 +1,14 @@
-import pandas as pd
 import os
 import logging
+import frame_store
+import price_lookup
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM_가공.csv', '원부재료 사전원가.csv']
+OUTPUT_FILES = ['BOM_가공.csv']
+
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
 os.chdir(script_dir)
@@ -18,17 +23,16 @@ def main():
         cost_file = os.path.join(UPLOAD_DIR,'원부재료 사전원가.csv')
 
         # 파일 불러오기 (encoding='utf-8-sig')
-        bom_df = pd.read_csv(bom_file, encoding='utf-8-sig',low_memory=False)
-        cost_df = pd.read_csv(cost_file, encoding='utf-8-sig',low_memory=False)
+        bom_df = frame_store.read_csv(bom_file, encoding='utf-8-sig',low_memory=False)
+        cost_df = frame_store.read_csv(cost_file, encoding='utf-8-sig',low_memory=False)
 
         # 2-1. '단가' 헤더 생성 및 매칭된 '원가' 값 추출
         if '단가' not in bom_df.columns:
             bom_df['단가'] = 0  # 기본값을 0으로 설정
 
-        bom_df['단가'] = bom_df.apply(
-            lambda row: cost_df[cost_df['품번'] == row['자재번호']]['원가'].values[0] if not cost_df[cost_df['품번'] == row['자재번호']].empty else row['단가'],
-            axis=1
-        )
+        # 품번 → 원가 맵을 한 번 만들고 자재번호로 조회 (중복 품번은 첫 번째 원가 사용)
+        price_map = price_lookup.build_price_map(cost_df, duplicates='first')
+        bom_df['단가'] = price_lookup.lookup_prices(bom_df['자재번호'], price_map, default=bom_df['단가'])
 
         # 2-2. '환산비용' 헤더 생성 및 계산 (단가 * BOM환산수량)
         bom_df['환산비용'] = bom_df['단가'] * bom_df['BOM환산수량']
@@ -36,7 +40,7 @@ def main():
         logging.info("단가 및 환산비용 계산이 완료되었습니다.")
 
         # 3. 결과를 'BOM_가공.csv' 파일로 저장
-        bom_df.to_csv(bom_file, index=False, encoding='utf-8-sig')
+        frame_store.to_csv(bom_df, bom_file, index=False, encoding='utf-8-sig')
         print("BOM 원가 매칭 완료 - BOM_가공.csv 파일 생성 완료")
         logging.info("BOM 원가 매칭 작업이 완료되었습니다.")
 
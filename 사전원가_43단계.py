@@ -2,9 +2,16 @@ import pandas as pd
 import os
 import logging
 from typing import Dict, List, Tuple
+import frame_store
+import material_class
+import yield_table
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM_배전_조제.csv', '수율.csv']
+OUTPUT_FILES = ['BOM_배전_조제.csv']
+
 def setup_logging() -> None:
     logging.basicConfig(
         filename="log_BOM_배전_조제.log",
@@ -12,82 +19,56 @@ def setup_logging() -> None:
         format="%(asctime)s - %(levelname)s - %(message)s"
     )
 
-def load_dataframes() -> Tuple[pd.DataFrame, pd.DataFrame]:
-    """BOM과 수율 데이터를 로드"""
-    bom_df = pd.read_csv(os.path.join(UPLOAD_DIR,'BOM_배전_조제.csv'), encoding='utf-8-sig', low_memory=False)
-    yield_df = pd.read_csv(os.path.join(UPLOAD_DIR,'수율.csv'), encoding='utf-8-sig', low_memory=False)
-    return bom_df, yield_df
+def load_dataframes() -> Tuple[pd.DataFrame, yield_table.YieldTable]:
+    """BOM과 수율 조회 객체를 로드"""
+    bom_df = frame_store.read_csv(os.path.join(UPLOAD_DIR,'BOM_배전_조제.csv'), encoding='utf-8-sig', low_memory=False)
+    yields = yield_table.load(UPLOAD_DIR)
+    return bom_df, yields
 
-def update_dried_fruits(bom_df: pd.DataFrame, yield_df: pd.DataFrame) -> pd.DataFrame:
+def apply_yields(bom_df: pd.DataFrame, condition: pd.Series, yields: yield_table.YieldTable,
+                 duplicates: str = 'first', **yield_conditions) -> pd.DataFrame:
     """
-    1. '자재명'에 '건조' 또는 '열풍'이 포함된 품번 추출
-    2. '수율.csv'의 '대분류'가 '조제'이고 '비고'가 '건조과일'일 때 품번이 일치하면 '수율'과 'loss율'을 BOM 파일에 업데이트
+    condition 행 중 수율 조회 조건(yield_conditions)에 품번이 있는 행의 '수율'과 'loss율'을 한 번에 업데이트
+    (수율 값이 비어 있어도 품번이 있으면 그대로 덮어씀)
     """
-    # '자재명'에 '건조' 또는 '열풍' 포함된 품번 추출
-    dried_fruits_condition = bom_df['자재명'].str.contains('건조|열풍', na=False)
-    dried_fruits_parts = bom_df.loc[dried_fruits_condition, '품번']
-
-    # '수율.csv'에서 조건에 맞는 데이터 필터링
-    filtered_yield_df = yield_df[
-        (yield_df['대분류'] == '조제') & (yield_df['비고'] == '건조과일')
-    ][['품번', '수율', 'loss율']]
+    mapping = yields.mapping(['수율', 'loss율'], duplicates, **yield_conditions)
+    matched = condition & bom_df['품번'].isin(mapping.index)
+    bom_df.loc[matched, ['수율', 'loss율']] = mapping.reindex(bom_df.loc[matched, '품번']).to_numpy()
+    return bom_df
 
-    # '품번' 기준으로 수율 및 loss율 매핑
-    mapping = filtered_yield_df.set_index('품번').to_dict(orient='index')
 
-    # 조건을 만족하는 품번만 업데이트
-    for part in dried_fruits_parts:
-        if part in mapping:
-            # dried_fruits_condition을 이용해 조건을 추가
-            bom_df.loc[(bom_df['품번'] == part) & dried_fruits_condition, ['수율', 'loss율']] = \
-                mapping[part]['수율'], mapping[part]['loss율']
+def update_dried_fruits(bom_df: pd.DataFrame, yields: yield_table.YieldTable) -> pd.DataFrame:
+    """
+    1. '자재명'에 '건조' 또는 '열풍'이 포함된 행 추출
+    2. '수율.csv'의 '대분류'가 '조제'이고 '비고'가 '건조과일'일 때 품번이 일치하면 '수율'과 'loss율'을 BOM 파일에 업데이트
+    (기존 to_dict(orient='index')와 같이 중복 품번이 있으면 ValueError 발생)
+    """
+    # 기존 품번 == 비교와 같이 품번이 비어 있는 행은 제외
+    dried_fruits_condition = material_class.has_tag(bom_df, '건조/열풍') & bom_df['품번'].notna()
+    bom_df = apply_yields(bom_df, dried_fruits_condition, yields, 'error', 대분류='조제', 비고='건조과일')
 
     logging.info("'건조과일' 관련 수율 및 loss율 업데이트 완료")
     return bom_df
 
 
-def update_raw_materials(bom_df: pd.DataFrame, yield_df: pd.DataFrame) -> pd.DataFrame:
+def update_raw_materials(bom_df: pd.DataFrame, yields: yield_table.YieldTable) -> pd.DataFrame:
     """
-    3. '대분류'가 '조제'이고 '구분'이 '부자재'인 데이터를 추출
+    3. '대분류'가 '조제'이고 '구분'이 '부자재'인 데이터를 추출 (중복 품번은 첫 번째 값 사용)
     4. '품목자산분류'가 '부자재'이고 품번이 일치할 때 수율과 loss율 값을 BOM 파일에 업데이트
     """
-    # '수율.csv'에서 조건에 맞는 데이터 필터링
-    filtered_yield_df = yield_df[
-        (yield_df['대분류'] == '조제') & (yield_df['구분'] == '부자재')
-    ][['품번', '수율', 'loss율']].drop_duplicates(subset='품번', keep='first')
-
-    # '품번' 기준으로 수율 및 loss율 매핑
-    mapping = filtered_yield_df.set_index('품번').to_dict(orient='index')
-
-    # 'BOM_배전_조제.csv'에서 '품목자산분류'가 '부자재'인 조건
     raw_material_condition = bom_df['품목자산분류'] == '부자재'
-    for index, row in bom_df[raw_material_condition].iterrows():
-        part_number = row['품번']
-        if part_number in mapping:
-            bom_df.loc[index, ['수율', 'loss율']] = mapping[part_number]['수율'], mapping[part_number]['loss율']
+    bom_df = apply_yields(bom_df, raw_material_condition, yields, 대분류='조제', 구분='부자재')
 
     logging.info("'부자재' 관련 수율 및 loss율 업데이트 완료")
     return bom_df
 
-def update_raw_materials2(bom_df: pd.DataFrame, yield_df: pd.DataFrame) -> pd.DataFrame:
+def update_raw_materials2(bom_df: pd.DataFrame, yields: yield_table.YieldTable) -> pd.DataFrame:
     """
-    5. '대분류'가 '조제'이고 '구분'이 '부자재'인 데이터를 추출
+    5. '대분류'가 '조제'이고 '구분'이 '부자재'인 데이터를 추출 (중복 품번은 첫 번째 값 사용)
     6. '공정'가 '스티커' 또는 '재활용분담금'이고 품번이 일치할 때 수율과 loss율 값을 BOM 파일에 업데이트
     """
-    # '수율.csv'에서 조건에 맞는 데이터 필터링
-    filtered_yield_df = yield_df[
-        (yield_df['대분류'] == '조제') & (yield_df['구분'] == '부자재')
-    ][['품번', '수율', 'loss율']].drop_duplicates(subset='품번', keep='first')
-
-    # '품번' 기준으로 수율 및 loss율 매핑
-    mapping = filtered_yield_df.set_index('품번').to_dict(orient='index')
-
-    # 'BOM_배전_조제.csv'에서 '품목자산분류'가 '부자재'인 조건
-    raw_material_condition = bom_df['공정'].isin(['스티커', '재활용분담금'])
-    for index, row in bom_df[raw_material_condition].iterrows():
-        part_number = row['품번']
-        if part_number in mapping:
-            bom_df.loc[index, ['수율', 'loss율']] = mapping[part_number]['수율'], mapping[part_number]['loss율']
+    process_condition = bom_df['공정'].isin(['스티커', '재활용분담금'])
+    bom_df = apply_yields(bom_df, process_condition, yields, 대분류='조제', 구분='부자재')
 
     logging.info("'부자재' 관련 수율 및 loss율 업데이트 완료")
     return bom_df
@@ -102,17 +83,17 @@ def main():
         setup_logging()
 
         # 데이터프레임 로드
-        bom_df, yield_df = load_dataframes()
+        bom_df, yields = load_dataframes()
 
         # 건조/열풍 품목 관련 데이터 업데이트
-        bom_df = update_dried_fruits(bom_df, yield_df)
+        bom_df = update_dried_fruits(bom_df, yields)
 
         # 부자재 품목 관련 데이터 업데이트
-        bom_df = update_raw_materials(bom_df, yield_df)
-        bom_df = update_raw_materials2(bom_df, yield_df)
+        bom_df = update_raw_materials(bom_df, yields)
+        bom_df = update_raw_materials2(bom_df, yields)
 
         # 결과 저장
-        bom_df.to_csv(os.path.join(UPLOAD_DIR,'BOM_배전_조제.csv'), index=False, encoding='utf-8-sig')
+        frame_store.to_csv(bom_df, os.path.join(UPLOAD_DIR,'BOM_배전_조제.csv'), index=False, encoding='utf-8-sig')
         logging.info("BOM 원가 가공 작업이 완료되었습니다.")
         print("BOM 원가 가공 완료 - BOM_배전_조제.csv 파일 갱신 완료")
 
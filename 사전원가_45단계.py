@@ -1,6 +1,7 @@
-import pandas as pd
 import os
 import logging
+import frame_store
+import stage_rollup
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,6 +9,10 @@ os.chdir(script_dir)
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM_배전_조제.csv']
+OUTPUT_FILES = ['BOM_배전_조제.csv']
+
 # 로그 설정
 logging.basicConfig(filename="log_BOM_배전_조제.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -17,41 +22,21 @@ def main():
         bom_file = os.path.join(UPLOAD_DIR,'BOM_배전_조제.csv')
 
         # 파일 불러오기 (encoding='utf-8-sig')
-        bom_df = pd.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
+        bom_df = frame_store.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
         logging.info("BOM 파일을 성공적으로 불러왔습니다.")
 
-        # 데이터 타입 일치
-        bom_df['자재번호'] = bom_df['자재번호'].astype(str)
-        
-        # 배전 비용 합산
-        items = bom_df.copy()
-        items['품번'] = items['품번'].astype(str)
-        cost_sum = items.groupby('품번')['배전비용'].sum().reset_index()
+        # 품번별 배전비용 합계를 자재번호로 조회하여 단가_배전 설정
+        stage_rollup.rollup(bom_df, {'배전비용': '단가_배전'})
+        bom_df['단가_배전'] = bom_df['단가_배전'].fillna(0)
         logging.info("배전비용 합산 작업 완료.")
 
-        # merge 작업
-        bom_df = bom_df.merge(cost_sum, 
-                              left_on='자재번호', 
-                              right_on='품번', 
-                              how='left', 
-                              suffixes=('_x', '_y'))
-        logging.info("데이터 병합 작업 완료.")
-
-        # 단가_배전 설정
-        if '배전비용_y' in bom_df.columns:
-            bom_df['단가_배전'] = bom_df['배전비용_y'].fillna(0)
-        else:
-            logging.warning("배전비용 열을 찾을 수 없습니다.")
-            print("현재 컬럼:", bom_df.columns.tolist())
-
         # '배전비용'이 0이고 '단가_배전'이 0이 아닌 경우, '배전비용'에 '단가_배전' 값을 넣기
-        bom_df.loc[(bom_df['단가_배전'] == 0) & (bom_df['배전비용_x'] != 0), '단가_배전'] = bom_df['배전비용_x']
+        bom_df.loc[(bom_df['단가_배전'] == 0) & (bom_df['배전비용'] != 0), '단가_배전'] = bom_df['배전비용']
         logging.info("단가_배전이 0이고 배전비용이 0이 아닌 경우에 배전비용 값을 업데이트 완료.")
 
-        # 열 이름 변경 및 불필요한 열 삭제
-        bom_df = bom_df.rename(columns={'품번_x': '품번'})
-        bom_df = bom_df.drop(columns=['배전비용_y', '품번_y','배전비용_x'], errors='ignore')
-        logging.info("열 이름 변경 및 불필요한 열 삭제 완료.")
+        # 불필요한 열 삭제
+        bom_df = bom_df.drop(columns=['배전비용'])
+        logging.info("불필요한 열 삭제 완료.")
 
         # '공정'이 '추출'인 값에서 '품번', '자재번호', '단가','비고','조달구분' 중복값을 제거
         bom_df = bom_df[~((bom_df['공정'] == '추출') & 
@@ -59,7 +44,7 @@ def main():
         logging.info("공정이 '추출'인 값에서 '품번', '자재번호', '단가', '비고', '조달구분' 중복값 제거 완료.")
 
         # 결과 저장
-        bom_df.to_csv(bom_file, index=False, encoding='utf-8-sig')
+        frame_store.to_csv(bom_df, bom_file, index=False, encoding='utf-8-sig')
         print("BOM 배전 가공 완료 - BOM_배전_조제.csv 파일 갱신 완료")
         logging.info("BOM 배전 가공 작업이 완료되었습니다.")
 
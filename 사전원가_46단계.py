@@ -1,7 +1,7 @@
 import os
-import pandas as pd
 import logging
-import numpy as np
+import frame_store
+import yield_stages
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,6 +9,10 @@ os.chdir(script_dir)
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM_배전_조제.csv']
+OUTPUT_FILES = ['BOM_미세_조제.csv']
+
 # 로그 설정
 logging.basicConfig(filename="log_BOM_미세_조제.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -18,7 +22,7 @@ def main():
         bom_file = os.path.join(UPLOAD_DIR,'BOM_배전_조제.csv')
 
         # 파일 불러오기 (encoding='utf-8-sig')
-        bom_df = pd.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
+        bom_df = frame_store.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
         logging.info("BOM 파일을 성공적으로 불러왔습니다.")
 
         # '품목대분류'가 '조제'이고 '자재번호'가 특정 값인 경우 행 삭제
@@ -26,27 +30,13 @@ def main():
         bom_df = bom_df[~삭제_조건]
         logging.info("'품목대분류'가 '조제'이고 '자재번호'가 '62C00030', '64C00060'인 행 삭제 완료.")
 
-        # '수율_미세' 열 생성 및 '공정'이 '미세'일 때 처리
-        bom_df['수율_미세'] = np.where(
-            bom_df['공정'] == '미세', 
-            bom_df['환산비용'] / bom_df['수율'].replace(0, np.nan), 
-            0
-        )
-        bom_df['수율_미세'] = bom_df['수율_미세'].fillna(0).astype(float)
-        logging.info("수율_미세 열 생성 완료.")
-
-        # 'loss율_미세' 열 생성 및 '공정'이 '미세'일 때 처리
-        bom_df['loss율_미세'] = np.where(
-            bom_df['공정'] == '미세', 
-            bom_df['수율_미세'] * bom_df['loss율'], 
-            0
-        )
-        bom_df['loss율_미세'] = bom_df['loss율_미세'].fillna(0).astype(float)
-        logging.info("loss율_미세 열 생성 완료.")
+        # '수율_미세', 'loss율_미세' 열 생성 ('공정'이 '미세'인 행만 계산, 나머지는 0)
+        yield_stages.add_yield_columns(bom_df, '미세')
+        logging.info("수율_미세, loss율_미세 열 생성 완료.")
 
         # 결과 저장
         output_file = os.path.join(UPLOAD_DIR,'BOM_미세_조제.csv')
-        bom_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        frame_store.to_csv(bom_df, output_file, index=False, encoding='utf-8-sig')
         print("BOM 미세 가공 완료 - BOM_미세.csv 파일 갱신 완료")
         logging.info("BOM 미세 가공 작업이 완료되었습니다.")
 
@@ -1,6 +1,8 @@
 import pandas as pd
 import os
 import logging
+import frame_store
+import material_class
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,6 +10,10 @@ os.chdir(script_dir)
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM_미세_조제.csv']
+OUTPUT_FILES = ['BOM_미세_조제.csv']
+
 # 로그 설정
 logging.basicConfig(filename="log_BOM_미세_조제.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -17,15 +23,15 @@ def main():
         bom_file = os.path.join(UPLOAD_DIR,'BOM_미세_조제.csv')
 
         # 파일 불러오기 (encoding='utf-8-sig')
-        bom_df = pd.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
+        bom_df = frame_store.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
         logging.info("BOM 파일을 성공적으로 불러왔습니다.")
 
-        # '단가_배전_y'과 '미세단가'의 합으로 '단가_미세' 열 생성
-        if '단가_배전_y' in bom_df.columns and '미세단가' in bom_df.columns:
-            bom_df['단가_미세'] = bom_df['단가_배전_y'].fillna(0) + bom_df['미세단가'].fillna(0)
+        # '단가_배전_합계'과 '미세단가'의 합으로 '단가_미세' 열 생성
+        if '단가_배전_합계' in bom_df.columns and '미세단가' in bom_df.columns:
+            bom_df['단가_미세'] = bom_df['단가_배전_합계'].fillna(0) + bom_df['미세단가'].fillna(0)
             logging.info("'단가_미세' 열 생성 완료.")
         else:
-            missing_columns = [col for col in ['단가_배전_y', '미세단가'] if col not in bom_df.columns]
+            missing_columns = [col for col in ['단가_배전_합계', '미세단가'] if col not in bom_df.columns]
             logging.warning(f"필요한 열이 없습니다: {missing_columns}")
             print(f"오류: 필요한 열이 없습니다: {missing_columns}")
             return
@@ -48,18 +54,20 @@ def main():
         bom_df.loc[(bom_df['단가_미세'] == 0) & (bom_df['미세비용'] != 0), '단가_미세'] = bom_df['미세비용']
         logging.info("미세_미세이 0이고 미세비용이 0이 아닌 경우에 미세비용 값을 업데이트 완료.")
 
-        # '단가_배전_y'와 '미세단가' 열 제거
-        bom_df = bom_df.drop(columns=['단가_배전_y', '미세단가','미세비용'], errors='ignore')
-        logging.info("'단가_배전_y'와 '미세단가','미세비용' 열 삭제 완료.")
-        # 열 이름 변경
-        bom_df = bom_df.rename(columns={'단가_배전_x': '단가_배전'})
+        # '단가_배전_합계'와 '미세단가' 열 제거
+        bom_df = bom_df.drop(columns=['단가_배전_합계', '미세단가','미세비용'], errors='ignore')
+        logging.info("'단가_배전_합계'와 '미세단가','미세비용' 열 삭제 완료.")
 
         # '자재명' 열에 특정 키워드가 포함된 경우 '단가_미세' 값을 0으로 설정
         if '자재명' in bom_df.columns and '단가_미세' in bom_df.columns:
-            keywords = ['배/착', '분쇄', '추출-', '조/배-']
+            keywords = ['배/착', '분쇄']
             for keyword in keywords:
                 bom_df.loc[bom_df['자재명'].str.contains(keyword, na=False), '단가_미세'] = 0
                 logging.info(f"'자재명'에 '{keyword}'이 포함된 행에 대해 '단가_미세' 값을 0으로 설정했습니다.")
+
+            # '추출-', '조/배-'는 미리 분류한 공정 태그('자재공정' 열)로 확인
+            bom_df.loc[material_class.has_tag(bom_df, '추출', '조/배'), '단가_미세'] = 0
+            logging.info("'자재명'에 '추출-', '조/배-'이 포함된 행에 대해 '단가_미세' 값을 0으로 설정했습니다.")
         else:
             logging.warning("'자재명' 또는 '단가_미세' 열이 없습니다. 해당 작업을 건너뜁니다.")
 
@@ -73,7 +81,7 @@ def main():
         bom_df = pd.concat([bom_df[bom_df['품목대분류'] != '조제'], non_duplicates], ignore_index=True)
 
         # 결과 저장
-        bom_df.to_csv(bom_file, index=False, encoding='utf-8-sig')
+        frame_store.to_csv(bom_df, bom_file, index=False, encoding='utf-8-sig')
         print("BOM 미세 가공 완료 - BOM_미세.csv 파일 갱신 완료")
         logging.info("BOM 미세 가공 작업이 완료되었습니다.")
 
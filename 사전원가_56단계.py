@@ -2,6 +2,7 @@ import pandas as pd
 import os
 import re
 import logging
+import frame_store
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,6 +10,10 @@ os.chdir(script_dir)
 
 UPLOAD_DIR = "uploads"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['사전원가_조제.csv']
+OUTPUT_FILES = ['사전원가_조제.csv']
+
 # 로그 설정
 logging.basicConfig(
     filename="log_BOM_사전원가_조제.log",
@@ -22,12 +27,9 @@ def main():
         input_file = os.path.join(UPLOAD_DIR, '사전원가_조제.csv')
 
         # 파일 불러오기 (encoding='utf-8-sig')
-        df = pd.read_csv(input_file, encoding='utf-8-sig', low_memory=False)
+        df = frame_store.read_csv(input_file, encoding='utf-8-sig', low_memory=False)
         logging.info("BOM 파일을 성공적으로 불러왔습니다.")
 
-        df['품번'] = df['품번'].astype(str)
-        df['자재번호'] = df['자재번호'].astype(str)
-
         # '품번'별 '사전원가_조제' 합산 값 계산
         품번_list = ['21367702', '21367101', '21363840', '21363845', '21367708', '21363815']
         filtered_df = df[df['품번'].isin(품번_list)]
@@ -94,7 +96,7 @@ def main():
 
         # 처리 결과 저장
         output_file = os.path.join(UPLOAD_DIR, '사전원가_조제.csv')
-        df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        frame_store.to_csv(df, output_file, index=False, encoding='utf-8-sig')
         logging.info("가공된 데이터가 기존 데이터에 병합되었습니다.")
         print("BOM 추출 가공 완료 - 데이터 병합 후 원본 파일 업데이트 완료")
 
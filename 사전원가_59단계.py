@@ -1,6 +1,7 @@
 import os
 import pandas as pd
 import logging
+import frame_store
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,6 +10,10 @@ os.chdir(script_dir)
 UPLOAD_DIR = "uploads"
 RESULT_DIR = "results"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['사전원가_액상.csv', '사전원가_원두.csv', '사전원가_조제.csv', '사전원가_추출액.csv']
+OUTPUT_FILES = []
+
 # 로그 설정
 logging.basicConfig(filename="log_사전원가통합.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -21,9 +26,9 @@ def integrate_cost_files():
         combined_data = []
         for file_name in file_names:
             file_path = os.path.join(UPLOAD_DIR, file_name)  # 경로를 업로드 디렉토리로 변경
-            if os.path.exists(file_path):
+            if frame_store.exists(file_path):
                 logging.info(f"파일 읽는 중: {file_name}")
-                df = pd.read_csv(file_path, encoding='utf-8-sig')
+                df = frame_store.read_csv(file_path, encoding='utf-8-sig')
                 combined_data.append(df)
             else:
                 logging.warning(f"파일을 찾을 수 없음: {file_name}")
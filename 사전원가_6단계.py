@@ -1,6 +1,6 @@
-import pandas as pd
 import os
 import logging
+import frame_store
 
 # 현재 스크립트 위치를 기준으로 작업 디렉토리 설정
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,6 +9,10 @@ os.chdir(script_dir)
 UPLOAD_DIR = "uploads"
 RESULT_DIR = "results"
 
+# ✅ 단계 입출력 파일 (UPLOAD_DIR 기준, step_graph가 단계 간 의존 관계를 만들 때 사용)
+INPUT_FILES = ['BOM_가공_액상,추출액.csv']
+OUTPUT_FILES = []
+
 # 로그 설정
 logging.basicConfig(filename="log_BOM_단가누락.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -18,7 +22,7 @@ def main():
         bom_file = os.path.join(UPLOAD_DIR,'BOM_가공_액상,추출액.csv')
 
         # 파일 불러오기 (encoding='utf-8-sig')
-        bom_df = pd.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
+        bom_df = frame_store.read_csv(bom_file, encoding='utf-8-sig', low_memory=False)
 
         # 1) '공정흐름차수명' 필터링 및 '품번' 추출
         target_processes = ['노무비', '임가공비', '재료비', '제조경비']